@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Session Event Benchmarks
+========================
+
+Measures the per-message cost of turning SDK messages into session events
+and dispatching them on an EventBus, with no observers and with several.
+
+A synthetic stream mixes assistant text, tool use, tool results (some
+blocked) and a final result message, in roughly the proportions of a real
+coding session. Each configuration replays the stream and reports the mean
+and p99 nanoseconds per message.
+
+Usage:
+    python benchmarks/bench_events.py
+    python benchmarks/bench_events.py --messages 20000 --observers 0 1 4 16
+"""
+
+import argparse
+import sys
+import time
+
+from claude_agent_sdk import (
+    AssistantMessage,
+    ResultMessage,
+    TextBlock,
+    ToolResultBlock,
+    ToolUseBlock,
+    UserMessage,
+)
+
+from nonstop_agent.agent import message_events
+from nonstop_agent.events import EventBus, SessionEvent, TextEvent, ToolResultEvent, ToolUseEvent
+
+MODEL = "bench-model"
+
+
+def build_stream(count: int) -> list[object]:
+    """A message stream of `count` messages ending in a ResultMessage."""
+    messages: list[object] = []
+    for i in range(count - 1):
+        kind = i % 4
+        if kind == 0:
+            messages.append(AssistantMessage([TextBlock(f"Working on step {i}. " * 4)], MODEL))
+        elif kind == 1:
+            block = ToolUseBlock(f"toolu_{i}", "Bash", {"command": f"npm test -- --grep case{i}"})
+            messages.append(AssistantMessage([block], MODEL))
+        elif kind == 2:
+            content = "Command blocked by policy" if i % 40 == 2 else f"{i} tests passed"
+            messages.append(UserMessage([ToolResultBlock(f"toolu_{i - 1}", content, False)]))
+        else:
+            messages.append(AssistantMessage(
+                [TextBlock("Next."), ToolUseBlock(f"toolu_{i}", "Read", {"file_path": "a.py"})],
+                MODEL,
+            ))
+    messages.append(ResultMessage(
+        "success", 1000, 900, False, count, "bench-session", total_cost_usd=0.5,
+    ))
+    return messages
+
+
+def make_bus(observers: int) -> EventBus:
+    """A bus with `observers` cheap handlers spread over typical subscriptions."""
+    bus = EventBus()
+    counts = [0]
+
+    def count(event: SessionEvent) -> None:
+        counts[0] += 1
+
+    event_types = [SessionEvent, TextEvent, ToolUseEvent, ToolResultEvent]
+    for i in range(observers):
+        bus.subscribe(event_types[i % len(event_types)], count)
+    return bus
+
+
+def time_stream(messages: list[object], bus: EventBus, rounds: int) -> list[int]:
+    """Per-message latencies in nanoseconds."""
+    samples = []
+    for _ in range(rounds):
+        for msg in messages:
+            start = time.perf_counter_ns()
+            for event in message_events(msg):
+                bus.emit(event)
+            samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def time_baseline(messages: list[object], rounds: int) -> list[int]:
+    """Per-message latencies of iterating the stream with no event translation."""
+    samples = []
+    for _ in range(rounds):
+        for msg in messages:
+            start = time.perf_counter_ns()
+            if isinstance(msg, AssistantMessage):
+                for block in msg.content:
+                    isinstance(block, TextBlock)
+            samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def summarize(samples_ns: list[int]) -> tuple[float, int]:
+    """Mean and nearest-rank p99 in nanoseconds."""
+    ordered = sorted(samples_ns)
+    p99 = ordered[max(0, round(0.99 * len(ordered)) - 1)]
+    return sum(ordered) / len(ordered), p99
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark session event dispatch")
+    parser.add_argument(
+        "--messages",
+        type=int,
+        default=10000,
+        help="Messages in the synthetic stream (default: 10000)",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=5,
+        help="Times the stream is replayed per configuration (default: 5)",
+    )
+    parser.add_argument(
+        "--observers",
+        type=int,
+        nargs="+",
+        default=[0, 1, 4, 16],
+        help="Observer counts to measure (default: 0 1 4 16)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    messages = build_stream(args.messages)
+    print(f"Stream: {len(messages)} messages x {args.rounds} rounds\n")
+    print(f"{'configuration':<22} {'mean (ns)':>10} {'p99 (ns)':>10}")
+
+    mean, p99 = summarize(time_baseline(messages, args.rounds))
+    print(f"{'loop only':<22} {mean:>10.0f} {p99:>10}")
+    for observers in args.observers:
+        mean, p99 = summarize(time_stream(messages, make_bus(observers), args.rounds))
+        print(f"{f'{observers} observers':<22} {mean:>10.0f} {p99:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Session Replay Benchmarks
+=========================
+
+Measures harness overhead per message by replaying a recorded transcript
+through run_agent_session, with no API calls.
+
+Each configuration replays every recorded session through the full session
+path (event translation, the per-session bus, response buffer, stats and
+output queue) with a given number of extra observers on the caller's bus,
+and reports the mean per-message time and that of the slowest session.
+The "replay only" row iterates the same messages without the harness, so
+the difference is what the harness costs per message.
+
+Without --transcript, a synthetic stream from bench_events.py is recorded
+to a temporary transcript first, which also exercises the recorder.
+--speed 1 replays at the recorded pace and --show renders the output on the
+console, to reproduce a recorded session as it happened.
+
+Usage:
+    python benchmarks/bench_replay.py
+    python benchmarks/bench_replay.py --transcript project/session_transcript.jsonl
+    python benchmarks/bench_replay.py --transcript t.jsonl --speed 1 --show --observers 0
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_events import build_stream, make_bus
+
+from nonstop_agent.agent import run_agent_session
+from nonstop_agent.output import ConsoleSink, NullSink
+from nonstop_agent.replay import TranscriptRecorder, TranscriptReplay, load_transcript
+
+
+def record_synthetic(path: Path, messages: int, sessions: int) -> None:
+    """Record `sessions` synthetic sessions of `messages` messages each."""
+    recorder = TranscriptRecorder(path)
+    for i in range(sessions):
+        recorder.start_session(f"synthetic session {i + 1}", "bench-model")
+        for msg in build_stream(messages):
+            recorder.record(msg)
+    recorder.close()
+
+
+async def time_harness(
+    replay: TranscriptReplay, project_dir: Path, observers: int, show: bool
+) -> list[float]:
+    """Mean per-message harness time of each session, in nanoseconds."""
+    samples = []
+    for session in replay.sessions:
+        bus = make_bus(observers)
+        quiet = contextlib.nullcontext() if show else contextlib.redirect_stdout(io.StringIO())
+        start = time.perf_counter_ns()
+        with quiet:
+            await run_agent_session(
+                session.prompt, project_dir, session.model or "replay",
+                sink=ConsoleSink() if show else NullSink(),
+                events=bus,
+                message_source=replay,
+            )
+        samples.append((time.perf_counter_ns() - start) / max(1, len(session.messages)))
+    return samples
+
+
+async def time_replay_only(replay: TranscriptReplay) -> list[float]:
+    """Mean per-message time of each session iterated with no harness, in nanoseconds."""
+    samples = []
+    for _ in replay.sessions:
+        start = time.perf_counter_ns()
+        count = 0
+        async for _msg in replay():
+            count += 1
+        samples.append((time.perf_counter_ns() - start) / max(1, count))
+    return samples
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the harness on a replayed transcript")
+    parser.add_argument(
+        "--transcript",
+        type=Path,
+        default=None,
+        help="Transcript recorded with --record-transcript (default: synthetic)",
+    )
+    parser.add_argument(
+        "--messages",
+        type=int,
+        default=5000,
+        help="Messages per synthetic session (default: 5000)",
+    )
+    parser.add_argument(
+        "--sessions",
+        type=int,
+        default=5,
+        help="Synthetic sessions to record (default: 5)",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=None,
+        help="Replay at this factor of the recorded timing (default: full speed)",
+    )
+    parser.add_argument(
+        "--observers",
+        type=int,
+        nargs="+",
+        default=[0, 4, 16],
+        help="Extra observer counts to measure (default: 0 4 16)",
+    )
+    parser.add_argument(
+        "--show",
+        action="store_true",
+        help="Render the replayed output on the console",
+    )
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace, transcript: Path, project_dir: Path) -> None:
+    sessions = load_transcript(transcript)
+    total = sum(len(s.messages) for s in sessions)
+    print(f"Transcript: {len(sessions)} sessions, {total} messages\n")
+    print(f"{'configuration':<22} {'mean (ns)':>10} {'worst (ns)':>10}")
+
+    replay = TranscriptReplay(sessions, args.speed)
+    samples = await time_replay_only(replay)
+    print(f"{'replay only':<22} {sum(samples) / len(samples):>10.0f} {max(samples):>10.0f}")
+    for observers in args.observers:
+        replay = TranscriptReplay(sessions, args.speed)
+        samples = await time_harness(replay, project_dir, observers, args.show)
+        label = f"harness, {observers} observers"
+        print(f"{label:<22} {sum(samples) / len(samples):>10.0f} {max(samples):>10.0f}")
+
+
+def main() -> int:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        transcript = args.transcript
+        if transcript is None:
+            transcript = Path(tmpdir) / "transcript.jsonl"
+            record_synthetic(transcript, args.messages, args.sessions)
+        asyncio.run(run(args, transcript, Path(tmpdir)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
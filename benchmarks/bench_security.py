@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Security Hook Benchmarks
+========================
+
+Measures what the PreToolUse Bash hook costs per call.
+
+Suites:
+- corpus: replays benchmarks/data/bash_commands.jsonl (short commands, long
+  pipelines, heredocs, malformed quoting) through bash_security_hook (with
+  and without an audit log), evaluate_command, extract_commands and
+  split_command_segments, and reports p50/p99 latency and throughput per
+  target.
+- chains: times generated ``&&``/``;`` chains of increasing length against
+  the legacy extract/split/re-extract pipeline.
+
+The corpus suite exits with status 1 when a target regresses past a
+threshold, either an absolute --max-p99-us or --tolerance relative to a
+baseline saved earlier with --save-baseline.
+
+Usage:
+    python benchmarks/bench_security.py
+    python benchmarks/bench_security.py --save-baseline bench_baseline.json
+    python benchmarks/bench_security.py --baseline bench_baseline.json --tolerance 0.25
+    python benchmarks/bench_security.py --suite chains --lengths 10 100 1000
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from nonstop_agent.audit import AUDIT_LOG_FILE, AuditLog
+from nonstop_agent.security import (
+    ALLOWED_COMMANDS,
+    COMMANDS_NEEDING_EXTRA_VALIDATION,
+    HookCallback,
+    bash_security_hook,
+    clear_verdict_cache,
+    evaluate_command,
+    extract_commands,
+    get_command_for_validation,
+    make_bash_security_hook,
+    split_command_segments,
+    validate_chmod_command,
+    validate_init_script,
+    validate_pkill_command,
+)
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "bash_commands.jsonl"
+
+CHAIN_PARTS = [
+    "git status",
+    "ls -la src",
+    "chmod +x init.sh",
+    "npm test -- --watch=false",
+    "pkill -f node",
+    "./init.sh",
+    "grep -rn TODO src | head -20",
+]
+
+
+# =============================================================================
+# Corpus suite
+# =============================================================================
+
+def load_corpus(path: Path) -> list[dict[str, str]]:
+    """Load corpus entries of the form {"command": ..., "expect": "allow"|"deny"}."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def check_corpus_verdicts(corpus: list[dict[str, str]]) -> list[str]:
+    """Return a description of every entry whose verdict differs from "expect"."""
+    mismatches = []
+    for entry in corpus:
+        allowed, reason = evaluate_command(entry["command"])
+        verdict = "allow" if allowed else "deny"
+        if verdict != entry["expect"]:
+            mismatches.append(f"expected {entry['expect']}, got {verdict} ({reason}): {entry['command']!r}")
+    return mismatches
+
+
+def percentile(sorted_samples: list[int], pct: float) -> int:
+    """Nearest-rank percentile of an ascending list."""
+    index = max(0, min(len(sorted_samples) - 1, round(pct / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples_ns: list[int]) -> dict[str, float]:
+    """Reduce per-call latencies to p50/p99 (microseconds) and calls per second."""
+    ordered = sorted(samples_ns)
+    total_s = sum(ordered) / 1e9
+    return {
+        "p50_us": percentile(ordered, 50) / 1000,
+        "p99_us": percentile(ordered, 99) / 1000,
+        "throughput": len(ordered) / total_s if total_s else float("inf"),
+    }
+
+
+def time_sync(func: Callable[[str], object], commands: list[str], rounds: int) -> list[int]:
+    """Per-call latencies in nanoseconds for a synchronous target."""
+    samples = []
+    for _ in range(rounds):
+        for command in commands:
+            start = time.perf_counter_ns()
+            func(command)
+            samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+async def time_hook(hook: HookCallback, commands: list[str], rounds: int) -> list[int]:
+    """Per-call latencies in nanoseconds for an async hook, cache warmed by round one."""
+    inputs = [{"tool_name": "Bash", "tool_input": {"command": c}} for c in commands]
+    samples = []
+    for _ in range(rounds):
+        for hook_input in inputs:
+            start = time.perf_counter_ns()
+            await hook(hook_input, None, None)
+            samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+async def time_audited_hook(commands: list[str], rounds: int) -> list[int]:
+    """Like time_hook, with an AuditLog attached that writes to a temporary file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        audit = AuditLog(Path(tmpdir) / AUDIT_LOG_FILE)
+        samples = await time_hook(make_bash_security_hook(audit=audit), commands, rounds)
+        await audit.aclose()
+    return samples
+
+
+def run_corpus_benchmark(commands: list[str], rounds: int) -> dict[str, dict[str, float]]:
+    """Replay the corpus through every target and return their summaries."""
+    clear_verdict_cache()
+    return {
+        "bash_security_hook": summarize(asyncio.run(time_hook(bash_security_hook, commands, rounds))),
+        "hook_with_audit_log": summarize(asyncio.run(time_audited_hook(commands, rounds))),
+        "evaluate_command": summarize(time_sync(evaluate_command, commands, rounds)),
+        "extract_commands": summarize(time_sync(extract_commands, commands, rounds)),
+        "split_command_segments": summarize(time_sync(split_command_segments, commands, rounds)),
+    }
+
+
+def print_results(results: dict[str, dict[str, float]]) -> None:
+    """Print a latency/throughput table."""
+    print(f"{'target':<24} {'p50 (us)':>10} {'p99 (us)':>10} {'calls/s':>12}")
+    for target, stats in results.items():
+        print(
+            f"{target:<24} {stats['p50_us']:>10.2f} {stats['p99_us']:>10.2f} "
+            f"{stats['throughput']:>12,.0f}"
+        )
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]] | None,
+    tolerance: float,
+    max_p99_us: float | None,
+) -> list[str]:
+    """Compare results with the absolute and baseline-relative thresholds."""
+    regressions = []
+    for target, stats in results.items():
+        if max_p99_us is not None and stats["p99_us"] > max_p99_us:
+            regressions.append(f"{target}: p99 {stats['p99_us']:.2f}us > {max_p99_us:.2f}us")
+        if baseline and target in baseline:
+            limit = baseline[target]["p99_us"] * (1 + tolerance)
+            if stats["p99_us"] > limit:
+                regressions.append(
+                    f"{target}: p99 {stats['p99_us']:.2f}us > baseline "
+                    f"{baseline[target]['p99_us']:.2f}us +{tolerance:.0%}"
+                )
+    return regressions
+
+
+# =============================================================================
+# Chain suite
+# =============================================================================
+
+def generate_chain(length: int) -> str:
+    """Build a compound command with `length` commands joined by && and ;."""
+    parts = []
+    for i in range(length):
+        parts.append(CHAIN_PARTS[i % len(CHAIN_PARTS)])
+        if i < length - 1:
+            parts.append("&&" if i % 2 == 0 else ";")
+    return " ".join(parts)
+
+
+def legacy_evaluate(command: str) -> tuple[bool, str]:
+    """The pre-tokenizer pipeline: re-parses every segment per validated command."""
+    commands = extract_commands(command)
+    if not commands:
+        return False, "Could not parse command"
+
+    segments = split_command_segments(command)
+    validators = {
+        "pkill": validate_pkill_command,
+        "chmod": validate_chmod_command,
+        "init.sh": validate_init_script,
+    }
+
+    for cmd in commands:
+        if cmd not in ALLOWED_COMMANDS:
+            return False, f"Command '{cmd}' is not in the allowed list"
+        if cmd in COMMANDS_NEEDING_EXTRA_VALIDATION and cmd in validators:
+            cmd_segment = get_command_for_validation(cmd, segments) or command
+            allowed, reason = validators[cmd](cmd_segment)
+            if not allowed:
+                return False, reason
+
+    return True, ""
+
+
+def time_call(func: Callable[[str], object], command: str, repeat: int) -> float:
+    """Return the best wall time in seconds over `repeat` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(command)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_chain_benchmark(lengths: list[int], repeat: int) -> None:
+    """Print a timing table for evaluating chains of increasing length."""
+    print(f"{'commands':>10} {'tokenizer (ms)':>16} {'legacy (ms)':>14} {'speedup':>9}")
+    for length in lengths:
+        command = generate_chain(length)
+        new = time_call(evaluate_command, command, repeat)
+        old = time_call(legacy_evaluate, command, repeat)
+        print(f"{length:>10} {new * 1000:>16.3f} {old * 1000:>14.3f} {old / new:>8.1f}x")
+
+
+# =============================================================================
+# Entry point
+# =============================================================================
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark security command validation")
+    parser.add_argument(
+        "--suite",
+        choices=["corpus", "chains", "all"],
+        default="corpus",
+        help="Which benchmark suite to run (default: corpus)",
+    )
+    parser.add_argument(
+        "--corpus",
+        type=Path,
+        default=DEFAULT_CORPUS,
+        help="JSONL command corpus (default: benchmarks/data/bash_commands.jsonl)",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=200,
+        help="Times the corpus is replayed per target (default: 200)",
+    )
+    parser.add_argument(
+        "--max-p99-us",
+        type=float,
+        default=None,
+        help="Fail if any target's p99 latency exceeds this many microseconds",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="Baseline JSON written by --save-baseline to compare against",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed p99 slowdown relative to the baseline (default: 0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        type=Path,
+        default=None,
+        help="Write the corpus results to this JSON file",
+    )
+    parser.add_argument(
+        "--lengths",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100, 500, 1000],
+        help="Chain lengths for the chains suite (default: 1 10 100 500 1000)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Repetitions per chain measurement, best time is reported (default: 5)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    status = 0
+
+    if args.suite in ("corpus", "all"):
+        corpus = load_corpus(args.corpus)
+        mismatches = check_corpus_verdicts(corpus)
+        for mismatch in mismatches:
+            print(f"VERDICT MISMATCH: {mismatch}")
+        if mismatches:
+            status = 1
+
+        commands = [entry["command"] for entry in corpus]
+        print(f"Corpus: {len(commands)} commands x {args.rounds} rounds\n")
+        results = run_corpus_benchmark(commands, args.rounds)
+        print_results(results)
+
+        if args.save_baseline:
+            args.save_baseline.write_text(json.dumps(results, indent=2))
+            print(f"\nBaseline written to {args.save_baseline}")
+
+        baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+        regressions = find_regressions(results, baseline, args.tolerance, args.max_p99_us)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            status = 1
+
+    if args.suite in ("chains", "all"):
+        if args.suite == "all":
+            print()
+        run_chain_benchmark(args.lengths, args.repeat)
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,10 +9,11 @@ __version__ = "0.1.0"
 
 from .agent import run_autonomous_agent
 from .client import create_options
-from .security import bash_security_hook
+from .security import SecurityPolicy, bash_security_hook
 
 __all__ = [
     "run_autonomous_agent",
     "create_options",
     "bash_security_hook",
+    "SecurityPolicy",
 ]
@@ -10,9 +10,11 @@ Reference:
 """
 
 import asyncio
-import json
+import contextlib
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from claude_agent_sdk import (
     query,
@@ -23,32 +25,83 @@ from claude_agent_sdk import (
     ResultMessage,
 )
 
+from .audit import AUDIT_LOG_FILE, AuditLog
+from .budget import BudgetGovernor
 from .client import create_options
-from .progress import print_session_header, print_progress_summary, save_session_id
+from .events import (
+    BlockedEvent,
+    EventBus,
+    ResultEvent,
+    SessionEvent,
+    TextEvent,
+    ToolResultEvent,
+    ToolUseEvent,
+)
+from .feature_db import FeatureDB
+from .history import ProgressHistory
+from .metrics import MetricsExporter, SessionStats
+from .output import ConsoleSink, OutputSink, SessionOutput
+from .path_scope import PathScope
+from .security import SecurityPolicy
+from .progress import (
+    count_passing_tests,
+    print_session_header,
+    print_progress_summary,
+    save_session_id,
+)
 from .prompts import (
     get_initializer_prompt,
     get_coding_prompt,
     get_existing_project_prompt,
     copy_spec_to_project,
+    format_next_features,
+    format_stall_recovery,
 )
+from .replay import TRANSCRIPT_FILE, TranscriptRecorder
+from .response import ResponseBuffer
+from .scheduling import BackoffPolicy, DelayPolicy
+from .state import RunStateStore
+from .termination import StallDetector, git_head
+from .tracing import TOOL_TRACE_FILE, ToolTracer, TraceWriter, print_slowest_tools
+from .watcher import ProgressWatcher
 
 
 # Configuration
-AUTO_CONTINUE_DELAY_SECONDS = 3
-SESSION_FILE = "claude_session.json"
-
-
-def load_last_session_id(project_dir: Path) -> Optional[str]:
-    """Load the last session ID for resumption."""
-    session_file = project_dir / SESSION_FILE
-    if session_file.exists():
-        try:
-            with open(session_file) as f:
-                data = json.load(f)
-                return data.get("session_id")
-        except (json.JSONDecodeError, IOError):
-            pass
-    return None
+NEXT_FEATURES_IN_PROMPT = 5
+
+
+def message_events(msg: Any) -> Iterator[SessionEvent]:
+    """Translate one SDK message into session events."""
+    # AssistantMessage: text and tool use
+    if isinstance(msg, AssistantMessage):
+        for block in msg.content:
+            if isinstance(block, TextBlock):
+                yield TextEvent(block.text)
+            elif isinstance(block, ToolUseBlock):
+                yield ToolUseEvent(getattr(block, "id", ""), block.name, getattr(block, "input", ""))
+
+    # Tool results
+    elif hasattr(msg, 'content') and isinstance(msg.content, list):
+        for block in msg.content:
+            if isinstance(block, ToolResultBlock):
+                tool_use_id = getattr(block, "tool_use_id", "")
+                is_error = bool(getattr(block, "is_error", False))
+                result_content = getattr(block, "content", "")
+
+                if "blocked" in str(result_content).lower():
+                    yield BlockedEvent(tool_use_id, result_content, is_error)
+                else:
+                    yield ToolResultEvent(tool_use_id, result_content, is_error)
+
+    # Result message: final message with session info
+    if isinstance(msg, ResultMessage):
+        yield ResultEvent(
+            session_id=getattr(msg, "session_id", None),
+            cost_usd=getattr(msg, "total_cost_usd", None),
+            num_turns=getattr(msg, "num_turns", 0),
+            duration_ms=getattr(msg, "duration_ms", 0),
+            usage=getattr(msg, "usage", None),
+        )
 
 
 async def run_agent_session(
@@ -57,6 +110,16 @@ async def run_agent_session(
     model: str,
     resume_session_id: Optional[str] = None,
     system_prompt: Optional[str] = None,
+    security_policy: Optional[SecurityPolicy] = None,
+    audit_log: Optional[AuditLog] = None,
+    path_scope: Optional[PathScope] = None,
+    run_state: Optional[RunStateStore] = None,
+    stats: Optional[SessionStats] = None,
+    response: Optional[ResponseBuffer] = None,
+    sink: Optional[OutputSink] = None,
+    events: Optional[EventBus] = None,
+    message_source: Optional[Callable[..., AsyncIterator[Any]]] = None,
+    recorder: Optional[TranscriptRecorder] = None,
 ) -> tuple[str, str, Optional[str]]:
     """
     Run a single agent session using Claude Agent SDK.
@@ -67,9 +130,22 @@ async def run_agent_session(
         model: Claude model to use
         resume_session_id: Optional session ID to resume
         system_prompt: Optional custom system prompt
+        security_policy: Optional Bash policy for this session
+        audit_log: Optional audit log for Bash allow/deny decisions
+        path_scope: Directories file tools may touch (default: project_dir only)
+        run_state: Store to record the session ID in; the caller flushes it
+        stats: Optional SessionStats to fill in with cost, tokens, turns and tool calls
+        response: Buffer for the session's text (default: the last
+            DEFAULT_RESPONSE_CHARS characters in memory); closed when the session ends
+        sink: Where streamed output is rendered (default: ConsoleSink); not closed
+        events: Optional bus that receives every event of the session
+        message_source: Called like query() for the session's messages
+            (default: query; pass a TranscriptReplay to run without the API)
+        recorder: Optional transcript to append the session's messages to
 
     Returns:
-        (status, response_text, session_id) where status is:
+        (status, response_text, session_id) where response_text is the
+        retained text and status is:
         - "continue" if agent should continue working
         - "error" if an error occurred
     """
@@ -80,62 +156,59 @@ async def run_agent_session(
         model=model,
         resume_session_id=resume_session_id,
         system_prompt=system_prompt,
+        security_policy=security_policy,
+        audit_log=audit_log,
+        path_scope=path_scope,
     )
 
     session_id = None
-    response_text = ""
+    if response is None:
+        response = ResponseBuffer()
+    output = SessionOutput(sink or ConsoleSink())
+    output.start()
+    started = time.monotonic()
+
+    # Per-session observers; the caller's bus receives every event after them
+    bus = EventBus(parent=events)
+    bus.subscribe(TextEvent, lambda e: response.append(e.text))
+    output.attach(bus)
+    if stats is not None:
+        stats.attach(bus)
+
+    if recorder is not None:
+        recorder.start_session(prompt, model)
 
     try:
-        async for msg in query(prompt=prompt, options=options):
-            # Handle AssistantMessage (text and tool use)
-            if isinstance(msg, AssistantMessage):
-                for block in msg.content:
-                    if isinstance(block, TextBlock):
-                        response_text += block.text
-                        print(block.text, end="", flush=True)
-                    elif isinstance(block, ToolUseBlock):
-                        print(f"\n[Tool: {block.name}]", flush=True)
-                        if hasattr(block, "input"):
-                            input_str = str(block.input)
-                            if len(input_str) > 200:
-                                print(f"   Input: {input_str[:200]}...", flush=True)
-                            else:
-                                print(f"   Input: {input_str}", flush=True)
-
-            # Handle tool results
-            elif hasattr(msg, 'content') and isinstance(msg.content, list):
-                for block in msg.content:
-                    if isinstance(block, ToolResultBlock):
-                        is_error = getattr(block, "is_error", False)
-                        result_content = getattr(block, "content", "")
-
-                        if "blocked" in str(result_content).lower():
-                            print(f"   [BLOCKED] {result_content}", flush=True)
-                        elif is_error:
-                            error_str = str(result_content)[:500]
-                            print(f"   [Error] {error_str}", flush=True)
-                        else:
-                            print("   [Done]", flush=True)
-
-            # Handle result message (final message with session info)
-            if isinstance(msg, ResultMessage):
-                if hasattr(msg, 'session_id'):
-                    session_id = msg.session_id
-                if hasattr(msg, 'total_cost_usd'):
-                    print(f"\nSession cost: ${msg.total_cost_usd:.4f}")
-
-        print("\n" + "-" * 70 + "\n")
+        async for msg in (message_source or query)(prompt=prompt, options=options):
+            if recorder is not None:
+                recorder.record(msg)
+            for event in message_events(msg):
+                bus.emit(event)
+                if type(event) is ResultEvent and event.session_id:
+                    session_id = event.session_id
+
+        output.emit("info", "\n" + "-" * 70 + "\n")
 
         # Save session ID for future resumption
         if session_id:
-            save_session_id(project_dir, session_id)
+            if run_state is not None:
+                run_state.record_session(session_id)  # Flushed by the caller
+            else:
+                save_session_id(project_dir, session_id)
 
-        return "continue", response_text, session_id
+        return "continue", response.text(), session_id
 
     except Exception as e:
+        await output.aclose()  # Keep the error after the streamed output
         print(f"Error during agent session: {e}")
         return "error", str(e), session_id
 
+    finally:
+        await output.aclose()
+        response.close()
+        if stats is not None:
+            stats.wall_seconds = time.monotonic() - started
+
 
 async def run_autonomous_agent(
     project_dir: Path,
@@ -144,6 +217,21 @@ async def run_autonomous_agent(
     analyze_first: bool = False,
     resume: bool = False,
     system_prompt: Optional[str] = None,
+    security_policy: Optional[SecurityPolicy] = None,
+    audit_log: bool = False,
+    allowed_paths: Optional[list[Path]] = None,
+    feature_index: bool = False,
+    watch_progress: bool = False,
+    session_slots: Optional[asyncio.Semaphore] = None,
+    delay_policy: Optional[DelayPolicy] = None,
+    output_sink: Optional[OutputSink] = None,
+    events: Optional[EventBus] = None,
+    trace_tools: bool = False,
+    stop_when_complete: bool = True,
+    stall_detector: Optional[StallDetector] = None,
+    budget: Optional[BudgetGovernor] = None,
+    record_transcript: bool = False,
+    message_source: Optional[Callable[..., AsyncIterator[Any]]] = None,
 ) -> None:
     """
     Run the autonomous agent loop.
@@ -155,6 +243,21 @@ async def run_autonomous_agent(
         analyze_first: Whether to analyze existing project first
         resume: Whether to resume from last session
         system_prompt: Optional custom system prompt
+        security_policy: Optional Bash policy for every session of this run
+        audit_log: Whether to record Bash allow/deny decisions to security_audit.jsonl
+        allowed_paths: Extra directories file tools may access besides project_dir
+        feature_index: Whether to maintain a SQLite index of feature_list.json
+        watch_progress: Whether to report progress live while sessions run
+        session_slots: Semaphore shared by concurrent runs to bound active sessions
+        delay_policy: Pause between sessions (default: BackoffPolicy)
+        output_sink: Where session output is rendered (default: ConsoleSink); not closed
+        events: Optional bus that receives the events of every session
+        trace_tools: Whether to append tool call spans to tool_trace.json
+        stop_when_complete: Whether to stop once every feature passes
+        stall_detector: Handling of sessions without progress (default: StallDetector())
+        budget: Optional cost and token limits, checked before every session
+        record_transcript: Whether to record every session's messages to session_transcript.jsonl
+        message_source: Called like query() for each session's messages (default: query)
     """
     print("\n" + "=" * 70)
     print("  NONSTOP AGENT")
@@ -172,11 +275,18 @@ async def run_autonomous_agent(
     print()
 
     project_dir.mkdir(parents=True, exist_ok=True)
+    feature_db = FeatureDB(project_dir) if feature_index else None
+    run_state = RunStateStore(project_dir)
+    history = ProgressHistory(project_dir)
+    metrics = MetricsExporter(project_dir)
+    trace_writer = TraceWriter(project_dir / TOOL_TRACE_FILE) if trace_tools else None
+    recorder = TranscriptRecorder(project_dir / TRANSCRIPT_FILE) if record_transcript else None
+    delay_policy = delay_policy or BackoffPolicy()
 
     # Check for session resumption
     resume_session_id = None
     if resume:
-        resume_session_id = load_last_session_id(project_dir)
+        resume_session_id = run_state.state.last_session_id
         if resume_session_id:
             print(f"Resuming session: {resume_session_id}")
         else:
@@ -204,62 +314,171 @@ async def run_autonomous_agent(
         copy_spec_to_project(project_dir)
     else:
         print("Continuing existing project")
-        print_progress_summary(project_dir)
+        print_progress_summary(project_dir, feature_db, history)
 
-    # Main loop
-    iteration = 0
-    current_session_id = resume_session_id
+    audit = AuditLog(project_dir / AUDIT_LOG_FILE) if audit_log else None
+    path_scope = PathScope(project_dir, allowed_paths or ())
 
-    while True:
-        iteration += 1
+    if history.last is None:
+        # Baseline, so the first session's gains are counted
+        history.append(run_state.state.iteration, *count_passing_tests(project_dir, feature_db))
 
-        if max_iterations and iteration > max_iterations:
-            print(f"\nReached max iterations ({max_iterations})")
-            break
+    watcher = None
+    if watch_progress:
+        watcher = ProgressWatcher(project_dir, on_change=run_state.record_progress)
+        watcher.start()
+        print(f"Watching feature_list.json for progress ({watcher.mode})")
 
-        # Determine prompt type
-        if needs_analysis:
-            prompt_type = "analysis"
-            needs_analysis = False
-        elif is_first_run:
-            prompt_type = "initializer"
-            is_first_run = False
-        else:
-            prompt_type = "coding"
+    if not resume:
+        run_state.reset_budget()  # A fresh run starts a fresh budget
 
-        print_session_header(iteration, prompt_type)
-
-        # Choose prompt
-        if prompt_type == "analysis":
-            prompt = get_existing_project_prompt()
-        elif prompt_type == "initializer":
-            prompt = get_initializer_prompt()
-        else:
-            prompt = get_coding_prompt()
-
-        # Run the session
-        status, response, session_id = await run_agent_session(
-            prompt=prompt,
-            project_dir=project_dir,
-            model=model,
-            resume_session_id=current_session_id if iteration == 1 else None,
-            system_prompt=system_prompt,
-        )
-
-        if session_id:
-            current_session_id = session_id
+    stall_detector = stall_detector or StallDetector()
+    stall_detector.observe(
+        count_passing_tests(project_dir, feature_db)[0], await git_head(project_dir)
+    )
 
-        if status == "continue":
-            print(f"\nAgent will auto-continue in {AUTO_CONTINUE_DELAY_SECONDS}s...")
-            print_progress_summary(project_dir)
-            await asyncio.sleep(AUTO_CONTINUE_DELAY_SECONDS)
-        elif status == "error":
-            print("\nSession encountered an error, retrying...")
-            await asyncio.sleep(AUTO_CONTINUE_DELAY_SECONDS)
+    # Main loop
+    iteration = 0
+    current_session_id = resume_session_id
 
-        if max_iterations is None or iteration < max_iterations:
-            print("\nPreparing next session...\n")
-            await asyncio.sleep(1)
+    try:
+        while True:
+            iteration += 1
+
+            if max_iterations and iteration > max_iterations:
+                print(f"\nReached max iterations ({max_iterations})")
+                break
+
+            if stop_when_complete and not (needs_analysis or is_first_run):
+                passing, total = count_passing_tests(project_dir, feature_db)
+                if total > 0 and passing >= total:
+                    print(f"\nAll {total} features are passing, stopping")
+                    break
+
+            session_model = model
+            if (
+                stall_detector.recovering
+                and stall_detector.policy == "escalate"
+                and stall_detector.escalation_model
+            ):
+                session_model = stall_detector.escalation_model
+
+            if budget is not None and budget.enabled:
+                decision = budget.check(session_model, run_state.state)
+                while decision.action == "wait":
+                    print(f"\n{decision.reason}, waiting {decision.wait_seconds / 60:.1f} min")
+                    await asyncio.sleep(decision.wait_seconds)
+                    decision = budget.check(session_model, run_state.state)
+                if decision.action == "stop":
+                    print(f"\n{decision.reason}")
+                    break
+                session_model = decision.model
+
+            # Determine prompt type
+            if needs_analysis:
+                prompt_type = "analysis"
+                needs_analysis = False
+            elif is_first_run:
+                prompt_type = "initializer"
+                is_first_run = False
+            else:
+                prompt_type = "coding"
+
+            print_session_header(iteration, prompt_type)
+            if session_model != model:
+                print(f"Model: {session_model}")
+
+            # Choose prompt
+            if prompt_type == "analysis":
+                prompt = get_existing_project_prompt()
+            elif prompt_type == "initializer":
+                prompt = get_initializer_prompt()
+            else:
+                prompt = get_coding_prompt()
+                if feature_db is not None and feature_db.sync():
+                    prompt += format_next_features(feature_db.next_failing(NEXT_FEATURES_IN_PROMPT))
+                if stall_detector.recovering:
+                    prompt += format_stall_recovery(stall_detector.iterations)
+
+            if feature_db is not None:
+                feature_db.start_session()
+
+            # Run the session
+            stats = SessionStats()
+            session_events = EventBus(parent=events)
+            tracer = ToolTracer(trace_writer)
+            tracer.attach(session_events)
+            async with session_slots or contextlib.nullcontext():
+                status, response, session_id = await run_agent_session(
+                    prompt=prompt,
+                    project_dir=project_dir,
+                    model=session_model,
+                    resume_session_id=current_session_id if iteration == 1 else None,
+                    system_prompt=system_prompt,
+                    security_policy=security_policy,
+                    audit_log=audit,
+                    path_scope=path_scope,
+                    run_state=run_state,
+                    stats=stats,
+                    response=ResponseBuffer(max_chars=0),  # The loop never reads it
+                    sink=output_sink,
+                    events=session_events,
+                    message_source=message_source,
+                    recorder=recorder,
+                )
+
+            if session_id:
+                current_session_id = session_id
+
+            passing, total = count_passing_tests(project_dir, feature_db)
+            run_state.record_progress(passing, total)
+            run_iteration = run_state.record_iteration()
+            run_state.record_usage(stats.cost_usd, stats.total_tokens)
+            if budget is not None:
+                budget.observe(session_model, stats.cost_usd, stats.total_tokens)
+            history.append(run_iteration, passing, total, stats.cost_usd, stats.wall_seconds)
+            metrics.record(run_iteration, status, stats, passing, total)
+            run_state.flush()
+            print_slowest_tools(tracer.finish(f"session {run_iteration}"))
+
+            # Only finished coding sessions count; failed sessions are the delay policy's job
+            stall_action = None
+            if status == "continue" and prompt_type == "coding":
+                stall_action = stall_detector.observe(passing, await git_head(project_dir))
+            if stall_action == "stop":
+                print(
+                    f"\nNo progress in {stall_detector.iterations} sessions "
+                    "(passing count and git HEAD unchanged), stopping"
+                )
+                break
+            if stall_action == "recover":
+                print(
+                    f"\nNo progress in {stall_detector.iterations} sessions, "
+                    f"switching to the recovery prompt ({stall_detector.policy})"
+                )
+
+            delay = delay_policy.next_delay(status)
+            if status == "continue":
+                print_progress_summary(project_dir, feature_db, history)
+            elif status == "error":
+                print("\nSession encountered an error, retrying...")
+
+            if max_iterations is None or iteration < max_iterations:
+                if delay > 0:
+                    print(f"\nNext session in {delay:.1f}s...")
+                    await asyncio.sleep(delay)
+                print("\nPreparing next session...\n")
+    finally:
+        if watcher is not None:
+            await watcher.stop()
+        if audit is not None:
+            await audit.aclose()
+        if feature_db is not None:
+            feature_db.close()
+        if trace_writer is not None:
+            trace_writer.close()
+        if recorder is not None:
+            recorder.close()
 
     # Final summary
     print("\n" + "=" * 70)
@@ -267,5 +486,5 @@ async def run_autonomous_agent(
     print("=" * 70)
     print(f"\nLast session ID: {current_session_id}")
     print("To resume later: --resume")
-    print_progress_summary(project_dir)
+    print_progress_summary(project_dir, history=history)
     print("\nDone!")
@@ -0,0 +1,155 @@
+"""
+Security Audit Log
+==================
+
+Buffered, append-only JSONL record of every Bash allow/deny decision.
+
+The hook only appends a tuple to an in-memory list; a background task
+serializes pending decisions in batches and writes them from a worker
+thread, so the PreToolUse path never waits on disk I/O. The file is
+rotated by size (security_audit.jsonl -> .1 -> .2 ...).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+
+AUDIT_LOG_FILE = "security_audit.jsonl"
+
+# (timestamp, session_id, tool_use_id, command, allowed, reason, elapsed_ns)
+_Decision = tuple[float, "str | None", "str | None", str, bool, str, int]
+
+
+class AuditLog:
+    """In-memory queue of security decisions flushed to JSONL in the background."""
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 3,
+        flush_interval: float = 1.0,
+        batch_size: int = 256,
+    ) -> None:
+        """
+        Args:
+            path: JSONL file to append to
+            max_bytes: Rotate once the file would grow past this size
+            backup_count: Number of rotated files to keep
+            flush_interval: Seconds between background flushes
+            batch_size: Pending records that trigger an early flush
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._pending: list[_Decision] = []
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._closing = False
+        self._write_lock = asyncio.Lock()
+
+    def record(
+        self,
+        session_id: str | None,
+        tool_use_id: str | None,
+        command: str,
+        allowed: bool,
+        reason: str,
+        elapsed_ns: int,
+    ) -> None:
+        """Queue one decision; never blocks on I/O."""
+        self._pending.append(
+            (time.time(), session_id, tool_use_id, command, allowed, reason, elapsed_ns)
+        )
+
+        if self._task is None:
+            self._start()
+        elif len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _start(self) -> None:
+        """Start the background flusher if an event loop is running."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop: records are written by flush()/aclose()
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        assert self._wakeup is not None
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write all pending records to disk."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        async with self._write_lock:
+            await asyncio.to_thread(self._write, pending)
+
+    async def aclose(self) -> None:
+        """Stop the background flusher and write whatever is still pending."""
+        if self._task is not None and self._wakeup is not None:
+            # Let the loop finish its current flush instead of cancelling it mid-write
+            self._closing = True
+            self._wakeup.set()
+            try:
+                await self._task
+            finally:
+                self._task = None
+                self._closing = False
+        await self.flush()
+
+    def _write(self, records: list[_Decision]) -> None:
+        """Serialize and append a batch, rotating first if it would overflow."""
+        data = "".join(
+            json.dumps({
+                "timestamp": timestamp,
+                "session_id": session_id,
+                "tool_use_id": tool_use_id,
+                "command": command,
+                "verdict": "allow" if allowed else "deny",
+                "reason": reason,
+                "eval_us": round(elapsed_ns / 1000, 1),
+            }) + "\n"
+            for timestamp, session_id, tool_use_id, command, allowed, reason, elapsed_ns in records
+        ).encode()
+
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size and size + len(data) > self.max_bytes:
+            self._rotate()
+
+        try:
+            with open(self.path, "ab") as f:
+                f.write(data)
+        except OSError as e:
+            print(f"Warning: Could not write security audit log: {e}")
+
+    def _rotate(self) -> None:
+        """Shift path -> path.1 -> path.2 ..., dropping the oldest backup."""
+        if self.backup_count <= 0:
+            self.path.unlink(missing_ok=True)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            source = Path(f"{self.path}.{i}")
+            if source.exists():
+                os.replace(source, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
@@ -0,0 +1,164 @@
+"""
+Budget Governor
+===============
+
+Caps what a run may spend, checked before every session.
+
+- Run budgets (--max-cost-usd, --max-tokens) count usage since the run
+  started, persisted in run_state.json so they carry over with --resume.
+- Hourly limits (--max-cost-per-hour, --max-tokens-per-hour) count usage
+  of the last hour across runs of the project, so one project cannot
+  saturate a shared account. Hitting one makes the loop wait, not stop.
+
+A session is only started if its expected usage still fits: the average
+usage of earlier sessions on the same model, counted once more for every
+session still running (parallel workers). When it would not fit the
+run budget, the governor switches to the fallback model if one is set
+(cheaper sessions may still fit) and otherwise stops the run.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from .state import USAGE_WINDOW_SECONDS, RunState
+
+
+@dataclass(frozen=True)
+class BudgetDecision:
+    """What to do before the next session."""
+
+    action: str  # "run", "wait" or "stop"
+    model: str
+    wait_seconds: float = 0.0
+    reason: str = ""
+
+
+@dataclass
+class _ModelUsage:
+    sessions: int = 0
+    cost_usd: float = 0.0
+    tokens: int = 0
+
+
+@dataclass
+class BudgetGovernor:
+    """Run and hourly budgets for one project's loop."""
+
+    max_cost_usd: float | None = None
+    max_tokens: int | None = None
+    max_cost_per_hour: float | None = None
+    max_tokens_per_hour: int | None = None
+    fallback_model: str | None = None
+    clock: Callable[[], float] = time.time
+
+    downgraded: bool = field(default=False, init=False)
+    _usage: dict[str, _ModelUsage] = field(default_factory=dict, init=False, repr=False)
+
+    @property
+    def enabled(self) -> bool:
+        return any(
+            limit is not None
+            for limit in (
+                self.max_cost_usd, self.max_tokens, self.max_cost_per_hour, self.max_tokens_per_hour
+            )
+        )
+
+    def observe(self, model: str, cost_usd: float, tokens: int) -> None:
+        """Record a finished session's usage on a model, for estimates."""
+        usage = self._usage.setdefault(model, _ModelUsage())
+        usage.sessions += 1
+        usage.cost_usd += cost_usd
+        usage.tokens += tokens
+
+    def _estimate(self, model: str, state: RunState) -> tuple[float, float]:
+        """Expected (cost, tokens) of the next session on model."""
+        usage = self._usage.get(model)
+        if usage is not None and usage.sessions:
+            return usage.cost_usd / usage.sessions, usage.tokens / usage.sessions
+        if model == self.fallback_model and self.downgraded:
+            return 0.0, 0.0  # No data on the fallback model yet: allow one session
+        if state.spent_sessions:
+            return (
+                state.spent_cost_usd / state.spent_sessions,
+                state.spent_tokens / state.spent_sessions,
+            )
+        return 0.0, 0.0
+
+    def _over_run_budget(self, model: str, state: RunState, pending: int) -> str:
+        """Describe the exceeded run budget, or return "" if the session fits."""
+        cost, tokens = self._estimate(model, state)
+        cost, tokens = cost * (pending + 1), tokens * (pending + 1)
+        if self.max_cost_usd is not None and (
+            state.spent_cost_usd >= self.max_cost_usd
+            or state.spent_cost_usd + cost > self.max_cost_usd
+        ):
+            return (
+                f"cost budget: ${state.spent_cost_usd:.2f} spent of ${self.max_cost_usd:.2f}, "
+                f"next session ~${cost:.2f}"
+            )
+        if self.max_tokens is not None and (
+            state.spent_tokens >= self.max_tokens or state.spent_tokens + tokens > self.max_tokens
+        ):
+            return (
+                f"token budget: {state.spent_tokens:,} used of {self.max_tokens:,}, "
+                f"next session ~{tokens:,.0f}"
+            )
+        return ""
+
+    def _rate_wait(self, model: str, state: RunState, pending: int) -> float:
+        """Seconds until the last hour's usage leaves room for the next session."""
+        now = self.clock()
+        window = [entry for entry in state.usage_window if entry[0] > now - USAGE_WINDOW_SECONDS]
+        cost, tokens = self._estimate(model, state)
+        cost, tokens = cost * (pending + 1), tokens * (pending + 1)
+
+        wait = 0.0
+        for limit, column, expected in (
+            (self.max_cost_per_hour, 1, cost),
+            (self.max_tokens_per_hour, 2, tokens),
+        ):
+            if limit is None:
+                continue
+            excess = sum(entry[column] for entry in window) + expected - limit
+            # Wait for the oldest sessions to age out of the window until it fits;
+            # a session larger than the limit runs once the window is empty
+            for entry in window:
+                if excess <= 0:
+                    break
+                excess -= entry[column]
+                wait = max(wait, entry[0] + USAGE_WINDOW_SECONDS - now)
+        return wait
+
+    def check(self, model: str, state: RunState, pending: int = 0) -> BudgetDecision:
+        """
+        Decide whether the next session may start.
+
+        Args:
+            model: Model the next session would use
+            state: Run state holding the usage so far
+            pending: Sessions already running whose usage is not recorded yet
+
+        Returns:
+            BudgetDecision with the model to use
+        """
+        if self.downgraded and self.fallback_model:
+            model = self.fallback_model
+
+        reason = self._over_run_budget(model, state, pending)
+        if reason and self.fallback_model and not self.downgraded:
+            self.downgraded = True
+            print(f"\nBudget: {reason}; switching to fallback model {self.fallback_model}")
+            model = self.fallback_model
+            reason = self._over_run_budget(model, state, pending)
+        if reason:
+            return BudgetDecision("stop", model, reason=f"Stopping at the {reason}")
+
+        wait = self._rate_wait(model, state, pending)
+        if wait > 0:
+            return BudgetDecision(
+                "wait", model, wait_seconds=wait, reason="Hourly usage limit reached"
+            )
+        return BudgetDecision("run", model)
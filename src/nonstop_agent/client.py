@@ -12,9 +12,13 @@ from typing import Optional
 
 from claude_agent_sdk import ClaudeAgentOptions, HookMatcher
 
-from .security import bash_security_hook
+from .audit import AuditLog
+from .path_scope import FILE_TOOLS_MATCHER, PathScope, make_path_scope_hook
+from .security import SecurityPolicy, make_bash_security_hook
 
 
+DEFAULT_MODEL = "claude-opus-4-5-20251101"
+
 # Default system prompt for autonomous coding
 DEFAULT_SYSTEM_PROMPT = """You are an expert autonomous coding agent.
 You work continuously across multiple sessions to complete complex projects.
@@ -28,6 +32,9 @@ def create_options(
     system_prompt: Optional[str] = None,
     allowed_tools: Optional[list[str]] = None,
     mcp_servers: Optional[dict] = None,
+    security_policy: Optional[SecurityPolicy] = None,
+    audit_log: Optional[AuditLog] = None,
+    path_scope: Optional[PathScope] = None,
 ) -> ClaudeAgentOptions:
     """
     Create Claude Agent SDK options with multi-layered security.
@@ -39,6 +46,10 @@ def create_options(
         system_prompt: Optional custom system prompt
         allowed_tools: Optional list of allowed tools
         mcp_servers: Optional MCP server configuration
+        security_policy: Optional Bash policy bound to this session's hook
+            (default: the module-level allowlist)
+        audit_log: Optional audit log recording every Bash allow/deny decision
+        path_scope: Directories file tools may touch (default: project_dir only)
 
     Returns:
         Configured ClaudeAgentOptions
@@ -46,14 +57,23 @@ def create_options(
     Security layers (defense in depth):
     1. Sandbox - OS-level bash command isolation
     2. Permissions - File operations restricted to project_dir
-    3. Security hooks - Bash commands validated against allowlist
+    3. Security hooks - Bash commands validated against allowlist,
+       file tool paths checked against the allowed directories
     """
     project_dir.mkdir(parents=True, exist_ok=True)
 
+    if path_scope is None:
+        path_scope = PathScope(project_dir)
+
     print("Security configuration:")
     print("  - Sandbox: enabled (with autoAllowBash)")
     print(f"  - Working directory: {project_dir.resolve()}")
     print("  - Bash: allowlist validated via PreToolUse hook")
+    if security_policy is not None:
+        print(f"  - Bash policy: custom ({len(security_policy.allowed_commands)} commands)")
+    if audit_log is not None:
+        print(f"  - Security audit log: {audit_log.path}")
+    print(f"  - File tools: scoped to {', '.join(path_scope.roots)}")
     print("  - Permission mode: acceptEdits")
     if resume_session_id:
         print(f"  - Resuming session: {resume_session_id}")
@@ -81,7 +101,8 @@ def create_options(
         mcp_servers=mcp_servers or {},
         hooks={
             "PreToolUse": [
-                HookMatcher(matcher="Bash", hooks=[bash_security_hook]),
+                HookMatcher(matcher="Bash", hooks=[make_bash_security_hook(security_policy, audit_log)]),
+                HookMatcher(matcher=FILE_TOOLS_MATCHER, hooks=[make_path_scope_hook(path_scope)]),
             ],
         },
         max_turns=1000,
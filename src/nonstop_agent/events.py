@@ -0,0 +1,131 @@
+"""
+Session Events
+==============
+
+Typed events for everything a session streams, and a bus that delivers
+them to observers.
+
+run_agent_session turns each SDK message into events and emits them on an
+EventBus. Observers subscribe to an event class and also receive its
+subclasses, so subscribing to ToolResultEvent sees BlockedEvent too, and
+subscribing to SessionEvent sees everything. Handlers for each concrete
+event type are resolved once and cached, so emitting costs one dict lookup
+plus the handler calls; with no observers it is a single check.
+
+Example:
+    bus = EventBus()
+    bus.subscribe(ToolUseEvent, lambda e: print(e.name))
+    await run_agent_session(prompt, project_dir, model, events=bus)
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+
+@dataclass(frozen=True, slots=True)
+class SessionEvent:
+    """Base class of all session events."""
+
+
+@dataclass(frozen=True, slots=True)
+class TextEvent(SessionEvent):
+    """Assistant text."""
+
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class ToolUseEvent(SessionEvent):
+    """The assistant called a tool."""
+
+    tool_use_id: str
+    name: str
+    input: Any
+
+
+@dataclass(frozen=True, slots=True)
+class ToolResultEvent(SessionEvent):
+    """A tool call finished."""
+
+    tool_use_id: str
+    content: Any
+    is_error: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class BlockedEvent(ToolResultEvent):
+    """A tool call was refused by a security hook."""
+
+
+@dataclass(frozen=True, slots=True)
+class ResultEvent(SessionEvent):
+    """Final message of a session, with its cost and usage."""
+
+    session_id: str | None
+    cost_usd: float | None = None
+    num_turns: int = 0
+    duration_ms: int = 0
+    usage: dict[str, Any] | None = None
+
+
+E = TypeVar("E", bound=SessionEvent)
+Handler = Callable[[Any], None]
+
+
+class EventBus:
+    """Delivers session events to the observers subscribed to their type."""
+
+    def __init__(self, parent: EventBus | None = None) -> None:
+        """
+        Args:
+            parent: Bus that receives every event after this bus's observers
+        """
+        self.parent = parent
+        self._handlers: dict[type, list[Handler]] = {}
+        self._resolved: dict[type, tuple[Handler, ...]] = {}
+
+    def subscribe(self, event_type: type[E], handler: Callable[[E], None]) -> None:
+        """Call handler for every event of event_type or a subclass of it."""
+        self._handlers.setdefault(event_type, []).append(handler)
+        self._resolved.clear()
+
+    def unsubscribe(self, event_type: type[E], handler: Callable[[E], None]) -> None:
+        """Remove a handler added with subscribe; unknown handlers are ignored."""
+        handlers = self._handlers.get(event_type, [])
+        if handler in handlers:
+            handlers.remove(handler)
+            if not handlers:
+                del self._handlers[event_type]
+            self._resolved.clear()
+
+    def _resolve(self, event_type: type) -> tuple[Handler, ...]:
+        handlers = tuple(
+            handler
+            for cls in reversed(event_type.__mro__)  # Base class observers first
+            for handler in self._handlers.get(cls, ())
+        )
+        self._resolved[event_type] = handlers
+        return handlers
+
+    def emit(self, event: SessionEvent) -> None:
+        """
+        Deliver an event to its observers, then to the parent bus.
+
+        An observer that raises is reported and skipped, so a broken observer
+        cannot end the session.
+        """
+        if self._handlers:
+            handlers = self._resolved.get(type(event))
+            if handlers is None:
+                handlers = self._resolve(type(event))
+            for handler in handlers:
+                try:
+                    handler(event)
+                except Exception as e:
+                    print(f"Warning: Event observer {handler!r} failed: {e}", file=sys.stderr)
+        if self.parent is not None:
+            self.parent.emit(event)
@@ -0,0 +1,230 @@
+"""
+SQLite Feature Index
+====================
+
+Optional SQLite mirror of feature_list.json for fast progress and
+selection queries on very large feature lists.
+
+sync() streams the JSON file and only writes rows whose content changed,
+tagging each with the session in which it last changed. Queries such as
+"next failing feature", "count by category" or "features touched in the
+last N sessions" then run against indexed tables instead of a full scan.
+
+feature_list.json remains the source of truth; the index can be deleted
+at any time and is rebuilt on the next sync.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .features import FEATURE_LIST_FILE, feature_fields, iter_elements
+
+
+FEATURE_INDEX_FILE = "feature_index.sqlite3"
+
+# Rows written per executemany() call during sync
+SYNC_BATCH_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS features (
+    idx INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL,
+    passes INTEGER NOT NULL,
+    changed_session INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS features_passes ON features (passes, idx);
+CREATE INDEX IF NOT EXISTS features_category ON features (category, passes);
+CREATE INDEX IF NOT EXISTS features_changed ON features (changed_session);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_ROW_COLUMNS = "idx, category, description, passes, changed_session, data"
+
+
+@dataclass(frozen=True)
+class FeatureRow:
+    """One indexed feature."""
+
+    index: int
+    category: str
+    description: str
+    passes: bool
+    changed_session: int
+    data: str  # The feature's JSON, as it appears in feature_list.json
+
+    def feature(self) -> dict[str, Any]:
+        """Decode the full feature, including its steps."""
+        return json.loads(self.data)
+
+
+def _row(values: tuple[Any, ...]) -> FeatureRow:
+    index, category, description, passes, changed_session, data = values
+    return FeatureRow(index, category, description, bool(passes), changed_session, data)
+
+
+class FeatureDB:
+    """SQLite index over a project's feature_list.json."""
+
+    def __init__(self, project_dir: Path, path: Path | None = None) -> None:
+        """
+        Args:
+            project_dir: Directory containing feature_list.json
+            path: Database file (default: project_dir / FEATURE_INDEX_FILE)
+        """
+        self.feature_file = project_dir / FEATURE_LIST_FILE
+        self.path = path or project_dir / FEATURE_INDEX_FILE
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> FeatureDB:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _get_meta(self, key: str) -> str | None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    @property
+    def session(self) -> int:
+        """Current session number, persisted across runs."""
+        return int(self._get_meta("session") or 0)
+
+    def start_session(self) -> int:
+        """Advance the session counter; later changes are tagged with it."""
+        session = self.session + 1
+        with self._conn:
+            self._set_meta("session", str(session))
+        return session
+
+    def sync(self) -> bool:
+        """
+        Bring the index up to date with feature_list.json.
+
+        Does nothing while the file's (inode, mtime_ns, size) is unchanged.
+        Otherwise the file is streamed and only added or modified features
+        are written. If the file is missing or invalid, the index keeps its
+        previous contents.
+
+        Returns:
+            True if the index now reflects the current file
+        """
+        try:
+            st = os.stat(self.feature_file)
+        except OSError:
+            return False
+
+        signature = f"{st.st_ino}:{st.st_mtime_ns}:{st.st_size}"
+        if signature == self._get_meta("signature"):
+            return True
+
+        session = self.session
+        digests = dict(self._conn.execute("SELECT idx, digest FROM features"))
+        upsert = (
+            f"INSERT OR REPLACE INTO features ({_ROW_COLUMNS}, digest) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)"
+        )
+
+        try:
+            with self._conn, open(self.feature_file, "rb") as f:
+                pending: list[tuple[Any, ...]] = []
+                count = 0
+                for count, (feature, _) in enumerate(iter_elements(f), start=1):
+                    data = json.dumps(feature, ensure_ascii=False)
+                    digest = hashlib.blake2b(data.encode(), digest_size=16).digest()
+                    index = count - 1
+                    if digests.get(index) == digest:
+                        continue
+                    category, passes = feature_fields(feature)
+                    description = feature.get("description", "") if isinstance(feature, dict) else ""
+                    pending.append(
+                        (index, category, str(description), passes, session, data, digest)
+                    )
+                    if len(pending) >= SYNC_BATCH_SIZE:
+                        self._conn.executemany(upsert, pending)
+                        pending.clear()
+                self._conn.executemany(upsert, pending)
+                self._conn.execute("DELETE FROM features WHERE idx >= ?", (count,))
+                self._set_meta("signature", signature)
+        except (OSError, ValueError):  # ValueError covers JSON and UTF-8 errors
+            return False
+
+        return True
+
+    def counts(self) -> tuple[int, int]:
+        """Return (passing, total)."""
+        passing, total = self._conn.execute(
+            "SELECT COALESCE(SUM(passes), 0), COUNT(*) FROM features"
+        ).fetchone()
+        return passing, total
+
+    def count_by_category(self) -> dict[str, tuple[int, int]]:
+        """Return {category: (passing, total)}."""
+        return {
+            category: (passing, total)
+            for category, passing, total in self._conn.execute(
+                "SELECT category, SUM(passes), COUNT(*) FROM features "
+                "GROUP BY category ORDER BY MIN(idx)"
+            )
+        }
+
+    def next_failing(self, limit: int = 1, category: str | None = None) -> list[FeatureRow]:
+        """
+        Return the first failing features in file order.
+
+        Args:
+            limit: Maximum number of rows
+            category: Only consider features in this category
+        """
+        if category is None:
+            rows = self._conn.execute(
+                f"SELECT {_ROW_COLUMNS} FROM features WHERE passes = 0 ORDER BY idx LIMIT ?",
+                (limit,),
+            )
+        else:
+            rows = self._conn.execute(
+                f"SELECT {_ROW_COLUMNS} FROM features WHERE category = ? AND passes = 0 "
+                "ORDER BY idx LIMIT ?",
+                (category, limit),
+            )
+        return [_row(values) for values in rows]
+
+    def count_touched_in_last(self, sessions: int) -> int:
+        """Count features added or modified during the last `sessions` sessions."""
+        (count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM features WHERE changed_session > ?",
+            (self.session - sessions,),
+        ).fetchone()
+        return count
+
+    def touched_in_last(self, sessions: int) -> list[FeatureRow]:
+        """Return features added or modified during the last `sessions` sessions."""
+        rows = self._conn.execute(
+            f"SELECT {_ROW_COLUMNS} FROM features WHERE changed_session > ? ORDER BY idx",
+            (self.session - sessions,),
+        )
+        return [_row(values) for values in rows]
@@ -0,0 +1,379 @@
+"""
+Feature List Index
+==================
+
+Streaming, cached parsing of feature_list.json.
+
+The file is read in fixed-size chunks and decoded one array element at a
+time, so peak memory is bounded by the chunk size plus the largest single
+feature rather than by the file size. Only (category, passes) is kept per
+feature, in compact columns.
+
+The parsed index is keyed on the file's (inode, mtime_ns, size), so
+repeated progress checks on an unchanged file cost a single stat(). When
+the file has only been appended to, features from the unchanged prefix are
+reused and only the new tail is parsed.
+"""
+
+from __future__ import annotations
+
+import codecs
+import hashlib
+import json
+import os
+import threading
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+
+FEATURE_LIST_FILE = "feature_list.json"
+
+# Bytes read per chunk while streaming the feature list
+CHUNK_SIZE = 1 << 20
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+# Parser states for iter_elements
+_EXPECT_OPEN = 0  # Before '['
+_EXPECT_FIRST = 1  # After '[': a value or ']'
+_EXPECT_VALUE = 2  # After ',': a value
+_EXPECT_SEPARATOR = 3  # After a value: ',' or ']'
+
+
+@dataclass(frozen=True)
+class FeatureRecord:
+    """Lightweight view of one feature_list.json entry."""
+
+    index: int
+    category: str
+    passes: bool
+
+
+@dataclass(frozen=True)
+class FeatureIndex:
+    """Parsed summary of feature_list.json, stored column-wise."""
+
+    passes: bytes  # 1 or 0 per feature
+    category_ids: array[int]  # Index into categories, per feature
+    categories: tuple[str, ...]
+    passing: int
+
+    @property
+    def total(self) -> int:
+        return len(self.passes)
+
+    def __len__(self) -> int:
+        return len(self.passes)
+
+    def __iter__(self) -> Iterator[FeatureRecord]:
+        return (self.record(index) for index in range(len(self.passes)))
+
+    def record(self, index: int) -> FeatureRecord:
+        """Return the record for the feature at a list position."""
+        return FeatureRecord(
+            index, self.categories[self.category_ids[index]], bool(self.passes[index])
+        )
+
+    def failing(self) -> Iterator[FeatureRecord]:
+        """Iterate over features that do not pass yet, in file order."""
+        index = self.passes.find(0)
+        while index >= 0:
+            yield self.record(index)
+            index = self.passes.find(0, index + 1)
+
+    def by_category(self) -> dict[str, tuple[int, int]]:
+        """Return {category: (passing, total)}."""
+        passing = [0] * len(self.categories)
+        total = [0] * len(self.categories)
+        for category_id, passes in zip(self.category_ids, self.passes):
+            passing[category_id] += passes
+            total[category_id] += 1
+        return {category: (passing[i], total[i]) for i, category in enumerate(self.categories)}
+
+
+def feature_fields(feature: Any) -> tuple[str, bool]:
+    """Extract (category, passes) from one decoded feature."""
+    if not isinstance(feature, dict):
+        return "", False
+    return str(feature.get("category", "")), bool(feature.get("passes", False))
+
+
+def iter_elements(
+    f: BinaryIO,
+    offset: int = 0,
+    state: int = _EXPECT_OPEN,
+    hasher: Any = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[tuple[Any, int]]:
+    """
+    Stream the elements of a JSON array from a binary file.
+
+    Only the current chunk and the element being decoded are held in memory.
+    An element that straddles a chunk boundary is retried once more data
+    has been read.
+
+    Args:
+        f: File positioned at byte `offset`
+        offset: Byte offset of the current file position
+        state: _EXPECT_OPEN at the start of the file, or _EXPECT_SEPARATOR
+            just after a complete element
+        hasher: Optional hashlib object, fed every byte up to each element end
+        chunk_size: Bytes read per chunk
+
+    Yields:
+        (element, end_offset), where end_offset is the byte just past the element
+
+    Raises:
+        ValueError: If the data is not a well-formed JSON array
+    """
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    buf_ascii = True  # Char and byte offsets within buf coincide
+    mark = 0  # Char index in buf of the last element end
+    mark_offset = offset  # Byte offset of buf[mark]
+    unhashed = bytearray()  # Bytes read past mark_offset, not yet fed to hasher
+    pos = 0
+    eof = False
+
+    def fill() -> None:
+        nonlocal buf, buf_ascii, mark, pos, eof
+        buf = buf[mark:]
+        pos -= mark
+        mark = 0
+        chunk = f.read(chunk_size)
+        if chunk:
+            buf += text_decoder.decode(chunk)
+            if hasher is not None:
+                unhashed.extend(chunk)
+        else:
+            buf += text_decoder.decode(b"", final=True)
+            eof = True
+        buf_ascii = buf.isascii()
+
+    while True:
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                raise ValueError("Unterminated feature list array")
+            fill()
+            continue
+
+        char = buf[pos]
+        if state == _EXPECT_OPEN:
+            if char != "[":
+                raise ValueError("feature_list.json is not a JSON array")
+            pos += 1
+            state = _EXPECT_FIRST
+            continue
+
+        if char == "]" and state != _EXPECT_VALUE:
+            mark = pos + 1
+            while not eof:
+                fill()
+                if buf.strip(_WHITESPACE):
+                    break
+                mark = len(buf)
+            if buf[mark:].strip(_WHITESPACE):
+                raise ValueError("Extra data after feature list array")
+            return
+
+        if state == _EXPECT_SEPARATOR:
+            if char != ",":
+                raise ValueError(f"Expected ',' after the element ending at byte {mark_offset}")
+            pos += 1
+            state = _EXPECT_VALUE
+            continue
+
+        try:
+            element, end = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()  # The element continues in the next chunk
+            continue
+        if end == len(buf) and not eof:
+            fill()  # A number or literal might continue in the next chunk
+            continue
+
+        consumed = end - mark if buf_ascii else len(buf[mark:end].encode("utf-8"))
+        if hasher is not None:
+            hasher.update(unhashed[:consumed])
+            del unhashed[:consumed]
+        mark_offset += consumed
+        mark = pos = end
+        state = _EXPECT_SEPARATOR
+        yield element, mark_offset
+
+
+def iter_feature_records(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[FeatureRecord]:
+    """
+    Stream lightweight records from a feature_list.json file.
+
+    Memory use is bounded by the chunk size and the largest single feature,
+    not by the size of the file.
+
+    Args:
+        path: Path to feature_list.json
+        chunk_size: Bytes read per chunk
+
+    Yields:
+        FeatureRecord per feature, in file order
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not a well-formed JSON array
+    """
+    with open(path, "rb") as f:
+        for index, (feature, _) in enumerate(iter_elements(f, chunk_size=chunk_size)):
+            category, passes = feature_fields(feature)
+            yield FeatureRecord(index, category, passes)
+
+
+def read_feature(path: Path, index: int) -> dict[str, Any] | None:
+    """
+    Return one full feature by list position, streaming only up to it.
+
+    Args:
+        path: Path to feature_list.json
+        index: Position of the feature in the array
+
+    Returns:
+        The decoded feature, or None if the list is shorter or not an object
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not well-formed up to the feature
+    """
+    with open(path, "rb") as f:
+        for position, (feature, _) in enumerate(iter_elements(f)):
+            if position == index:
+                return feature if isinstance(feature, dict) else None
+    return None
+
+
+class FeatureListCache:
+    """Parsed FeatureIndex for one feature_list.json, refreshed on change."""
+
+    def __init__(self, path: Path, chunk_size: int = CHUNK_SIZE) -> None:
+        self.path = path
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()  # Progress watchers refresh from a worker thread
+        self._reset()
+
+    def _reset(self) -> None:
+        self._signature: tuple[int, int, int] | None = None
+        self._index: FeatureIndex | None = None
+        self._prefix_len = 0  # Bytes up to the end of the last parsed element
+        self._prefix_digest = b""
+
+    def load(self) -> FeatureIndex | None:
+        """
+        Return the current index, parsing only what changed since the last call.
+
+        Returns:
+            FeatureIndex, or None if the file is missing or not a valid array
+        """
+        with self._lock:
+            return self._load()
+
+    def _load(self) -> FeatureIndex | None:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self._reset()
+            return None
+
+        signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if signature == self._signature:
+            return self._index
+
+        try:
+            with open(self.path, "rb") as f:
+                self._parse(f, st.st_size)
+        except (OSError, ValueError):  # ValueError covers JSON and UTF-8 errors
+            self._reset()
+            self._signature = signature
+            return None
+
+        self._signature = signature
+        return self._index
+
+    def _prefix_unchanged(self, f: BinaryIO, hasher: Any) -> bool:
+        """Hash the previously parsed prefix of f and compare it with the last load."""
+        remaining = self._prefix_len
+        while remaining:
+            chunk = f.read(min(self.chunk_size, remaining))
+            if not chunk:
+                return False
+            hasher.update(chunk)
+            remaining -= len(chunk)
+        return hasher.digest() == self._prefix_digest
+
+    def _parse(self, f: BinaryIO, size: int) -> None:
+        """Stream the file into a new index, reusing an unchanged prefix."""
+        previous = self._index
+        hasher = hashlib.blake2b()
+        passes = bytearray()
+        category_ids = array("I")
+        categories: list[str] = []
+        prefix_len = 0
+        state = _EXPECT_OPEN
+
+        if (
+            previous is not None
+            and 0 < self._prefix_len < size
+            and self._prefix_unchanged(f, hasher)
+        ):
+            passes.extend(previous.passes)
+            category_ids.extend(previous.category_ids)
+            categories.extend(previous.categories)
+            prefix_len = self._prefix_len
+            state = _EXPECT_SEPARATOR
+        elif f.tell():
+            f.seek(0)
+            hasher = hashlib.blake2b()
+
+        category_ids_by_name = {category: i for i, category in enumerate(categories)}
+        for feature, end in iter_elements(f, prefix_len, state, hasher, self.chunk_size):
+            category, passed = feature_fields(feature)
+            category_id = category_ids_by_name.get(category)
+            if category_id is None:
+                category_id = category_ids_by_name[category] = len(categories)
+                categories.append(category)
+            passes.append(passed)
+            category_ids.append(category_id)
+            prefix_len = end
+
+        self._index = FeatureIndex(
+            passes=bytes(passes),
+            category_ids=category_ids,
+            categories=tuple(categories),
+            passing=passes.count(1),
+        )
+        self._prefix_len = prefix_len
+        self._prefix_digest = hasher.digest() if prefix_len else b""
+
+
+_caches: dict[Path, FeatureListCache] = {}
+
+
+def load_feature_index(project_dir: Path) -> FeatureIndex | None:
+    """
+    Return the parsed feature_list.json index for a project, using the cache.
+
+    Args:
+        project_dir: Directory containing feature_list.json
+
+    Returns:
+        FeatureIndex, or None if the file is missing or invalid
+    """
+    path = project_dir / FEATURE_LIST_FILE
+    cache = _caches.get(path)
+    if cache is None:
+        cache = _caches.setdefault(path, FeatureListCache(path))
+    return cache.load()
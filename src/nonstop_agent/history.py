@@ -0,0 +1,209 @@
+"""
+Progress History
+================
+
+Append-only CSV time series of progress, one row per session:
+
+    timestamp,iteration,passing,total,cost_usd,total_cost_usd,active_seconds
+
+total_cost_usd and active_seconds are running totals, so throughput,
+cost per feature and an ETA follow from the first and last rows alone.
+Opening the history reads only the first and last lines, and each append
+writes one line, so the cost per iteration stays constant however long the
+run is.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+
+PROGRESS_HISTORY_FILE = "progress_history.csv"
+
+# Bytes read from the end of the file to find the last row
+_TAIL_BYTES = 4096
+
+
+@dataclass(frozen=True)
+class ProgressSample:
+    """One row of the progress history."""
+
+    timestamp: float
+    iteration: int
+    passing: int
+    total: int
+    cost_usd: float  # Cost of the session that ended at this sample
+    total_cost_usd: float  # Running total since the first sample
+    active_seconds: float  # Running total of session wall time
+
+    @classmethod
+    def parse(cls, line: str) -> ProgressSample:
+        """Parse a CSV row; raises ValueError if it is malformed."""
+        values = line.strip().split(",")
+        if len(values) != len(fields(cls)):
+            raise ValueError(f"Expected {len(fields(cls))} columns: {line!r}")
+        timestamp, iteration, passing, total, cost, total_cost, active = values
+        return cls(
+            float(timestamp), int(iteration), int(passing), int(total),
+            float(cost), float(total_cost), float(active),
+        )
+
+    def to_row(self) -> str:
+        return (
+            f"{self.timestamp:.3f},{self.iteration},{self.passing},{self.total},"
+            f"{self.cost_usd:.6f},{self.total_cost_usd:.6f},{self.active_seconds:.3f}\n"
+        )
+
+
+HISTORY_HEADER = ",".join(f.name for f in fields(ProgressSample)) + "\n"
+
+
+@dataclass(frozen=True)
+class ProgressRate:
+    """Throughput derived from the history; fields are None when unknown."""
+
+    features_per_hour: float | None
+    cost_per_feature: float | None
+    eta_hours: float | None
+    remaining: int
+
+
+class ProgressHistory:
+    """Progress time series for one project."""
+
+    def __init__(self, project_dir: Path) -> None:
+        self.path = project_dir / PROGRESS_HISTORY_FILE
+        self.first: ProgressSample | None = None
+        self.last: ProgressSample | None = None
+        self._read_ends()
+
+    def _read_ends(self) -> None:
+        """Load the first and last rows without reading the whole file."""
+        try:
+            with open(self.path, "rb") as f:
+                f.readline()  # Header
+                first = f.readline()
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(0, size - _TAIL_BYTES))
+                tail = f.read().splitlines()
+        except OSError:
+            return
+
+        try:
+            self.first = ProgressSample.parse(first.decode())
+        except (ValueError, UnicodeDecodeError):
+            return  # Empty or unreadable history: start over
+
+        # Skip a torn last row left by a crash mid-append
+        for line in reversed(tail):
+            try:
+                self.last = ProgressSample.parse(line.decode())
+                break
+            except (ValueError, UnicodeDecodeError):
+                continue
+        else:
+            self.last = self.first
+
+    def append(
+        self,
+        iteration: int,
+        passing: int,
+        total: int,
+        cost_usd: float = 0.0,
+        wall_seconds: float = 0.0,
+    ) -> ProgressSample:
+        """
+        Record the state after a session.
+
+        Args:
+            iteration: Session number of the run
+            passing: Passing features after the session
+            total: Total features after the session
+            cost_usd: Cost of the session
+            wall_seconds: Wall-clock duration of the session
+
+        Returns:
+            The appended sample
+        """
+        previous = self.last
+        sample = ProgressSample(
+            timestamp=round(time.time(), 3),
+            iteration=iteration,
+            passing=passing,
+            total=total,
+            cost_usd=cost_usd,
+            total_cost_usd=(previous.total_cost_usd if previous else 0.0) + cost_usd,
+            active_seconds=(previous.active_seconds if previous else 0.0) + wall_seconds,
+        )
+
+        try:
+            with open(self.path, "a+b") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size == 0:
+                    prefix = HISTORY_HEADER
+                else:
+                    f.seek(size - 1)
+                    prefix = "" if f.read(1) == b"\n" else "\n"  # Terminate a torn row
+                f.write((prefix + sample.to_row()).encode())
+        except OSError as e:
+            print(f"Warning: Could not write progress history: {e}")
+
+        if self.first is None:
+            self.first = sample
+        self.last = sample
+        return sample
+
+    def rate(self) -> ProgressRate | None:
+        """
+        Compute throughput from the first and last samples.
+
+        Returns:
+            ProgressRate, or None if the history is empty
+        """
+        first, last = self.first, self.last
+        if first is None or last is None:
+            return None
+
+        gained = last.passing - first.passing
+        remaining = max(0, last.total - last.passing)
+        hours = last.active_seconds / 3600
+
+        features_per_hour = gained / hours if gained > 0 and hours > 0 else None
+        cost_per_feature = last.total_cost_usd / gained if gained > 0 else None
+        if remaining == 0:
+            eta_hours: float | None = 0.0
+        elif features_per_hour:
+            eta_hours = remaining / features_per_hour
+        else:
+            eta_hours = None
+
+        return ProgressRate(features_per_hour, cost_per_feature, eta_hours, remaining)
+
+    def __iter__(self) -> Iterator[ProgressSample]:
+        """Iterate over every recorded sample, skipping malformed rows."""
+        try:
+            with open(self.path) as f:
+                next(f, None)  # Header
+                for line in f:
+                    try:
+                        yield ProgressSample.parse(line)
+                    except ValueError:
+                        continue
+        except OSError:
+            return
+
+
+def format_rate(rate: ProgressRate) -> str:
+    """Render a ProgressRate as a one-line summary."""
+    parts = []
+    if rate.features_per_hour is not None:
+        parts.append(f"{rate.features_per_hour:.1f} features/hour")
+    if rate.cost_per_feature is not None:
+        parts.append(f"${rate.cost_per_feature:.2f}/feature")
+    if rate.eta_hours is not None:
+        parts.append(f"ETA {rate.eta_hours:.1f}h ({rate.remaining} remaining)")
+    return " | ".join(parts)
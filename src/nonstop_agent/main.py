@@ -18,6 +18,12 @@ Usage:
     # Limit iterations
     uv run nonstop-agent --project-dir ./my_project --max-iterations 5
 
+    # Re-check recorded Bash commands against a changed policy
+    uv run nonstop-agent policy-check --policy policy.toml transcripts/*.jsonl
+
+    # Run many projects concurrently
+    uv run nonstop-agent run-many projects.toml --max-concurrency 4
+
 Reference:
 - https://platform.claude.com/docs/en/agent-sdk/overview
 - https://www.anthropic.com/engineering/effective-harnesses-for-long-running-agents
@@ -26,13 +32,23 @@ Reference:
 import argparse
 import asyncio
 import os
+import sys
 from pathlib import Path
 
 from .agent import run_autonomous_agent
-
-
-# Configuration
-DEFAULT_MODEL = "claude-opus-4-5-20251101"
+from .budget import BudgetGovernor
+from .client import DEFAULT_MODEL
+from .multi import main as run_many_main
+from .output import ConsoleSink, JsonlSink, NullSink, OutputSink, TeeSink
+from .parallel import run_parallel
+from .policy import load_security_policy
+from .policy_check import main as policy_check_main
+from .termination import (
+    DEFAULT_STALL_ITERATIONS,
+    DEFAULT_STALL_POLICY,
+    STALL_POLICIES,
+    StallDetector,
+)
 
 
 def parse_args() -> argparse.Namespace:
@@ -82,14 +98,157 @@ def parse_args() -> argparse.Namespace:
         help="Custom system prompt for the agent",
     )
 
+    parser.add_argument(
+        "--policy-file",
+        type=Path,
+        default=None,
+        help="TOML/JSON file with extra Bash command rules (e.g. docker, make, cargo)",
+    )
+
+    parser.add_argument(
+        "--audit-log",
+        action="store_true",
+        help="Record every Bash allow/deny decision to security_audit.jsonl in the project dir",
+    )
+
+    parser.add_argument(
+        "--allow-path",
+        type=Path,
+        action="append",
+        default=None,
+        help="Extra directory file tools may access besides the project dir (repeatable)",
+    )
+
+    parser.add_argument(
+        "--feature-index",
+        action="store_true",
+        help="Keep a SQLite index of feature_list.json (feature_index.sqlite3) for fast queries",
+    )
+
+    parser.add_argument(
+        "--watch-progress",
+        action="store_true",
+        help="Report progress as soon as feature_list.json changes during a session",
+    )
+
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Work on N failing features at once, each in its own git worktree (default: 1)",
+    )
+
+    parser.add_argument(
+        "--stall-iterations",
+        type=int,
+        default=DEFAULT_STALL_ITERATIONS,
+        metavar="K",
+        help="Sessions without a change in passing count or git HEAD that count as a stall "
+        f"(0 disables, default: {DEFAULT_STALL_ITERATIONS})",
+    )
+
+    parser.add_argument(
+        "--stall-policy",
+        choices=STALL_POLICIES,
+        default=DEFAULT_STALL_POLICY,
+        help=f"What to do when progress stalls (default: {DEFAULT_STALL_POLICY})",
+    )
+
+    parser.add_argument(
+        "--escalation-model",
+        type=str,
+        default=None,
+        help="Model used after a stall with --stall-policy escalate",
+    )
+
+    parser.add_argument(
+        "--keep-running",
+        action="store_true",
+        help="Keep starting sessions after every feature passes",
+    )
+
+    parser.add_argument(
+        "--max-cost-usd",
+        type=float,
+        default=None,
+        help="Stop (or switch to --fallback-model) before the run's cost would exceed this",
+    )
+
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=None,
+        help="Stop (or switch to --fallback-model) before the run's tokens would exceed this",
+    )
+
+    parser.add_argument(
+        "--max-cost-per-hour",
+        type=float,
+        default=None,
+        help="Wait when the project's cost over the last hour would exceed this",
+    )
+
+    parser.add_argument(
+        "--max-tokens-per-hour",
+        type=int,
+        default=None,
+        help="Wait when the project's tokens over the last hour would exceed this",
+    )
+
+    parser.add_argument(
+        "--fallback-model",
+        type=str,
+        default=None,
+        help="Cheaper model to switch to when the run budget would be exceeded",
+    )
+
+    parser.add_argument(
+        "--trace-tools",
+        action="store_true",
+        help="Append tool call timings to tool_trace.json (Chrome trace / Perfetto format)",
+    )
+
+    parser.add_argument(
+        "--record-transcript",
+        action="store_true",
+        help="Record every session's SDK messages to session_transcript.jsonl for offline replay",
+    )
+
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Do not render the agent's streamed text and tool calls",
+    )
+
+    parser.add_argument(
+        "--output-jsonl",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Also append the streamed session output to PATH as JSON lines",
+    )
+
     return parser.parse_args()
 
 
-def main() -> None:
-    """Main entry point."""
-    args = parse_args()
+def parallel_unsupported(args: argparse.Namespace) -> list[str]:
+    """Return the given flags that --parallel cannot honour."""
+    unsupported = {
+        "--resume": args.resume,
+        "--analyze-first": args.analyze_first,
+        "--feature-index": args.feature_index,
+        "--watch-progress": args.watch_progress,
+        "--stall-iterations": args.stall_iterations != DEFAULT_STALL_ITERATIONS,
+        "--stall-policy": args.stall_policy != DEFAULT_STALL_POLICY,
+        "--escalation-model": args.escalation_model is not None,
+        "--keep-running": args.keep_running,
+    }
+    return [flag for flag, given in unsupported.items() if given]
 
-    # Check for authentication
+
+def check_auth() -> bool:
+    """Check for the OAuth token, printing setup instructions if it is missing."""
     oauth_token = os.environ.get("CLAUDE_CODE_OAUTH_TOKEN")
     if not oauth_token:
         print("=" * 60)
@@ -109,10 +268,80 @@ def main() -> None:
         print()
         print("=" * 60)
         print()
+        return False
+
+    return True
+
+
+def main() -> None:
+    """Main entry point."""
+    if sys.argv[1:2] == ["policy-check"]:
+        sys.exit(policy_check_main(sys.argv[2:]))
+
+    if sys.argv[1:2] == ["run-many"]:
+        if not check_auth():
+            return
+        sys.exit(run_many_main(sys.argv[2:]))
+
+    args = parse_args()
+
+    if args.parallel > 1 and (unsupported := parallel_unsupported(args)):
+        print(f"--parallel cannot be combined with {', '.join(unsupported)}")
+        sys.exit(2)
+
+    # Check for authentication
+    if not check_auth():
         return
 
+    # Load project-specific command rules
+    security_policy = None
+    if args.policy_file:
+        try:
+            security_policy = load_security_policy(args.policy_file)
+        except (OSError, ValueError) as e:
+            print(f"Could not load policy file {args.policy_file}: {e}")
+            return
+        print(f"Loaded security policy: {args.policy_file}")
+
+    # Where session output goes
+    sinks: list[OutputSink] = [] if args.quiet else [ConsoleSink()]
+    if args.output_jsonl:
+        try:
+            sinks.append(JsonlSink(args.output_jsonl))
+        except OSError as e:
+            print(f"Could not open output file {args.output_jsonl}: {e}")
+            return
+    output_sink = TeeSink(*sinks) if len(sinks) > 1 else (sinks[0] if sinks else NullSink())
+
+    budget = BudgetGovernor(
+        max_cost_usd=args.max_cost_usd,
+        max_tokens=args.max_tokens,
+        max_cost_per_hour=args.max_cost_per_hour,
+        max_tokens_per_hour=args.max_tokens_per_hour,
+        fallback_model=args.fallback_model,
+    )
+
     # Run the agent
     try:
+        if args.parallel > 1:
+            asyncio.run(
+                run_parallel(
+                    project_dir=args.project_dir,
+                    model=args.model,
+                    workers=args.parallel,
+                    max_iterations=args.max_iterations,
+                    system_prompt=args.system_prompt,
+                    security_policy=security_policy,
+                    output_sink=output_sink,
+                    audit_log=args.audit_log,
+                    allowed_paths=args.allow_path,
+                    trace_tools=args.trace_tools,
+                    record_transcript=args.record_transcript,
+                    budget=budget,
+                )
+            )
+            return
+
         asyncio.run(
             run_autonomous_agent(
                 project_dir=args.project_dir,
@@ -121,6 +350,19 @@ def main() -> None:
                 analyze_first=args.analyze_first,
                 resume=args.resume,
                 system_prompt=args.system_prompt,
+                security_policy=security_policy,
+                audit_log=args.audit_log,
+                allowed_paths=args.allow_path,
+                feature_index=args.feature_index,
+                watch_progress=args.watch_progress,
+                output_sink=output_sink,
+                trace_tools=args.trace_tools,
+                record_transcript=args.record_transcript,
+                stop_when_complete=not args.keep_running,
+                stall_detector=StallDetector(
+                    args.stall_iterations, args.stall_policy, args.escalation_model
+                ),
+                budget=budget,
             )
         )
     except KeyboardInterrupt:
@@ -129,6 +371,8 @@ def main() -> None:
     except Exception as e:
         print(f"\nFatal error: {e}")
         raise
+    finally:
+        output_sink.close()
 
 
 if __name__ == "__main__":
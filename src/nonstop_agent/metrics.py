@@ -0,0 +1,243 @@
+"""
+Session Metrics
+===============
+
+Per-session figures collected from a session's events, and their export.
+
+After every session the exporter appends one JSON object to
+session_metrics.jsonl and rewrites session_metrics.prom, a Prometheus
+textfile (for node_exporter's textfile collector) with running totals
+across the whole run and gauges for the latest session. The .prom file is
+replaced atomically so a scrape never sees a partial file.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .events import BlockedEvent, EventBus, ResultEvent, ToolUseEvent
+from .state import atomic_write
+
+
+METRICS_JSONL_FILE = "session_metrics.jsonl"
+METRICS_PROM_FILE = "session_metrics.prom"
+
+# ResultMessage.usage keys, and the token type label each is exported under
+_TOKEN_TYPES = {
+    "input_tokens": "input",
+    "output_tokens": "output",
+    "cache_creation_input_tokens": "cache_creation",
+    "cache_read_input_tokens": "cache_read",
+}
+
+
+@dataclass
+class SessionStats:
+    """Figures reported for one agent session, filled in by run_agent_session."""
+
+    cost_usd: float = 0.0
+    num_turns: int = 0
+    duration_ms: int = 0
+    wall_seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    tool_calls: dict[str, int] = field(default_factory=dict)  # Tool name -> calls
+    blocked: int = 0  # Tool calls refused by a security hook
+
+    @property
+    def total_tokens(self) -> int:
+        """Input, output and cache tokens of the session."""
+        return (
+            self.input_tokens + self.output_tokens
+            + self.cache_creation_input_tokens + self.cache_read_input_tokens
+        )
+
+    def attach(self, bus: EventBus) -> None:
+        """Collect figures from the session events emitted on bus."""
+        bus.subscribe(ResultEvent, self.record_result)
+        bus.subscribe(ToolUseEvent, self._on_tool_use)
+        bus.subscribe(BlockedEvent, self._on_blocked)
+
+    def record_result(self, event: ResultEvent) -> None:
+        """Take cost, turns, duration and token usage from a session's ResultEvent."""
+        self.cost_usd = event.cost_usd or 0.0
+        self.num_turns = event.num_turns
+        self.duration_ms = event.duration_ms
+        usage = event.usage or {}
+        for key in _TOKEN_TYPES:
+            value = usage.get(key)
+            if isinstance(value, int):
+                setattr(self, key, value)
+
+    def _on_tool_use(self, event: ToolUseEvent) -> None:
+        self.tool_calls[event.name] = self.tool_calls.get(event.name, 0) + 1
+
+    def _on_blocked(self, event: BlockedEvent) -> None:
+        self.blocked += 1
+
+
+@dataclass
+class MetricTotals:
+    """Running totals across all exported sessions of a project."""
+
+    sessions: int = 0
+    errors: int = 0
+    cost_usd: float = 0.0
+    turns: int = 0
+    wall_seconds: float = 0.0
+    blocked: int = 0
+    tokens: Counter[str] = field(default_factory=Counter)  # Token type label -> tokens
+    tool_calls: Counter[str] = field(default_factory=Counter)
+
+    def add(self, record: dict[str, Any]) -> None:
+        """Add one JSONL metrics record."""
+        self.sessions += 1
+        self.errors += record.get("status") == "error"
+        self.cost_usd += record.get("cost_usd", 0.0)
+        self.turns += record.get("num_turns", 0)
+        self.wall_seconds += record.get("wall_seconds", 0.0)
+        self.blocked += record.get("blocked", 0)
+        for key, label in _TOKEN_TYPES.items():
+            self.tokens[label] += record.get(key, 0)
+        self.tool_calls.update(record.get("tool_calls", {}))
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _sample_value(value: float) -> str:
+    """Format a sample without losing precision (timestamps, large counters)."""
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsExporter:
+    """Writes per-session metrics of one project to JSONL and a Prometheus textfile."""
+
+    def __init__(self, project_dir: Path) -> None:
+        self.project = project_dir.resolve().name
+        self.jsonl_path = project_dir / METRICS_JSONL_FILE
+        self.prom_path = project_dir / METRICS_PROM_FILE
+        self.totals = MetricTotals()
+        self._load_totals()
+
+    def _load_totals(self) -> None:
+        """Rebuild running totals from earlier runs' records."""
+        try:
+            with open(self.jsonl_path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn last line
+                    if isinstance(record, dict):
+                        self.totals.add(record)
+        except OSError:
+            pass
+
+    def record(
+        self,
+        iteration: int,
+        status: str,
+        stats: SessionStats,
+        passing: int,
+        total: int,
+    ) -> dict[str, Any]:
+        """
+        Export the metrics of a finished session.
+
+        Args:
+            iteration: Session number of the run
+            status: Status returned by run_agent_session
+            stats: Figures collected during the session
+            passing: Passing features after the session
+            total: Total features after the session
+
+        Returns:
+            The record appended to the JSONL file
+        """
+        record = {
+            "timestamp": round(time.time(), 3),
+            "iteration": iteration,
+            "status": status,
+            **asdict(stats),
+            "passing": passing,
+            "total": total,
+        }
+        self.totals.add(record)
+
+        try:
+            with open(self.jsonl_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+            atomic_write(self.prom_path, self.render(record))
+        except OSError as e:
+            print(f"Warning: Could not write session metrics: {e}")
+        return record
+
+    def render(self, last: dict[str, Any]) -> str:
+        """Render the Prometheus text exposition for the totals and the last session."""
+        project = f'project="{_label_value(self.project)}"'
+        lines: list[str] = []
+
+        def metric(
+            name: str, kind: str, help_text: str, samples: list[tuple[str, float]]
+        ) -> None:
+            lines.append(f"# HELP nonstop_agent_{name} {help_text}")
+            lines.append(f"# TYPE nonstop_agent_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"nonstop_agent_{name}{{{project}{labels}}} {_sample_value(value)}")
+
+        t = self.totals
+        metric("sessions_total", "counter", "Agent sessions completed", [("", t.sessions)])
+        metric(
+            "session_errors_total", "counter", "Agent sessions that ended in an error",
+            [("", t.errors)],
+        )
+        metric("cost_usd_total", "counter", "Reported cost in US dollars", [("", t.cost_usd)])
+        metric("turns_total", "counter", "Conversation turns", [("", t.turns)])
+        metric(
+            "session_seconds_total", "counter", "Wall-clock time spent in sessions",
+            [("", t.wall_seconds)],
+        )
+        metric(
+            "blocked_commands_total", "counter", "Tool calls refused by a security hook",
+            [("", t.blocked)],
+        )
+        metric(
+            "tokens_total", "counter", "Tokens used, by type",
+            [(f',type="{label}"', t.tokens[label]) for label in _TOKEN_TYPES.values()],
+        )
+        metric(
+            "tool_calls_total", "counter", "Tool calls, by tool name",
+            [(f',tool="{_label_value(tool)}"', n) for tool, n in sorted(t.tool_calls.items())],
+        )
+        metric(
+            "features_passing", "gauge", "Passing features after the last session",
+            [("", last["passing"])],
+        )
+        metric(
+            "features_total", "gauge", "Total features after the last session",
+            [("", last["total"])],
+        )
+        metric(
+            "last_session_cost_usd", "gauge", "Cost of the last session",
+            [("", last["cost_usd"])],
+        )
+        metric(
+            "last_session_seconds", "gauge", "Wall-clock time of the last session",
+            [("", last["wall_seconds"])],
+        )
+        metric(
+            "last_session_timestamp_seconds", "gauge", "Unix time the last session ended",
+            [("", last["timestamp"])],
+        )
+        return "\n".join(lines) + "\n"
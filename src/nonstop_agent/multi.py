@@ -0,0 +1,298 @@
+"""
+Multi-Project Runner
+====================
+
+Run the autonomous loops of many projects concurrently on one event loop.
+
+Usage:
+    nonstop-agent run-many projects.toml
+    nonstop-agent run-many projects.toml --max-concurrency 8
+
+Example projects.toml:
+
+    max_concurrency = 4
+
+    [defaults]
+    model = "claude-opus-4-5-20251101"
+    max_iterations = 10
+    max_cost_per_hour = 20.0
+
+    [[projects]]
+    project_dir = "./shop"
+
+    [[projects]]
+    project_dir = "./blog"
+    name = "blog"
+    log_file = "logs/blog.log"
+    policy_file = "blog_policy.toml"
+    max_cost_usd = 50.0
+
+A semaphore bounds how many agent sessions run at once across all
+projects, so any number of projects can share a small number of SDK
+sessions. Output is routed per project through a context variable: lines
+are prefixed with the project name, or written to the project's log file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, TextIO
+
+from .agent import run_autonomous_agent
+from .budget import BudgetGovernor
+from .client import DEFAULT_MODEL
+from .policy import load_security_policy
+from .progress import count_passing_tests
+from .routing import PrefixWriter, output_target, routed_stdout
+from .state import RunStateStore
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+_PATH_KEYS = {"project_dir", "log_file", "policy_file"}
+
+
+@dataclass
+class ProjectConfig:
+    """Settings for one project's autonomous loop."""
+
+    project_dir: Path
+    name: str = ""
+    model: str = DEFAULT_MODEL
+    max_iterations: int | None = None
+    analyze_first: bool = False
+    resume: bool = False
+    system_prompt: str | None = None
+    policy_file: Path | None = None
+    audit_log: bool = False
+    allowed_paths: list[Path] = field(default_factory=list)
+    feature_index: bool = False
+    max_cost_usd: float | None = None
+    max_tokens: int | None = None
+    max_cost_per_hour: float | None = None
+    max_tokens_per_hour: int | None = None
+    fallback_model: str | None = None
+    log_file: Path | None = None  # Write output here instead of prefixing stdout
+
+    def __post_init__(self) -> None:
+        if not self.name:
+            self.name = self.project_dir.name
+
+
+@dataclass
+class ProjectResult:
+    """Outcome of one project's loop, for the combined summary."""
+
+    name: str
+    passing: int
+    total: int
+    iterations: int
+    error: str = ""
+
+
+# =============================================================================
+# Config loading
+# =============================================================================
+
+def _project_config(data: Mapping[str, Any], base_dir: Path) -> ProjectConfig:
+    known = {f.name for f in fields(ProjectConfig)}
+    unknown = set(data) - known
+    if unknown:
+        raise ValueError(f"Unknown project keys: {sorted(unknown)}")
+    if "project_dir" not in data:
+        raise ValueError("Each project needs a project_dir")
+
+    values = dict(data)
+    for key in _PATH_KEYS & values.keys():
+        values[key] = base_dir / Path(values[key]).expanduser()
+    if "allowed_paths" in values:
+        values["allowed_paths"] = [base_dir / Path(p).expanduser() for p in values["allowed_paths"]]
+    return ProjectConfig(**values)
+
+
+def load_run_config(path: Path) -> tuple[list[ProjectConfig], int]:
+    """
+    Load a .toml or .json multi-project config.
+
+    Relative paths are resolved against the config file's directory.
+
+    Args:
+        path: Config file path
+
+    Returns:
+        (projects, max_concurrency)
+    """
+    if path.suffix == ".toml":
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    elif path.suffix == ".json":
+        with open(path) as f:
+            data = json.load(f)
+    else:
+        raise ValueError(f"Unsupported config file type: {path.suffix} (use .toml or .json)")
+
+    projects = data.get("projects") if isinstance(data, Mapping) else None
+    if not isinstance(projects, list) or not projects:
+        raise ValueError(f"Config must define a non-empty [[projects]] list: {path}")
+
+    defaults = data.get("defaults", {})
+    base_dir = path.parent
+    configs = [_project_config({**defaults, **project}, base_dir) for project in projects]
+
+    names = [config.name for config in configs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Project names must be unique: {names}")
+
+    return configs, int(data.get("max_concurrency", DEFAULT_MAX_CONCURRENCY))
+
+
+# =============================================================================
+# Running
+# =============================================================================
+
+async def _run_project(
+    config: ProjectConfig,
+    session_slots: asyncio.Semaphore,
+    console: TextIO,
+) -> ProjectResult:
+    """Run one project's loop with its output routed to its own target."""
+    if config.log_file is not None:
+        config.log_file.parent.mkdir(parents=True, exist_ok=True)
+        target: TextIO = open(config.log_file, "a", buffering=1)
+    else:
+        target = PrefixWriter(console, f"[{config.name}] ")
+    output_target.set(target)  # Each task runs in its own copy of the context
+
+    error = ""
+    try:
+        security_policy = load_security_policy(config.policy_file) if config.policy_file else None
+        await run_autonomous_agent(
+            project_dir=config.project_dir,
+            model=config.model,
+            max_iterations=config.max_iterations,
+            analyze_first=config.analyze_first,
+            resume=config.resume,
+            system_prompt=config.system_prompt,
+            security_policy=security_policy,
+            audit_log=config.audit_log,
+            allowed_paths=config.allowed_paths,
+            feature_index=config.feature_index,
+            session_slots=session_slots,
+            budget=BudgetGovernor(
+                max_cost_usd=config.max_cost_usd,
+                max_tokens=config.max_tokens,
+                max_cost_per_hour=config.max_cost_per_hour,
+                max_tokens_per_hour=config.max_tokens_per_hour,
+                fallback_model=config.fallback_model,
+            ),
+        )
+    except Exception as e:
+        print(f"Fatal error: {e}")
+        error = str(e) or type(e).__name__
+    finally:
+        target.close()
+        output_target.set(None)
+
+    passing, total = count_passing_tests(config.project_dir)
+    iterations = RunStateStore(config.project_dir).state.iteration
+    return ProjectResult(config.name, passing, total, iterations, error)
+
+
+async def run_many(
+    configs: Sequence[ProjectConfig],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> list[ProjectResult]:
+    """
+    Run several projects' autonomous loops concurrently.
+
+    Args:
+        configs: One entry per project
+        max_concurrency: Maximum agent sessions running at the same time
+
+    Returns:
+        One ProjectResult per config, in the same order
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    session_slots = asyncio.Semaphore(max_concurrency)
+    with routed_stdout() as console:
+        return list(await asyncio.gather(
+            *(_run_project(config, session_slots, console) for config in configs)
+        ))
+
+
+def print_combined_summary(results: Sequence[ProjectResult]) -> None:
+    """Print one progress line per project plus a total."""
+    width = max([len("project")] + [len(r.name) for r in results])
+    print("\n" + "=" * 70)
+    print("  COMBINED PROGRESS")
+    print("=" * 70)
+    print(f"{'project':<{width}}  {'passing':>12}  {'%':>6}  {'sessions':>8}  status")
+    for r in results:
+        percentage = f"{r.passing / r.total * 100:.1f}" if r.total else "-"
+        status = f"error: {r.error}" if r.error else "ok"
+        print(
+            f"{r.name:<{width}}  {f'{r.passing}/{r.total}':>12}  {percentage:>6}  "
+            f"{r.iterations:>8}  {status}"
+        )
+
+    passing = sum(r.passing for r in results)
+    total = sum(r.total for r in results)
+    percentage = f"{passing / total * 100:.1f}" if total else "-"
+    print(f"{'total':<{width}}  {f'{passing}/{total}':>12}  {percentage:>6}")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse run-many command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="nonstop-agent run-many",
+        description="Run several projects' agent loops concurrently",
+    )
+
+    parser.add_argument(
+        "config",
+        type=Path,
+        help="TOML/JSON file listing the projects to run",
+    )
+
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help=f"Agent sessions running at once (default: config value or {DEFAULT_MAX_CONCURRENCY})",
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for `nonstop-agent run-many`; returns an exit status."""
+    args = parse_args(argv)
+
+    try:
+        configs, max_concurrency = load_run_config(args.config)
+    except (OSError, ValueError, TypeError) as e:
+        print(f"Could not load run config {args.config}: {e}")
+        return 1
+
+    try:
+        results = asyncio.run(run_many(configs, args.max_concurrency or max_concurrency))
+    except KeyboardInterrupt:
+        print("\n\nInterrupted by user")
+        print("To resume, set resume = true for the projects")
+        return 130
+
+    print_combined_summary(results)
+    return 1 if any(r.error for r in results) else 0
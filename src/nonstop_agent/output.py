@@ -0,0 +1,214 @@
+"""
+Session Output
+==============
+
+Decoupled rendering of a session's streamed output.
+
+A SessionOutput observes a session's events and turns them into
+OutputRecords without touching the terminal. It puts them on an asyncio
+queue, and a drain task hands
+everything queued so far to a sink as one batch, in a worker thread. The
+message loop therefore never blocks on a slow pipe or remote terminal, and
+the console is written and flushed once per batch instead of once per
+block.
+
+Sinks:
+- ConsoleSink: human-readable output on stdout (the default)
+- JsonlSink: one JSON object per record, for machine consumption
+- NullSink: drops everything; records are not even queued (--quiet)
+- TeeSink: several sinks at once
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol, TextIO
+
+from .events import BlockedEvent, EventBus, ResultEvent, TextEvent, ToolResultEvent, ToolUseEvent
+
+
+# Characters of tool input shown on the console
+TOOL_INPUT_PREVIEW_CHARS = 200
+
+# Records handed to a sink at most per batch
+MAX_BATCH_SIZE = 512
+
+
+@dataclass(frozen=True)
+class OutputRecord:
+    """One piece of session output."""
+
+    kind: str  # "text", "tool_use", "blocked", "error", "done" or "info"
+    text: str = ""
+    detail: str = ""  # Tool input for "tool_use"
+
+
+class OutputSink(Protocol):
+    """Destination for batches of session output."""
+
+    def write_batch(self, records: Sequence[OutputRecord]) -> None:
+        """Write records; called from a worker thread, one batch at a time."""
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+def render(record: OutputRecord) -> str:
+    """Render a record the way it is shown on the console."""
+    if record.kind == "text":
+        return record.text
+    if record.kind == "tool_use":
+        detail = record.detail
+        if len(detail) > TOOL_INPUT_PREVIEW_CHARS:
+            detail = detail[:TOOL_INPUT_PREVIEW_CHARS] + "..."
+        return f"\n[Tool: {record.text}]\n   Input: {detail}\n"
+    if record.kind == "blocked":
+        return f"   [BLOCKED] {record.text}\n"
+    if record.kind == "error":
+        return f"   [Error] {record.text}\n"
+    if record.kind == "done":
+        return "   [Done]\n"
+    return record.text + "\n"
+
+
+class ConsoleSink:
+    """Renders records to a text stream (sys.stdout at write time by default)."""
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self.stream = stream
+
+    def write_batch(self, records: Sequence[OutputRecord]) -> None:
+        # Resolve sys.stdout per batch so per-project output routing applies
+        stream = self.stream or sys.stdout
+        stream.write("".join(render(record) for record in records))
+        stream.flush()
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlSink:
+    """Appends one JSON object per record to a file."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()  # Concurrent sessions may share one sink
+
+    def write_batch(self, records: Sequence[OutputRecord]) -> None:
+        now = round(time.time(), 3)
+        lines = "".join(
+            json.dumps({"time": now, "kind": r.kind, "text": r.text, "detail": r.detail}) + "\n"
+            for r in records
+        )
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class NullSink:
+    """Discards all output."""
+
+    def write_batch(self, records: Sequence[OutputRecord]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class TeeSink:
+    """Writes every batch to several sinks."""
+
+    def __init__(self, *sinks: OutputSink) -> None:
+        self.sinks = sinks
+
+    def write_batch(self, records: Sequence[OutputRecord]) -> None:
+        for sink in self.sinks:
+            sink.write_batch(records)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+
+class SessionOutput:
+    """Queues records from the message loop and flushes them to a sink in batches."""
+
+    def __init__(self, sink: OutputSink) -> None:
+        self.sink = sink
+        self._enabled = not isinstance(sink, NullSink)
+        self._queue: asyncio.Queue[OutputRecord | None] = asyncio.Queue()
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start the drain task; must be called from a running event loop."""
+        if self._enabled and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._drain())
+
+    def attach(self, bus: EventBus) -> None:
+        """Render the session events emitted on bus."""
+        if not self._enabled:
+            return
+        bus.subscribe(TextEvent, lambda e: self.emit("text", e.text))
+        bus.subscribe(ToolUseEvent, lambda e: self.emit("tool_use", e.name, str(e.input)))
+        bus.subscribe(ToolResultEvent, self._on_tool_result)
+        bus.subscribe(ResultEvent, self._on_result)
+
+    def _on_tool_result(self, event: ToolResultEvent) -> None:
+        if isinstance(event, BlockedEvent):
+            self.emit("blocked", str(event.content))
+        elif event.is_error:
+            self.emit("error", str(event.content)[:500])
+        else:
+            self.emit("done")
+
+    def _on_result(self, event: ResultEvent) -> None:
+        if event.cost_usd is not None:
+            self.emit("info", f"\nSession cost: ${event.cost_usd:.4f}")
+
+    def emit(self, kind: str, text: str = "", detail: str = "") -> None:
+        """Queue a record; never blocks."""
+        if self._enabled:
+            self._queue.put_nowait(OutputRecord(kind, text, detail))
+
+    async def aclose(self) -> None:
+        """Flush everything queued and stop the drain task. Does not close the sink."""
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+
+    async def _drain(self) -> None:
+        while True:
+            record = await self._queue.get()
+            batch = []
+            done = record is None
+            while record is not None:
+                batch.append(record)
+                if len(batch) >= MAX_BATCH_SIZE or self._queue.empty():
+                    break
+                record = self._queue.get_nowait()
+                done = record is None
+
+            if batch:
+                try:
+                    await asyncio.to_thread(self.sink.write_batch, batch)
+                except (OSError, ValueError) as e:  # e.g. closed pipe or file
+                    self._enabled = False
+                    print(f"Warning: Session output disabled: {e}", file=sys.stderr)
+            if done:
+                return
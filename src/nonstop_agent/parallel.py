@@ -0,0 +1,460 @@
+"""
+Parallel Feature Workers
+========================
+
+Work on several failing features of one project at the same time.
+
+Each worker owns a git worktree on its own branch. It claims a failing
+feature that no other worker holds, resets its branch to the main branch
+and runs one coding session restricted to that feature. It then merges
+the branch back into the main branch. Claims are made synchronously on
+the single event loop, so two workers can never hold the same feature.
+Merges are serialized with a lock.
+
+Concurrent sessions always touch the same two bookkeeping files, so merge
+conflicts in them are reconciled instead of aborting the merge:
+- feature_list.json: the main branch's list, plus every "passes" change
+  the worker made relative to the merge base
+- claude-progress.txt: the main branch's notes, plus the lines the worker
+  appended
+
+A conflict in any other file aborts the merge, and the feature goes back
+to the pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import shutil
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TextIO
+
+from .agent import run_agent_session, run_autonomous_agent
+from .audit import AUDIT_LOG_FILE, AuditLog
+from .budget import BudgetGovernor
+from .events import EventBus
+from .features import FEATURE_LIST_FILE, load_feature_index, read_feature
+from .metrics import MetricsExporter, SessionStats
+from .output import OutputSink
+from .path_scope import PathScope
+from .progress import count_passing_tests, print_progress_summary
+from .prompts import format_assigned_feature, get_coding_prompt
+from .replay import TRANSCRIPT_FILE, TranscriptRecorder
+from .response import ResponseBuffer
+from .routing import PrefixWriter, output_target, routed_stdout
+from .scheduling import BackoffPolicy
+from .security import SecurityPolicy
+from .state import RunStateStore
+from .tracing import TOOL_TRACE_FILE, ToolTracer, TraceWriter, print_slowest_tools
+
+
+PROGRESS_NOTES_FILE = "claude-progress.txt"
+WORKTREE_BRANCH_PREFIX = "nonstop/worker-"
+
+# A feature that fails to land this many times is left for serial sessions
+MAX_ATTEMPTS_PER_FEATURE = 2
+
+
+class GitError(RuntimeError):
+    """A git command failed."""
+
+
+async def _git(cwd: Path, *args: str, check: bool = True) -> tuple[int, str]:
+    """Run git in cwd; returns (returncode, stdout) and raises GitError if check fails."""
+    process = await asyncio.create_subprocess_exec(
+        "git", *args,
+        cwd=cwd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    if check and process.returncode != 0:
+        raise GitError(f"git {' '.join(args)} failed: {stderr.decode().strip()}")
+    return process.returncode or 0, stdout.decode()
+
+
+# =============================================================================
+# Feature claims
+# =============================================================================
+
+@dataclass
+class FeatureClaims:
+    """Exclusive assignment of failing features to workers."""
+
+    claimed: dict[int, str] = field(default_factory=dict)  # feature index -> worker
+    attempts: dict[int, int] = field(default_factory=dict)
+
+    def claim(self, worker: str, failing: Iterable[int]) -> int | None:
+        """
+        Claim the first failing feature that is neither held nor exhausted.
+
+        Must not await between checking and recording, so that the claim is
+        atomic with respect to other workers on the event loop.
+        """
+        for index in failing:
+            if index in self.claimed or self.attempts.get(index, 0) >= MAX_ATTEMPTS_PER_FEATURE:
+                continue
+            self.claimed[index] = worker
+            self.attempts[index] = self.attempts.get(index, 0) + 1
+            return index
+        return None
+
+    def release(self, index: int) -> None:
+        self.claimed.pop(index, None)
+
+
+# =============================================================================
+# Merge reconciliation
+# =============================================================================
+
+def reconcile_feature_lists(
+    ours: list[Any],
+    base: list[Any],
+    theirs: list[Any],
+) -> list[Any]:
+    """
+    Apply the "passes" changes theirs made relative to base onto ours.
+
+    Features are matched by position; a change is only applied where the
+    feature's description is the same in all three versions.
+    """
+    result = [dict(f) if isinstance(f, dict) else f for f in ours]
+    for index, (before, after) in enumerate(zip(base, theirs)):
+        if index >= len(result):
+            break
+        current = result[index]
+        if not all(isinstance(f, dict) for f in (before, after, current)):
+            continue
+        if not before.get("description") == after.get("description") == current.get("description"):
+            continue
+        if before.get("passes") != after.get("passes"):
+            current["passes"] = after.get("passes")
+    return result
+
+
+def reconcile_notes(ours: str, base: str, theirs: str) -> str:
+    """Append the text theirs added after base to ours."""
+    added = theirs[len(base):] if theirs.startswith(base) else theirs
+    if not added or added in ours:
+        return ours
+    if ours and not ours.endswith("\n"):
+        ours += "\n"
+    return ours + added
+
+
+async def _show(cwd: Path, revision: str, path: str) -> str:
+    code, text = await _git(cwd, "show", f"{revision}:{path}", check=False)
+    return text if code == 0 else ""
+
+
+async def _resolve_conflicts(project_dir: Path, branch: str, conflicts: set[str]) -> bool:
+    """Resolve bookkeeping-file conflicts of an in-progress merge; False if impossible."""
+    if not conflicts <= {FEATURE_LIST_FILE, PROGRESS_NOTES_FILE}:
+        return False
+
+    _, merge_base = await _git(project_dir, "merge-base", "HEAD", branch)
+    merge_base = merge_base.strip()
+
+    if FEATURE_LIST_FILE in conflicts:
+        try:
+            versions = [
+                json.loads(await _show(project_dir, revision, FEATURE_LIST_FILE) or "[]")
+                for revision in ("HEAD", merge_base, branch)
+            ]
+        except json.JSONDecodeError:
+            return False
+        if not all(isinstance(v, list) for v in versions):
+            return False
+        merged = reconcile_feature_lists(*versions)
+        (project_dir / FEATURE_LIST_FILE).write_text(json.dumps(merged, indent=2) + "\n")
+
+    if PROGRESS_NOTES_FILE in conflicts:
+        versions = [
+            await _show(project_dir, revision, PROGRESS_NOTES_FILE)
+            for revision in ("HEAD", merge_base, branch)
+        ]
+        (project_dir / PROGRESS_NOTES_FILE).write_text(reconcile_notes(*versions))
+
+    await _git(project_dir, "add", *sorted(conflicts))
+    return True
+
+
+async def merge_worker_branch(project_dir: Path, branch: str) -> bool:
+    """
+    Merge a worker branch into the checked-out main branch.
+
+    Returns:
+        True if merged (possibly after reconciliation), False if aborted
+    """
+    code, _ = await _git(project_dir, "merge", "--no-ff", "--no-edit", branch, check=False)
+    if code == 0:
+        return True
+
+    _, unmerged = await _git(project_dir, "diff", "--name-only", "--diff-filter=U")
+    conflicts = set(unmerged.splitlines())
+    if conflicts and await _resolve_conflicts(project_dir, branch, conflicts):
+        await _git(project_dir, "commit", "--no-edit")
+        return True
+
+    await _git(project_dir, "merge", "--abort", check=False)
+    return False
+
+
+# =============================================================================
+# Workers
+# =============================================================================
+
+@dataclass
+class ParallelRun:
+    """State shared by the workers of one parallel run."""
+
+    project_dir: Path
+    main_branch: str
+    model: str
+    system_prompt: str | None
+    security_policy: SecurityPolicy | None
+    run_state: RunStateStore
+    metrics: MetricsExporter
+    sessions_left: int | None  # None = unlimited
+    sink: OutputSink | None = None
+    audit_log: AuditLog | None = None
+    allowed_paths: list[Path] = field(default_factory=list)
+    trace_writer: TraceWriter | None = None
+    recorder: TranscriptRecorder | None = None
+    budget: BudgetGovernor | None = None
+    claims: FeatureClaims = field(default_factory=FeatureClaims)
+    merge_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    merged: int = 0
+    running: int = 0  # Sessions whose usage is not recorded yet
+
+    def take_session(self) -> bool:
+        if self.sessions_left is None:
+            return True
+        if self.sessions_left <= 0:
+            return False
+        self.sessions_left -= 1
+        return True
+
+    async def session_model(self) -> str | None:
+        """Model for the next session under the budget, or None to stop the worker."""
+        if self.budget is None or not self.budget.enabled:
+            return self.model
+        decision = self.budget.check(self.model, self.run_state.state, self.running)
+        while decision.action == "wait":
+            print(f"\n{decision.reason}, waiting {decision.wait_seconds / 60:.1f} min")
+            await asyncio.sleep(decision.wait_seconds)
+            decision = self.budget.check(self.model, self.run_state.state, self.running)
+        if decision.action == "stop":
+            print(f"\n{decision.reason}")
+            return None
+        return decision.model
+
+
+async def _run_worker(run: ParallelRun, name: str, worktree: Path, branch: str) -> None:
+    """Claim, implement and merge features until none are left."""
+    delay_policy = BackoffPolicy()
+    while True:
+        # Ask the budget first, so a refusal costs neither a claim attempt nor a session
+        model = await run.session_model()
+        if model is None:
+            return
+
+        index = load_feature_index(run.project_dir)
+        if index is None:
+            return
+        feature_index = run.claims.claim(name, (r.index for r in index.failing()))
+        if feature_index is None or not run.take_session():
+            if feature_index is not None:
+                run.claims.release(feature_index)
+            return
+
+        try:
+            feature = read_feature(run.project_dir / FEATURE_LIST_FILE, feature_index) or {}
+            print(f"\nClaimed feature #{feature_index}: {feature.get('description', '')}")
+
+            async with run.merge_lock:  # The main branch must not move mid-reset
+                await _git(worktree, "reset", "--hard", run.main_branch)
+            await _git(worktree, "clean", "-fd")
+
+            prompt = get_coding_prompt() + format_assigned_feature(feature_index, feature)
+            stats = SessionStats()
+            session_events = EventBus()
+            tracer = ToolTracer(run.trace_writer)
+            tracer.attach(session_events)
+            run.running += 1
+            try:
+                status, _, _ = await run_agent_session(
+                    prompt=prompt,
+                    project_dir=worktree,
+                    model=model,
+                    system_prompt=run.system_prompt,
+                    security_policy=run.security_policy,
+                    audit_log=run.audit_log,
+                    path_scope=PathScope(worktree, run.allowed_paths),
+                    run_state=run.run_state,
+                    stats=stats,
+                    response=ResponseBuffer(max_chars=0),
+                    sink=run.sink,
+                    events=session_events,
+                    recorder=run.recorder,
+                )
+            finally:
+                run.running -= 1
+                run.run_state.record_usage(stats.cost_usd, stats.total_tokens)
+                if run.budget is not None:
+                    run.budget.observe(model, stats.cost_usd, stats.total_tokens)
+            iteration = run.run_state.record_iteration()
+            print_slowest_tools(tracer.finish(f"{name} session {iteration}"))
+
+            # Commit anything the session left uncommitted
+            await _git(worktree, "add", "-A")
+            await _git(
+                worktree, "commit", "-m", f"Work on feature #{feature_index}", check=False
+            )
+
+            async with run.merge_lock:
+                merged = await merge_worker_branch(run.project_dir, branch)
+                if merged:
+                    run.merged += 1
+                    print(f"Merged {branch} (feature #{feature_index})")
+                else:
+                    print(f"Could not merge {branch}: conflicts outside the bookkeeping files")
+                passing, total = count_passing_tests(run.project_dir)
+                run.run_state.record_progress(passing, total)
+                run.run_state.flush()
+                run.metrics.record(iteration, status, stats, passing, total)
+        except GitError as e:
+            print(f"Worker error: {e}")
+            if not (worktree / ".git").exists():
+                print(f"Worktree {worktree} is gone, stopping {name}")
+                return
+            status = "error"  # Retried like a failed session, within the claim attempts
+        finally:
+            run.claims.release(feature_index)
+
+        delay = delay_policy.next_delay(status)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _worktree_root(project_dir: Path) -> Path:
+    """Worktrees live next to the project, so file tools in the main dir never see them."""
+    resolved = project_dir.resolve()
+    return resolved.parent / f".{resolved.name}-worktrees"
+
+
+async def run_parallel(
+    project_dir: Path,
+    model: str,
+    workers: int,
+    max_iterations: int | None = None,
+    system_prompt: str | None = None,
+    security_policy: SecurityPolicy | None = None,
+    output_sink: OutputSink | None = None,
+    audit_log: bool = False,
+    allowed_paths: list[Path] | None = None,
+    trace_tools: bool = False,
+    record_transcript: bool = False,
+    budget: BudgetGovernor | None = None,
+) -> None:
+    """
+    Implement failing features with several workers in separate git worktrees.
+
+    If feature_list.json does not exist yet, one serial session creates it first.
+
+    Args:
+        project_dir: Project directory; must be a git repository once initialized
+        model: Claude model to use
+        workers: Number of concurrent workers
+        max_iterations: Total sessions across all workers (None for unlimited)
+        system_prompt: Optional custom system prompt
+        security_policy: Optional Bash policy for every session
+        output_sink: Where session output is rendered (default: ConsoleSink); not closed
+        audit_log: Whether to record Bash allow/deny decisions to security_audit.jsonl
+        allowed_paths: Extra directories file tools may access besides the worktree
+        trace_tools: Whether to append tool call spans to tool_trace.json
+        record_transcript: Whether to record every session's messages to session_transcript.jsonl
+        budget: Optional cost and token limits, checked before every session
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    needs_initializer = not (project_dir / FEATURE_LIST_FILE).exists()
+    if needs_initializer:
+        print("No feature_list.json yet - running the initializer session first")
+        await run_autonomous_agent(
+            project_dir, model, max_iterations=1,
+            system_prompt=system_prompt, security_policy=security_policy,
+            output_sink=output_sink, audit_log=audit_log, allowed_paths=allowed_paths,
+            trace_tools=trace_tools, record_transcript=record_transcript, budget=budget,
+        )
+        if max_iterations is not None:
+            max_iterations -= 1
+        if not (project_dir / FEATURE_LIST_FILE).exists():
+            print("Initializer did not create feature_list.json, stopping")
+            return
+
+    _, main_branch = await _git(project_dir, "rev-parse", "--abbrev-ref", "HEAD")
+    run = ParallelRun(
+        project_dir=project_dir,
+        main_branch=main_branch.strip(),
+        model=model,
+        system_prompt=system_prompt,
+        security_policy=security_policy,
+        run_state=RunStateStore(project_dir),
+        metrics=MetricsExporter(project_dir),
+        sessions_left=max_iterations,
+        sink=output_sink,
+        audit_log=AuditLog(project_dir / AUDIT_LOG_FILE) if audit_log else None,
+        allowed_paths=list(allowed_paths or ()),
+        trace_writer=TraceWriter(project_dir / TOOL_TRACE_FILE) if trace_tools else None,
+        recorder=TranscriptRecorder(project_dir / TRANSCRIPT_FILE) if record_transcript else None,
+        budget=budget,
+    )
+    if not needs_initializer:
+        run.run_state.reset_budget()  # The initializer run already started a fresh budget
+
+    root = _worktree_root(project_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    worktrees = []
+    for i in range(1, workers + 1):
+        branch = f"{WORKTREE_BRANCH_PREFIX}{i}"
+        path = root / f"worker-{i}"
+        await _git(project_dir, "worktree", "add", "-f", "-B", branch, str(path), run.main_branch)
+        worktrees.append((f"worker-{i}", path, branch))
+
+    print(f"Running {workers} parallel workers on {run.main_branch}")
+    print_progress_summary(project_dir)
+
+    async def worker(name: str, path: Path, branch: str, console: TextIO) -> None:
+        target = PrefixWriter(console, f"[{name}] ")
+        output_target.set(target)
+        try:
+            await _run_worker(run, name, path, branch)
+        finally:
+            target.close()
+
+    try:
+        with routed_stdout() as console:
+            await asyncio.gather(*(worker(*w, console) for w in worktrees))
+    finally:
+        for _, path, branch in worktrees:
+            await _git(project_dir, "worktree", "remove", "--force", str(path), check=False)
+            await _git(project_dir, "branch", "-D", branch, check=False)
+        shutil.rmtree(root, ignore_errors=True)
+        run.run_state.flush()
+        if run.audit_log is not None:
+            await run.audit_log.aclose()
+        if run.trace_writer is not None:
+            run.trace_writer.close()
+        if run.recorder is not None:
+            run.recorder.close()
+
+    print("\n" + "=" * 70)
+    print("  PARALLEL RUN COMPLETE")
+    print("=" * 70)
+    print(f"\nMerged sessions: {run.merged}")
+    print_progress_summary(project_dir)
@@ -0,0 +1,212 @@
+"""
+Filesystem Scope Hook
+=====================
+
+Pre-tool-use hook that keeps file tools (Read, Write, Edit, Glob, Grep, ...)
+inside the project directory and any extra allowed roots.
+
+Target paths are resolved relative to the project directory, symlinks are
+followed with os.path.realpath (memoized in a bounded LRU cache so hot
+files cost no syscalls), and the result is matched against a prefix tree
+of allowed roots in time proportional to the path depth.
+
+Reference: https://platform.claude.com/docs/en/agent-sdk/hooks
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from .security import HookCallback, HookContext, HookInput, HookJSONOutput, deny_result
+
+
+# Tool name -> input keys holding a filesystem path
+FILE_TOOL_PATH_KEYS: dict[str, tuple[str, ...]] = {
+    "Read": ("file_path",),
+    "Write": ("file_path",),
+    "Edit": ("file_path",),
+    "MultiEdit": ("file_path",),
+    "NotebookEdit": ("notebook_path",),
+    "Glob": ("path",),
+    "Grep": ("path",),
+}
+
+# HookMatcher pattern covering every tool in FILE_TOOL_PATH_KEYS
+FILE_TOOLS_MATCHER = "|".join(FILE_TOOL_PATH_KEYS)
+
+REALPATH_CACHE_SIZE = 4096
+
+# Tool name -> input key holding a glob pattern matched below the tool's path
+PATTERN_TOOL_KEYS: dict[str, str] = {
+    "Glob": "pattern",
+    "Grep": "glob",
+}
+
+_GLOB_CHARS = frozenset("*?[{")
+
+
+def _pattern_root(pattern: str, base: str) -> str | None:
+    """
+    Directory a glob pattern can reach: its static prefix joined onto base.
+
+    Args:
+        pattern: Glob pattern, relative to base or absolute
+        base: Directory the pattern is matched under
+
+    Returns:
+        The path to check against the allowed roots, or None if a '..'
+        segment follows the first wildcard (it cannot be resolved statically)
+    """
+    parts = Path(os.path.expanduser(pattern)).parts
+    static: list[str] = []
+    for i, part in enumerate(parts):
+        if _GLOB_CHARS.intersection(part):
+            # Brace alternatives such as {..,src} are segments of their own
+            if any(".." in re.split(r"[{},]", rest) for rest in parts[i:]):
+                return None
+            break
+        static.append(part)
+    return os.path.join(base, *static)
+
+
+class _RootTrie:
+    """Prefix tree over path components; a node marked terminal is an allowed root."""
+
+    _TERMINAL = ""  # Never a valid path component, so safe as a marker key
+
+    def __init__(self) -> None:
+        self._root: dict[str, Any] = {}
+
+    def add(self, parts: Iterable[str]) -> None:
+        node = self._root
+        for part in parts:
+            node = node.setdefault(part, {})
+        node[self._TERMINAL] = True
+
+    def contains(self, parts: Iterable[str]) -> bool:
+        """True if some allowed root is a prefix of (or equal to) the given parts."""
+        node = self._root
+        if self._TERMINAL in node:
+            return True
+        for part in parts:
+            child = node.get(part)
+            if child is None:
+                return False
+            if self._TERMINAL in child:
+                return True
+            node = child
+        return False
+
+
+class PathScope:
+    """Set of allowed filesystem roots with cached path resolution."""
+
+    def __init__(
+        self,
+        project_dir: Path,
+        extra_roots: Iterable[Path] = (),
+        cache_size: int = REALPATH_CACHE_SIZE,
+    ) -> None:
+        """
+        Args:
+            project_dir: Base directory; relative paths resolve against it
+            extra_roots: Additional directories the file tools may access
+            cache_size: Maximum number of memoized realpath results
+        """
+        self.base = os.path.realpath(project_dir)
+        self.roots = [self.base] + [os.path.realpath(os.path.expanduser(r)) for r in extra_roots]
+        self._trie = _RootTrie()
+        for root in self.roots:
+            self._trie.add(Path(root).parts)
+        self._realpath = lru_cache(maxsize=cache_size)(os.path.realpath)
+
+    def resolve(self, path: str) -> str:
+        """Resolve a tool path against the project dir, following symlinks."""
+        joined = os.path.join(self.base, os.path.expanduser(path))
+        return self._realpath(os.path.normpath(joined))
+
+    def is_allowed(self, path: str) -> bool:
+        """Check whether a path resolves inside one of the allowed roots."""
+        return self._trie.contains(Path(self.resolve(path)).parts)
+
+    def check(self, tool_name: str, tool_input: dict[str, Any]) -> tuple[bool, str]:
+        """
+        Check every path argument of a file tool call.
+
+        Args:
+            tool_name: Name of the tool being called
+            tool_input: The tool's input arguments
+
+        Returns:
+            (allowed, reason) where reason explains a denial
+        """
+        paths = [
+            tool_input[key]
+            for key in FILE_TOOL_PATH_KEYS.get(tool_name, ())
+            if isinstance(tool_input.get(key), str) and tool_input[key]
+        ]
+
+        # Glob patterns (Glob's pattern, Grep's glob) may reach outside their search root
+        pattern_key = PATTERN_TOOL_KEYS.get(tool_name)
+        pattern = tool_input.get(pattern_key) if pattern_key else None
+        if isinstance(pattern, str) and pattern:
+            base = tool_input.get("path")
+            root = _pattern_root(pattern, base if isinstance(base, str) and base else self.base)
+            if root is None:
+                return False, (
+                    f"{tool_name} pattern '{pattern}' may not use '..' after a wildcard"
+                )
+            paths.append(root)
+
+        for path in paths:
+            if not self.is_allowed(path):
+                return False, (
+                    f"{tool_name} path '{path}' is outside the allowed directories: "
+                    f"{', '.join(self.roots)}"
+                )
+
+        return True, ""
+
+    def cache_info(self) -> dict[str, int]:
+        """Return hit/miss counters and occupancy of the realpath cache."""
+        info = self._realpath.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize or 0,
+        }
+
+
+def make_path_scope_hook(scope: PathScope) -> HookCallback:
+    """
+    Create a PreToolUse hook that denies file tool calls outside the scope.
+
+    Args:
+        scope: Allowed roots to enforce
+
+    Returns:
+        Async hook function suitable for HookMatcher(matcher=FILE_TOOLS_MATCHER)
+    """
+
+    async def path_scope_hook(
+        input_data: HookInput,
+        tool_use_id: str | None,
+        context: HookContext,
+    ) -> HookJSONOutput:
+        tool_name = input_data.get("tool_name", "")
+        if tool_name not in FILE_TOOL_PATH_KEYS:
+            return {}
+
+        allowed, reason = scope.check(tool_name, input_data.get("tool_input", {}))
+        if not allowed:
+            return deny_result(reason)
+
+        return {}
+
+    return path_scope_hook
@@ -0,0 +1,256 @@
+"""
+Security Policy Files
+=====================
+
+Load extra command rules from TOML or JSON so projects can extend the
+Bash allowlist (e.g. docker, make, cargo) without forking the harness.
+
+Example policy.toml:
+
+    allowed_commands = ["make"]
+    removed_commands = ["pkill"]
+
+    [commands.docker]
+    subcommands = ["build", "ps", "logs", "compose"]
+    denied_args = ["--privileged"]
+    denied_patterns = ['-v\\s*/:']
+
+    [commands.cargo]
+    validator = "my_rules:validate_cargo"
+
+Every command listed under [commands] is also allowed. Rules are compiled
+once into validator callables that the security hook dispatches on by
+command name. load_security_policy() turns a file into a per-session
+SecurityPolicy; apply_policy_file() changes the global default instead.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import re
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+from .security import (
+    CommandSegment,
+    CommandValidator,
+    SecurityPolicy,
+    add_allowed_command,
+    default_policy,
+    register_command_validator,
+    remove_allowed_command,
+)
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+
+_RULE_KEYS = {"subcommands", "denied_args", "denied_patterns", "validator"}
+
+
+@dataclass(frozen=True)
+class ArgumentConstraints:
+    """Declarative argument checks for one command, usable as a validator."""
+
+    command: str
+    subcommands: frozenset[str] | None = None  # First positional argument must be one of these
+    denied_args: frozenset[str] = frozenset()  # Rejected tokens; "--flag" also matches "--flag=x"
+    denied_pattern: re.Pattern[str] | None = None  # Searched in the joined argument string
+
+    def __call__(self, segment: CommandSegment) -> tuple[bool, str]:
+        args = segment.argv[1:]
+
+        if self.subcommands is not None:
+            positional = next((a for a in args if not a.startswith("-")), None)
+            if positional not in self.subcommands:
+                return False, (
+                    f"{self.command} only allowed with subcommands: "
+                    f"{sorted(self.subcommands)}, got: {positional}"
+                )
+
+        for arg in args:
+            if arg in self.denied_args or arg.split("=", 1)[0] in self.denied_args:
+                return False, f"{self.command} argument not allowed: {arg}"
+
+        if self.denied_pattern is not None:
+            match = self.denied_pattern.search(" ".join(args))
+            if match:
+                return False, f"{self.command} arguments match a denied pattern: {match.group(0)}"
+
+        return True, ""
+
+
+@dataclass(frozen=True)
+class PolicyRules:
+    """Compiled additions and removals to apply on top of a base policy."""
+
+    allowed_commands: frozenset[str] = frozenset()
+    removed_commands: frozenset[str] = frozenset()
+    validators: Mapping[str, CommandValidator] = field(default_factory=dict)
+
+    def apply_to(self, policy: SecurityPolicy) -> SecurityPolicy:
+        """Return a new SecurityPolicy with these rules layered on top of `policy`."""
+        return replace(
+            policy,
+            allowed_commands=(policy.allowed_commands | self.allowed_commands)
+            - self.removed_commands,
+            validators={**policy.validators, **self.validators},
+        )
+
+
+def _string_list(value: Any, where: str) -> list[str]:
+    """Check that a policy value is a list of strings."""
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"{where} must be a list of strings")
+    return value
+
+
+def _import_validator(spec: str, command: str) -> CommandValidator:
+    """Resolve a "module:attribute" validator reference."""
+    module_name, _, attr = spec.partition(":")
+    if not module_name or not attr:
+        raise ValueError(f"commands.{command}.validator must look like 'module:function'")
+    try:
+        validator = getattr(importlib.import_module(module_name), attr)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"commands.{command}.validator '{spec}' could not be imported: {e}") from e
+    if not callable(validator):
+        raise ValueError(f"commands.{command}.validator '{spec}' is not callable")
+    return validator  # type: ignore[no-any-return]
+
+
+def _compile_rule(command: str, rule: Mapping[str, Any]) -> CommandValidator | None:
+    """Compile one [commands.<name>] table into a validator (None if unconstrained)."""
+    unknown = set(rule) - _RULE_KEYS
+    if unknown:
+        raise ValueError(f"Unknown keys in commands.{command}: {sorted(unknown)}")
+
+    if "validator" in rule:
+        if len(rule) > 1:
+            raise ValueError(
+                f"commands.{command}.validator cannot be combined with argument constraints"
+            )
+        if not isinstance(rule["validator"], str):
+            raise ValueError(f"commands.{command}.validator must be a string")
+        return _import_validator(rule["validator"], command)
+
+    if not rule:
+        return None
+
+    subcommands = rule.get("subcommands")
+    patterns = _string_list(rule.get("denied_patterns", []), f"commands.{command}.denied_patterns")
+
+    return ArgumentConstraints(
+        command=command,
+        subcommands=(
+            frozenset(_string_list(subcommands, f"commands.{command}.subcommands"))
+            if subcommands is not None
+            else None
+        ),
+        denied_args=frozenset(
+            _string_list(rule.get("denied_args", []), f"commands.{command}.denied_args")
+        ),
+        denied_pattern=re.compile("|".join(f"(?:{p})" for p in patterns)) if patterns else None,
+    )
+
+
+def parse_policy(data: Mapping[str, Any]) -> PolicyRules:
+    """
+    Compile a policy mapping (as read from TOML/JSON) into PolicyRules.
+
+    Args:
+        data: Mapping with optional allowed_commands, removed_commands and commands keys
+
+    Returns:
+        Compiled PolicyRules
+
+    Raises:
+        ValueError: If the policy is malformed
+    """
+    unknown = set(data) - {"allowed_commands", "removed_commands", "commands"}
+    if unknown:
+        raise ValueError(f"Unknown policy keys: {sorted(unknown)}")
+
+    allowed = set(_string_list(data.get("allowed_commands", []), "allowed_commands"))
+    removed = set(_string_list(data.get("removed_commands", []), "removed_commands"))
+
+    commands = data.get("commands", {})
+    if not isinstance(commands, Mapping):
+        raise ValueError("commands must be a table of per-command rules")
+
+    validators: dict[str, CommandValidator] = {}
+    for command, rule in commands.items():
+        if not isinstance(rule, Mapping):
+            raise ValueError(f"commands.{command} must be a table")
+        allowed.add(command)
+        validator = _compile_rule(command, rule)
+        if validator is not None:
+            validators[command] = validator
+
+    return PolicyRules(
+        allowed_commands=frozenset(allowed),
+        removed_commands=frozenset(removed),
+        validators=validators,
+    )
+
+
+def load_policy_file(path: Path) -> PolicyRules:
+    """
+    Load and compile a .toml or .json policy file.
+
+    Args:
+        path: Path to the policy file
+
+    Returns:
+        Compiled PolicyRules
+    """
+    if path.suffix == ".toml":
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    elif path.suffix == ".json":
+        with open(path) as f:
+            data = json.load(f)
+    else:
+        raise ValueError(f"Unsupported policy file type: {path.suffix} (use .toml or .json)")
+
+    if not isinstance(data, Mapping):
+        raise ValueError(f"Policy file must contain a table/object: {path}")
+
+    return parse_policy(data)
+
+
+def load_security_policy(path: Path, base: SecurityPolicy | None = None) -> SecurityPolicy:
+    """
+    Build an immutable SecurityPolicy from a policy file.
+
+    Args:
+        path: Path to the .toml or .json policy file
+        base: Policy to extend (default: snapshot of the module-level allowlist)
+
+    Returns:
+        New SecurityPolicy; the global allowlist is left untouched
+    """
+    return load_policy_file(path).apply_to(base or default_policy())
+
+
+def apply_policy_rules(rules: PolicyRules) -> None:
+    """Apply compiled rules to the global allowlist and validator registry."""
+    for command in rules.allowed_commands:
+        add_allowed_command(command)
+    for command, validator in rules.validators.items():
+        register_command_validator(command, validator)
+    for command in rules.removed_commands:
+        remove_allowed_command(command)
+
+
+def apply_policy_file(path: Path) -> PolicyRules:
+    """Load a policy file and apply it to the global security policy."""
+    rules = load_policy_file(path)
+    apply_policy_rules(rules)
+    return rules
@@ -0,0 +1,272 @@
+"""
+Offline Policy Checking
+=======================
+
+Re-validate Bash commands recorded in past session transcripts against a
+new security policy, to see what a policy change would newly deny or allow.
+
+Usage:
+    nonstop-agent policy-check --policy policy.toml transcripts/*.jsonl
+    nonstop-agent policy-check --policy new.toml --baseline-policy old.toml logs/*.jsonl
+
+Commands are de-duplicated before checking, then validated in chunks across
+a process pool. Each worker builds its policies once from the policy files.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .policy import load_security_policy
+from .security import SecurityPolicy, default_policy
+
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Below this many unique commands the pool costs more than it saves
+MIN_COMMANDS_FOR_POOL = 2000
+
+# Per-worker policies, set by _init_worker
+_worker_policies: tuple[SecurityPolicy, SecurityPolicy] | None = None
+
+
+@dataclass
+class PolicyCheckReport:
+    """Differences between the baseline and candidate policy verdicts."""
+
+    total_commands: int = 0
+    unique_commands: int = 0
+    denied_commands: int = 0  # Unique commands the candidate policy denies
+    newly_denied: list[tuple[str, str, int]] = field(default_factory=list)  # (command, reason, count)
+    newly_allowed: list[tuple[str, int]] = field(default_factory=list)  # (command, count)
+
+
+def _is_tool_use(obj: dict[str, Any]) -> bool:
+    # Raw API blocks carry "type"; --record-transcript files tag SDK objects with "$type"
+    return obj.get("type") == "tool_use" or obj.get("$type") == "ToolUseBlock"
+
+
+def _walk_commands(obj: Any) -> Iterator[str]:
+    """Yield Bash commands from tool_use blocks anywhere inside a JSON value."""
+    if isinstance(obj, dict):
+        if _is_tool_use(obj) and obj.get("name") == "Bash":
+            command = (obj.get("input") or {}).get("command")
+            if isinstance(command, str):
+                yield command
+            return
+        for value in obj.values():
+            if isinstance(value, (dict, list)):
+                yield from _walk_commands(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            if isinstance(item, (dict, list)):
+                yield from _walk_commands(item)
+
+
+def iter_transcript_commands(paths: Iterable[Path]) -> Iterator[str]:
+    """
+    Stream Bash commands out of JSONL transcripts.
+
+    Understands session transcripts (tool_use blocks named "Bash", including
+    session_transcript.jsonl from --record-transcript) as well as flat
+    records with a top-level "command" string, such as audit logs.
+    Unparseable lines are skipped.
+
+    Args:
+        paths: JSONL files to read
+
+    Yields:
+        Each recorded command, in file order
+    """
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict) and isinstance(record.get("command"), str):
+                    yield record["command"]
+                else:
+                    yield from _walk_commands(record)
+
+
+def _load_policies(
+    policy_file: Path | None,
+    baseline_file: Path | None,
+) -> tuple[SecurityPolicy, SecurityPolicy]:
+    """Build (candidate, baseline) policies; missing files mean the default policy."""
+    candidate = load_security_policy(policy_file) if policy_file else default_policy()
+    baseline = load_security_policy(baseline_file) if baseline_file else default_policy()
+    return candidate, baseline
+
+
+def _init_worker(policy_file: Path | None, baseline_file: Path | None) -> None:
+    """Process pool initializer: compile both policies once per worker."""
+    global _worker_policies
+    _worker_policies = _load_policies(policy_file, baseline_file)
+
+
+def _check_chunk(
+    chunk: list[str],
+    policies: tuple[SecurityPolicy, SecurityPolicy] | None = None,
+) -> list[tuple[bool, str, bool]]:
+    """Return (candidate_allowed, candidate_reason, baseline_allowed) per command."""
+    candidate, baseline = policies or _worker_policies  # type: ignore[misc]
+    results = []
+    for command in chunk:
+        allowed, reason = candidate.evaluate(command)
+        baseline_allowed, _ = baseline.evaluate(command)
+        results.append((allowed, reason, baseline_allowed))
+    return results
+
+
+def _chunks(items: list[str], size: int) -> Iterator[list[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def check_commands(
+    commands: Iterable[str],
+    policy_file: Path | None = None,
+    baseline_file: Path | None = None,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> PolicyCheckReport:
+    """
+    Compare how two policies judge a stream of commands.
+
+    Args:
+        commands: Commands to check (duplicates are counted, checked once)
+        policy_file: Candidate policy file (default: the built-in policy)
+        baseline_file: Baseline policy file (default: the built-in policy)
+        workers: Process pool size (None = CPU count, 1 = run in-process)
+        chunk_size: Commands sent to a worker per task
+
+    Returns:
+        PolicyCheckReport, with newly denied/allowed commands most frequent first
+    """
+    counts = Counter(commands)
+    unique = list(counts)
+
+    if workers == 1 or len(unique) < MIN_COMMANDS_FOR_POOL:
+        results = _check_chunk(unique, _load_policies(policy_file, baseline_file))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(policy_file, baseline_file),
+        ) as executor:
+            results = [
+                result
+                for chunk_results in executor.map(_check_chunk, _chunks(unique, chunk_size))
+                for result in chunk_results
+            ]
+
+    report = PolicyCheckReport(total_commands=sum(counts.values()), unique_commands=len(unique))
+    for command, (allowed, reason, baseline_allowed) in zip(unique, results):
+        if not allowed:
+            report.denied_commands += 1
+        if baseline_allowed and not allowed:
+            report.newly_denied.append((command, reason, counts[command]))
+        elif allowed and not baseline_allowed:
+            report.newly_allowed.append((command, counts[command]))
+
+    report.newly_denied.sort(key=lambda item: -item[2])
+    report.newly_allowed.sort(key=lambda item: -item[1])
+    return report
+
+
+def print_report(report: PolicyCheckReport, limit: int = 20) -> None:
+    """Print a summary of a policy check."""
+    print(f"Commands checked: {report.total_commands} ({report.unique_commands} unique)")
+    print(f"Denied by new policy: {report.denied_commands} unique")
+    print(f"Newly denied: {len(report.newly_denied)}")
+    for command, reason, count in report.newly_denied[:limit]:
+        print(f"  [{count}x] {command}")
+        print(f"         {reason}")
+    print(f"Newly allowed: {len(report.newly_allowed)}")
+    for command, count in report.newly_allowed[:limit]:
+        print(f"  [{count}x] {command}")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse policy-check command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="nonstop-agent policy-check",
+        description="Re-check recorded Bash commands against a security policy",
+    )
+
+    parser.add_argument(
+        "transcripts",
+        type=Path,
+        nargs="+",
+        help="JSONL transcripts or audit logs to read commands from",
+    )
+
+    parser.add_argument(
+        "--policy",
+        type=Path,
+        default=None,
+        help="Candidate policy file (default: built-in policy)",
+    )
+
+    parser.add_argument(
+        "--baseline-policy",
+        type=Path,
+        default=None,
+        help="Policy to compare against (default: built-in policy)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count, 1 = no pool)",
+    )
+
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Commands per worker task (default: {DEFAULT_CHUNK_SIZE})",
+    )
+
+    parser.add_argument(
+        "--show",
+        type=int,
+        default=20,
+        help="Number of newly denied/allowed commands to list (default: 20)",
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for `nonstop-agent policy-check`; returns an exit status."""
+    args = parse_args(argv)
+
+    try:
+        report = check_commands(
+            iter_transcript_commands(args.transcripts),
+            policy_file=args.policy,
+            baseline_file=args.baseline_policy,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+        )
+    except (OSError, ValueError) as e:
+        print(f"Policy check failed: {e}")
+        return 1
+
+    print_report(report, limit=args.show)
+    return 0
@@ -5,39 +5,37 @@ Progress Tracking Utilities
 Functions for tracking and displaying progress of the autonomous agent.
 """
 
-import json
 from pathlib import Path
 
+from .feature_db import FeatureDB
+from .features import load_feature_index
+from .history import ProgressHistory, format_rate
+from .state import RunStateStore
 
-SESSION_FILE = "claude_session.json"
 
-
-def count_passing_tests(project_dir: Path) -> tuple[int, int]:
+def count_passing_tests(project_dir: Path, feature_db: FeatureDB | None = None) -> tuple[int, int]:
     """
     Count passing and total tests in feature_list.json.
 
+    Parsing is cached and skipped entirely while the file is unchanged.
+
     Args:
         project_dir: Directory containing feature_list.json
+        feature_db: Optional SQLite index to sync and query instead
 
     Returns:
         (passing_count, total_count)
     """
-    tests_file = project_dir / "feature_list.json"
-
-    if not tests_file.exists():
-        return 0, 0
-
-    try:
-        with open(tests_file, "r") as f:
-            tests = json.load(f)
+    if feature_db is not None and feature_db.sync():
+        return feature_db.counts()
 
-        total = len(tests)
-        passing = sum(1 for test in tests if test.get("passes", False))
+    index = load_feature_index(project_dir)
 
-        return passing, total
-    except (json.JSONDecodeError, IOError):
+    if index is None:
         return 0, 0
 
+    return index.passing, index.total
+
 
 def print_session_header(session_num: int, session_type: str) -> None:
     """Print a formatted header for the session."""
@@ -54,35 +52,36 @@ def print_session_header(session_num: int, session_type: str) -> None:
     print()
 
 
-def print_progress_summary(project_dir: Path) -> None:
-    """Print a summary of current progress."""
-    passing, total = count_passing_tests(project_dir)
+def print_progress_summary(
+    project_dir: Path,
+    feature_db: FeatureDB | None = None,
+    history: ProgressHistory | None = None,
+) -> None:
+    """Print a summary of current progress, with throughput and ETA if history is given."""
+    passing, total = count_passing_tests(project_dir, feature_db)
 
     if total > 0:
         percentage = (passing / total) * 100
         print(f"\nProgress: {passing}/{total} tests passing ({percentage:.1f}%)")
+        if feature_db is not None:
+            touched = feature_db.count_touched_in_last(1)
+            if touched:
+                print(f"Features changed this session: {touched}")
+        rate = history.rate() if history is not None else None
+        summary = format_rate(rate) if rate is not None else ""
+        if summary:
+            print(f"Throughput: {summary}")
     else:
         print("\nProgress: feature_list.json not yet created")
 
 
 def save_session_id(project_dir: Path, session_id: str) -> None:
     """Save session ID for later resumption."""
-    session_file = project_dir / SESSION_FILE
-    try:
-        with open(session_file, "w") as f:
-            json.dump({"session_id": session_id}, f)
-    except IOError as e:
-        print(f"Warning: Could not save session ID: {e}")
+    store = RunStateStore(project_dir)
+    store.record_session(session_id)
+    store.flush()
 
 
 def load_session_id(project_dir: Path) -> str | None:
     """Load saved session ID."""
-    session_file = project_dir / SESSION_FILE
-    if session_file.exists():
-        try:
-            with open(session_file) as f:
-                data = json.load(f)
-                return data.get("session_id")
-        except (json.JSONDecodeError, IOError):
-            pass
-    return None
+    return RunStateStore(project_dir).state.last_session_id
@@ -7,6 +7,9 @@ Functions for loading prompt templates from the prompts directory.
 
 import shutil
 from pathlib import Path
+from typing import Any
+
+from .feature_db import FeatureRow
 
 
 PROMPTS_DIR = Path(__file__).parent / "prompts"
@@ -28,6 +31,57 @@ def get_coding_prompt() -> str:
     return load_prompt("coding_prompt")
 
 
+def format_next_features(rows: list[FeatureRow]) -> str:
+    """Render failing features from the feature index as a prompt section."""
+    if not rows:
+        return ""
+
+    lines = ["", "## NEXT FAILING FEATURES", ""]
+    lines.append("From the feature index, in feature_list.json order:")
+    lines.append("")
+    for row in rows:
+        lines.append(f"- #{row.index} [{row.category}] {row.description}")
+        for step in row.feature().get("steps", []):
+            lines.append(f"  - {step}")
+    return "\n".join(lines) + "\n"
+
+
+def format_assigned_feature(index: int, feature: dict[str, Any]) -> str:
+    """Render the feature a parallel worker must implement as a prompt section."""
+    lines = [
+        "",
+        "## ASSIGNED FEATURE (PARALLEL WORKER)",
+        "",
+        "You are one of several agents working on this project at the same time,",
+        "each in its own git worktree. Work ONLY on the feature below, ignoring",
+        "the feature selection step. In feature_list.json change nothing except",
+        f"the \"passes\" field of feature #{index}, and commit all your work to the",
+        "current branch before finishing.",
+        "",
+        f"- #{index} [{feature.get('category', '')}] {feature.get('description', '')}",
+    ]
+    lines.extend(f"  - {step}" for step in feature.get("steps", []))
+    return "\n".join(lines) + "\n"
+
+
+def format_stall_recovery(sessions: int) -> str:
+    """Render the prompt section used after progress has stalled."""
+    lines = [
+        "",
+        "## PROGRESS HAS STALLED",
+        "",
+        f"The last {sessions} sessions changed neither the number of passing features",
+        "nor the git history. Do not repeat the previous approach:",
+        "",
+        "- Read the last entries of claude-progress.txt to see what was tried and failed",
+        "- If the current feature is blocked, record why in claude-progress.txt and",
+        "  move on to a different failing feature",
+        "- Prefer a small, verifiable step that can be committed this session",
+        "- Commit your work before finishing, even if the feature is not complete",
+    ]
+    return "\n".join(lines) + "\n"
+
+
 def get_existing_project_prompt() -> str:
     """Load the existing project analysis prompt."""
     return load_prompt("existing_project_prompt")
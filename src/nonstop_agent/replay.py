@@ -0,0 +1,223 @@
+"""
+Session Recording and Replay
+============================
+
+Records the SDK message stream of every session to a JSONL transcript and
+feeds it back to run_agent_session without the API, to benchmark the
+harness, reproduce a production session offline or load-test observers
+with a deterministic stream.
+
+Transcript format (session_transcript.jsonl), one JSON object per line:
+
+    {"session": {"prompt": "...", "model": "...", "started": 1760000000.0}}
+    {"t": 0.412, "m": {"$type": "AssistantMessage", "content": [...], ...}}
+    ...
+
+Each session starts with a "session" line followed by its messages. "t" is
+the offset in seconds from the start of the session; "m" is the message
+with every SDK object stored as its non-default fields plus a "$type" key
+naming the claude_agent_sdk class, so replay rebuilds the same message types.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import claude_agent_sdk
+
+
+TRANSCRIPT_FILE = "session_transcript.jsonl"
+
+_TYPE_KEY = "$type"
+
+
+def encode_message(obj: Any) -> Any:
+    """Turn an SDK message (or any value inside one) into JSON-compatible data."""
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    if isinstance(obj, (list, tuple)):
+        return [encode_message(item) for item in obj]
+    if isinstance(obj, dict):
+        return {str(key): encode_message(value) for key, value in obj.items()}
+    if dataclasses.is_dataclass(obj):
+        # Fields left at their default are restored by the constructor on replay
+        fields = {
+            f.name: getattr(obj, f.name)
+            for f in dataclasses.fields(obj)
+            if f.default is dataclasses.MISSING or getattr(obj, f.name) != f.default
+        }
+    elif hasattr(obj, "__dict__"):
+        fields = vars(obj)
+    else:
+        return str(obj)
+    return {_TYPE_KEY: type(obj).__name__, **{k: encode_message(v) for k, v in fields.items()}}
+
+
+def decode_message(data: Any) -> Any:
+    """Rebuild a message from encode_message output."""
+    if isinstance(data, list):
+        return [decode_message(item) for item in data]
+    if not isinstance(data, dict):
+        return data
+
+    values = {key: decode_message(value) for key, value in data.items() if key != _TYPE_KEY}
+    if _TYPE_KEY not in data:
+        return values
+
+    cls = getattr(claude_agent_sdk, data[_TYPE_KEY], None)
+    if not isinstance(cls, type):
+        # Not in the installed SDK; attribute access still works
+        return SimpleNamespace(**values)
+    if dataclasses.is_dataclass(cls):
+        # Drop fields a different SDK version does not know
+        names = {f.name for f in dataclasses.fields(cls) if f.init}
+        return cls(**{k: v for k, v in values.items() if k in names})
+    obj = cls.__new__(cls)
+    obj.__dict__.update(values)
+    return obj
+
+
+class TranscriptRecorder:
+    """Appends the message streams of a run's sessions to a transcript file."""
+
+    def __init__(self, path: Path, clock: Callable[[], float] = time.monotonic) -> None:
+        self.path = path
+        self._clock = clock
+        self._started = clock()
+        try:
+            self._file = open(path, "a", encoding="utf-8")
+        except OSError as e:
+            print(f"Warning: Could not open session transcript {path}: {e}")
+            self._file = None
+
+    def start_session(self, prompt: str, model: str) -> None:
+        """Begin a new session; later messages are timed from now."""
+        self._started = self._clock()
+        self._write({"session": {"prompt": prompt, "model": model, "started": time.time()}})
+
+    def record(self, msg: Any) -> None:
+        """Append one message of the current session."""
+        if self._file is None:
+            return
+        offset = round(self._clock() - self._started, 3)
+        self._write({"t": offset, "m": encode_message(msg)})
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        if self._file is None:
+            return
+        try:
+            self._file.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
+            self._file.flush()
+        except OSError as e:
+            print(f"Warning: Could not write session transcript: {e}")
+            self._file = None
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+@dataclass
+class RecordedSession:
+    """The messages of one recorded session."""
+
+    prompt: str = ""
+    model: str = ""
+    started: float = 0.0
+    messages: list[tuple[float, Any]] = field(default_factory=list)  # (offset, message)
+
+
+def load_transcript(path: Path) -> list[RecordedSession]:
+    """
+    Read the sessions of a transcript file.
+
+    Args:
+        path: Transcript written by TranscriptRecorder
+
+    Returns:
+        Recorded sessions in order; messages before the first session
+        line form a session of their own
+    """
+    sessions: list[RecordedSession] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn last line
+            if not isinstance(entry, dict):
+                continue
+            if "session" in entry:
+                info = entry["session"]
+                sessions.append(RecordedSession(
+                    prompt=info.get("prompt", ""),
+                    model=info.get("model", ""),
+                    started=info.get("started", 0.0),
+                ))
+            elif "m" in entry:
+                if not sessions:
+                    sessions.append(RecordedSession())
+                sessions[-1].messages.append((entry.get("t", 0.0), decode_message(entry["m"])))
+    return sessions
+
+
+class ReplayExhausted(RuntimeError):
+    """Raised when a replay is asked for more sessions than were recorded."""
+
+
+class TranscriptReplay:
+    """
+    Stands in for claude_agent_sdk.query, replaying recorded sessions in order.
+
+    Each call replays the next recorded session, ignoring the prompt and
+    options it is given.
+    """
+
+    def __init__(
+        self,
+        sessions: list[RecordedSession],
+        speed: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            sessions: Sessions to replay, e.g. from load_transcript
+            speed: None to replay at full speed, or a factor of the recorded
+                timing (1.0 for the original pace, 2.0 for twice as fast)
+            clock: Monotonic clock used to pace the replay
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive")
+        self.sessions = sessions
+        self.speed = speed
+        self.replayed = 0
+        self._clock = clock
+
+    @classmethod
+    def from_file(cls, path: Path, speed: float | None = None) -> TranscriptReplay:
+        return cls(load_transcript(path), speed)
+
+    def __call__(self, prompt: str = "", options: Any = None) -> AsyncIterator[Any]:
+        if self.replayed >= len(self.sessions):
+            raise ReplayExhausted(f"Only {len(self.sessions)} sessions were recorded")
+        session = self.sessions[self.replayed]
+        self.replayed += 1
+        return self._stream(session)
+
+    async def _stream(self, session: RecordedSession) -> AsyncIterator[Any]:
+        started = self._clock()
+        for offset, msg in session.messages:
+            if self.speed is not None:
+                delay = offset / self.speed - (self._clock() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield msg
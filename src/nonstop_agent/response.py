@@ -0,0 +1,105 @@
+"""
+Response Buffer
+===============
+
+Bounded accumulation of an agent session's text output.
+
+Text blocks are kept as a list of chunks instead of one growing string, so
+appending costs O(len(chunk)) however long the session runs. Only the most
+recent `max_chars` characters are retained; older chunks are dropped from
+the front like a ring buffer. Callers that need the complete output can
+spill every chunk to a file as it arrives.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from pathlib import Path
+from typing import TextIO
+
+
+# Characters of session output kept in memory by default
+DEFAULT_RESPONSE_CHARS = 64 * 1024
+
+
+class ResponseBuffer:
+    """Retains the tail of a session's text, optionally spilling all of it to disk."""
+
+    def __init__(
+        self,
+        max_chars: int | None = DEFAULT_RESPONSE_CHARS,
+        spill_path: Path | None = None,
+    ) -> None:
+        """
+        Args:
+            max_chars: Characters to retain in memory (None for unlimited, 0 for none)
+            spill_path: File to write the complete output to; truncated on first write
+        """
+        if max_chars is not None and max_chars < 0:
+            raise ValueError("max_chars must not be negative")
+        self.max_chars = max_chars
+        self.spill_path = spill_path
+        self.total_chars = 0  # Every character appended, retained or not
+        self._chunks: deque[str] = deque()
+        self._retained = 0
+        self._spill: TextIO | None = None
+
+    @property
+    def truncated(self) -> bool:
+        """Whether older output has been dropped from memory."""
+        return self._retained < self.total_chars
+
+    def append(self, text: str) -> None:
+        """Add a chunk of output, dropping the oldest text beyond max_chars."""
+        if not text:
+            return
+        self.total_chars += len(text)
+
+        if self.spill_path is not None:
+            if self._spill is None:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                self._spill = open(self.spill_path, "w", encoding="utf-8")
+            self._spill.write(text)
+
+        if self.max_chars == 0:
+            return
+        self._chunks.append(text)
+        self._retained += len(text)
+        if self.max_chars is None:
+            return
+
+        excess = self._retained - self.max_chars
+        while excess > 0:
+            first = self._chunks[0]
+            if len(first) <= excess:
+                self._chunks.popleft()
+                self._retained -= len(first)
+                excess -= len(first)
+            else:
+                self._chunks[0] = first[excess:]
+                self._retained -= excess
+                excess = 0
+
+    def text(self) -> str:
+        """Return the retained output as one string."""
+        if len(self._chunks) > 1:
+            # Join once and keep the result, so repeated calls stay cheap
+            joined = "".join(self._chunks)
+            self._chunks.clear()
+            self._chunks.append(joined)
+        return self._chunks[0] if self._chunks else ""
+
+    def close(self) -> None:
+        """Close the spill file; the retained text stays available."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def __enter__(self) -> ResponseBuffer:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._retained
@@ -0,0 +1,80 @@
+"""
+Output Routing
+==============
+
+Per-task stdout for runs that drive several agent loops on one event loop.
+
+While routed_stdout() is active, sys.stdout writes to the target stored in
+the output_target context variable, falling back to the real stdout. Each
+asyncio task runs in its own copy of the context, so a task can send its
+output to a log file or a PrefixWriter without affecting the others.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import io
+import sys
+from collections.abc import Iterator
+from typing import TextIO
+
+
+output_target: contextvars.ContextVar[TextIO | None] = contextvars.ContextVar(
+    "nonstop_agent_output", default=None
+)
+
+
+class PrefixWriter(io.TextIOBase):
+    """Writes complete lines to a stream, each prefixed with a label."""
+
+    def __init__(self, stream: TextIO, prefix: str) -> None:
+        self._stream = stream
+        self._prefix = prefix
+        self._partial = ""
+
+    def write(self, text: str) -> int:
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        if lines:
+            self._stream.write("".join(f"{self._prefix}{line}\n" for line in lines))
+        return len(text)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+    def close(self) -> None:
+        if self._partial:
+            self._stream.write(f"{self._prefix}{self._partial}\n")
+            self._partial = ""
+        self._stream.flush()
+
+
+class RoutedStdout(io.TextIOBase):
+    """sys.stdout replacement that writes to the current context's target."""
+
+    def __init__(self, default: TextIO) -> None:
+        self.default = default
+
+    def _target(self) -> TextIO:
+        return output_target.get() or self.default
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def isatty(self) -> bool:
+        return self.default.isatty()
+
+
+@contextlib.contextmanager
+def routed_stdout() -> Iterator[TextIO]:
+    """Install a RoutedStdout as sys.stdout; yields the original stdout."""
+    original = sys.stdout
+    sys.stdout = RoutedStdout(original)
+    try:
+        yield original
+    finally:
+        sys.stdout = original
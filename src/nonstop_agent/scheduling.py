@@ -0,0 +1,97 @@
+"""
+Session Scheduling
+==================
+
+Delay policies deciding how long to wait before the next session.
+
+A healthy session is followed immediately by the next one. Errors back off
+exponentially with full jitter, up to a cap, so a struggling API is not
+hammered at a fixed rate. After enough consecutive errors a circuit breaker
+opens and the run pauses for a long cool-down before trying again; one
+successful session closes it.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+from typing import Protocol
+
+
+SUCCESS_DELAY_SECONDS = 0.0
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 120.0
+BREAKER_THRESHOLD = 5  # Consecutive errors before the circuit opens
+BREAKER_PAUSE_SECONDS = 600.0
+
+
+class DelayPolicy(Protocol):
+    """Decides the pause between sessions from the last session's status."""
+
+    def next_delay(self, status: str) -> float:
+        """Return seconds to wait after a session that ended with status."""
+        ...
+
+
+class FixedDelay:
+    """The same delay after every session, whatever its status."""
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+
+    def next_delay(self, status: str) -> float:
+        return self.seconds
+
+
+class BackoffPolicy:
+    """No delay after successes; jittered exponential backoff and a circuit breaker on errors."""
+
+    def __init__(
+        self,
+        success_delay: float = SUCCESS_DELAY_SECONDS,
+        base_delay: float = BACKOFF_BASE_SECONDS,
+        max_delay: float = BACKOFF_MAX_SECONDS,
+        breaker_threshold: int = BREAKER_THRESHOLD,
+        breaker_pause: float = BREAKER_PAUSE_SECONDS,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        """
+        Args:
+            success_delay: Seconds to wait after a successful session
+            base_delay: Backoff ceiling after the first error, doubled per error
+            max_delay: Upper bound of the backoff ceiling
+            breaker_threshold: Consecutive errors that open the circuit
+            breaker_pause: Seconds to pause while the circuit is open
+            rand: Source of uniform [0, 1) values for jitter
+        """
+        if breaker_threshold < 1:
+            raise ValueError("breaker_threshold must be at least 1")
+        self.success_delay = success_delay
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker_threshold = breaker_threshold
+        self.breaker_pause = breaker_pause
+        self._rand = rand
+        self.consecutive_errors = 0
+
+    @property
+    def circuit_open(self) -> bool:
+        return self.consecutive_errors >= self.breaker_threshold
+
+    def next_delay(self, status: str) -> float:
+        if status != "error":
+            self.consecutive_errors = 0
+            return self.success_delay
+
+        self.consecutive_errors += 1
+        if self.circuit_open:
+            # Each further failure while open (a failed probe) pauses again
+            print(
+                f"\nCircuit breaker open after {self.consecutive_errors} consecutive errors, "
+                f"pausing {self.breaker_pause:.0f}s"
+            )
+            return self.breaker_pause
+
+        # Full jitter: uniform in [0, ceiling) spreads out retries of concurrent runs
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (self.consecutive_errors - 1))
+        return ceiling * self._rand()
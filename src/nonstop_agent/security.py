@@ -13,12 +13,21 @@ from __future__ import annotations
 import os
 import re
 import shlex
-from typing import Any
+import time
+from collections.abc import Awaitable, Callable, Mapping, Set
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .audit import AuditLog
 
 # Type aliases for hook functions (from claude_agent_sdk)
 HookInput = dict[str, Any]
 HookContext = Any
 HookJSONOutput = dict[str, Any]
+HookCallback = Callable[[HookInput, "str | None", HookContext], Awaitable[HookJSONOutput]]
 
 
 # Allowed commands - customize based on your needs
@@ -63,15 +72,43 @@ ALLOWED_COMMANDS = {
 
 COMMANDS_NEEDING_EXTRA_VALIDATION = {"pkill", "chmod", "init.sh"}
 
+# Tokens that separate commands within a single shlex-split segment
+SHELL_OPERATORS = frozenset({"|", "||", "&&", "&"})
+
+# Shell keywords that are skipped when looking for a command name
+SHELL_KEYWORDS = frozenset({
+    "if", "then", "else", "elif", "fi", "for", "while",
+    "until", "do", "done", "case", "esac", "in", "!", "{", "}",
+})
+
+# Splits on ';' that is not directly adjacent to a quote
+_SEMICOLON_RE = re.compile(r'(?<!["\'])\s*;\s*(?!["\'])')
+
+# Maximum number of distinct commands whose verdicts are memoized
+VERDICT_CACHE_SIZE = 4096
+
+# Snapshot of the module-level allowlist, rebuilt after each policy change
+_default_policy: SecurityPolicy | None = None
+
+
+def _invalidate_default_policy() -> None:
+    """Drop the default policy snapshot, and with it all cached verdicts."""
+    global _default_policy
+    _default_policy = None
+
 
 def add_allowed_command(command: str) -> None:
     """Add a command to the allowlist."""
-    ALLOWED_COMMANDS.add(command)
+    if command not in ALLOWED_COMMANDS:
+        ALLOWED_COMMANDS.add(command)
+        _invalidate_default_policy()
 
 
 def remove_allowed_command(command: str) -> None:
     """Remove a command from the allowlist."""
-    ALLOWED_COMMANDS.discard(command)
+    if command in ALLOWED_COMMANDS:
+        ALLOWED_COMMANDS.discard(command)
+        _invalidate_default_policy()
 
 
 def is_command_allowed(command_string: str) -> bool:
@@ -102,7 +139,7 @@ def split_command_segments(command_string: str) -> list[str]:
 
     result = []
     for segment in segments:
-        sub_segments = re.split(r'(?<!["\'])\s*;\s*(?!["\'])', segment)
+        sub_segments = _SEMICOLON_RE.split(segment)
         for sub in sub_segments:
             sub = sub.strip()
             if sub:
@@ -111,36 +148,56 @@ def split_command_segments(command_string: str) -> list[str]:
     return result
 
 
-def extract_commands(command_string: str) -> list[str]:
-    """Extract command names from a shell command string."""
-    commands = []
+@dataclass(frozen=True)
+class CommandSegment:
+    """A single command within a compound shell command."""
 
-    segments = re.split(r'(?<!["\'])\s*;\s*(?!["\'])', command_string)
+    name: str  # Basename of the command token, e.g. "init.sh" for "./init.sh"
+    argv: tuple[str, ...]  # Command token followed by its arguments
+    operator: str = ""  # Operator ending the segment: ";", "|", "||", "&&", "&" or ""
 
-    for segment in segments:
-        segment = segment.strip()
-        if not segment:
+
+def parse_command(command_string: str) -> list[CommandSegment] | None:
+    """
+    Tokenize a shell command string into command segments in a single pass.
+
+    Every validator works on the resulting segments, so the string is only
+    split and shlex-parsed once regardless of how many commands it chains.
+
+    Args:
+        command_string: The full command string to parse
+
+    Returns:
+        List of segments in execution order, or None if quoting is malformed
+    """
+    segments: list[CommandSegment] = []
+
+    for part in _SEMICOLON_RE.split(command_string):
+        part = part.strip()
+        if not part:
             continue
 
         try:
-            tokens = shlex.split(segment)
+            tokens = shlex.split(part)
         except ValueError:
-            return []
+            return None
 
-        if not tokens:
-            continue
-
-        expect_command = True
+        name: str | None = None
+        argv: list[str] = []
 
         for token in tokens:
-            if token in ("|", "||", "&&", "&"):
-                expect_command = True
+            if token in SHELL_OPERATORS:
+                if name is not None:
+                    segments.append(CommandSegment(name, tuple(argv), token))
+                    name = None
+                    argv = []
+                continue
+
+            if name is not None:
+                argv.append(token)
                 continue
 
-            if token in (
-                "if", "then", "else", "elif", "fi", "for", "while",
-                "until", "do", "done", "case", "esac", "in", "!", "{", "}",
-            ):
+            if token in SHELL_KEYWORDS:
                 continue
 
             if token.startswith("-"):
@@ -149,21 +206,42 @@ def extract_commands(command_string: str) -> list[str]:
             if "=" in token and not token.startswith("="):
                 continue
 
-            if expect_command:
-                cmd = os.path.basename(token)
-                commands.append(cmd)
-                expect_command = False
+            name = os.path.basename(token)
+            argv = [token]
 
-    return commands
+        if name is not None:
+            segments.append(CommandSegment(name, tuple(argv), ";"))
 
+    if segments and segments[-1].operator == ";":
+        segments[-1] = replace(segments[-1], operator="")
+
+    return segments
+
+
+def extract_commands(command_string: str) -> list[str]:
+    """Extract command names from a shell command string."""
+    segments = parse_command(command_string)
+    if segments is None:
+        return []
+    return [segment.name for segment in segments]
 
-def validate_pkill_command(command_string: str) -> tuple[bool, str]:
-    """Validate pkill commands - only allow killing dev-related processes."""
-    allowed_process_names = {"node", "npm", "npx", "vite", "next", "python", "uvicorn"}
 
+def _command_tokens(command: str | CommandSegment) -> list[str] | None:
+    """Return the argv of a segment, or shlex-split a raw command string."""
+    if isinstance(command, CommandSegment):
+        return list(command.argv)
     try:
-        tokens = shlex.split(command_string)
+        return shlex.split(command)
     except ValueError:
+        return None
+
+
+def validate_pkill_command(command: str | CommandSegment) -> tuple[bool, str]:
+    """Validate pkill commands - only allow killing dev-related processes."""
+    allowed_process_names = {"node", "npm", "npx", "vite", "next", "python", "uvicorn"}
+
+    tokens = _command_tokens(command)
+    if tokens is None:
         return False, "Could not parse pkill command"
 
     if not tokens:
@@ -183,11 +261,10 @@ def validate_pkill_command(command_string: str) -> tuple[bool, str]:
     return False, f"pkill only allowed for dev processes: {allowed_process_names}"
 
 
-def validate_chmod_command(command_string: str) -> tuple[bool, str]:
+def validate_chmod_command(command: str | CommandSegment) -> tuple[bool, str]:
     """Validate chmod commands - only allow making files executable."""
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
+    tokens = _command_tokens(command)
+    if tokens is None:
         return False, "Could not parse chmod command"
 
     if not tokens or tokens[0] != "chmod":
@@ -216,11 +293,10 @@ def validate_chmod_command(command_string: str) -> tuple[bool, str]:
     return True, ""
 
 
-def validate_init_script(command_string: str) -> tuple[bool, str]:
+def validate_init_script(command: str | CommandSegment) -> tuple[bool, str]:
     """Validate init.sh script execution."""
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
+    tokens = _command_tokens(command)
+    if tokens is None:
         return False, "Could not parse init script command"
 
     if not tokens:
@@ -234,6 +310,44 @@ def validate_init_script(command_string: str) -> tuple[bool, str]:
     return False, f"Only ./init.sh is allowed, got: {script}"
 
 
+# Validators receive the parsed segment and return (allowed, reason)
+CommandValidator = Callable[[CommandSegment], tuple[bool, str]]
+
+# Dispatch map from command name to its extra validator
+COMMAND_VALIDATORS: dict[str, CommandValidator] = {
+    "pkill": validate_pkill_command,
+    "chmod": validate_chmod_command,
+    "init.sh": validate_init_script,
+}
+
+
+def register_command_validator(
+    command: str,
+    validator: CommandValidator,
+    allow: bool = True,
+) -> None:
+    """
+    Register an extra validator for a command, replacing any existing one.
+
+    Args:
+        command: Command name as it appears in CommandSegment.name
+        validator: Callable taking a CommandSegment and returning (allowed, reason)
+        allow: Also add the command to the allowlist
+    """
+    COMMAND_VALIDATORS[command] = validator
+    COMMANDS_NEEDING_EXTRA_VALIDATION.add(command)
+    if allow:
+        ALLOWED_COMMANDS.add(command)
+    _invalidate_default_policy()
+
+
+def unregister_command_validator(command: str) -> None:
+    """Remove the extra validator for a command (the allowlist is unchanged)."""
+    if COMMAND_VALIDATORS.pop(command, None) is not None:
+        COMMANDS_NEEDING_EXTRA_VALIDATION.discard(command)
+        _invalidate_default_policy()
+
+
 def get_command_for_validation(cmd: str, segments: list[str]) -> str:
     """Find the specific command segment that contains the given command."""
     for segment in segments:
@@ -243,8 +357,139 @@ def get_command_for_validation(cmd: str, segments: list[str]) -> str:
     return ""
 
 
-def _deny(reason: str) -> HookJSONOutput:
-    """Helper to create a deny response in the correct format."""
+def _evaluate_segments(
+    command: str,
+    allowed_commands: Set[str],
+    validators: Mapping[str, CommandValidator],
+) -> tuple[bool, str]:
+    """Check every segment of a command against an allowlist and validator map."""
+    segments = parse_command(command)
+
+    if not segments:
+        return False, f"Could not parse command: {command}"
+
+    for segment in segments:
+        cmd = segment.name
+        if cmd not in allowed_commands:
+            return False, f"Command '{cmd}' is not in the allowed list"
+
+        validator = validators.get(cmd)
+        if validator is not None:
+            allowed, reason = validator(segment)
+            if not allowed:
+                return False, reason
+
+    return True, ""
+
+
+def evaluate_command(command: str) -> tuple[bool, str]:
+    """
+    Evaluate a command string against the current security policy.
+
+    This is the uncached evaluation; use check_command() on hot paths.
+
+    Args:
+        command: The full command string to evaluate
+
+    Returns:
+        (allowed, reason) where reason explains a denial
+    """
+    return _evaluate_segments(command, ALLOWED_COMMANDS, COMMAND_VALIDATORS)
+
+
+@dataclass(frozen=True, eq=False)
+class SecurityPolicy:
+    """
+    Immutable Bash command policy with its own verdict cache.
+
+    Each policy snapshots its allowlist and validators at construction, so
+    sessions with different policies can share a process safely. Derive
+    variants with with_commands()/without_commands()/with_validator().
+    """
+
+    allowed_commands: frozenset[str]
+    validators: Mapping[str, CommandValidator] = field(default_factory=dict)
+    cache_size: int = VERDICT_CACHE_SIZE
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "allowed_commands", frozenset(self.allowed_commands))
+        object.__setattr__(self, "validators", MappingProxyType(dict(self.validators)))
+        object.__setattr__(self, "_cached_verdict", lru_cache(maxsize=self.cache_size)(self.evaluate))
+
+    def evaluate(self, command: str) -> tuple[bool, str]:
+        """Evaluate a command without consulting the cache."""
+        return _evaluate_segments(command, self.allowed_commands, self.validators)
+
+    def check(self, command: str) -> tuple[bool, str]:
+        """Evaluate a command, answering repeated commands from the LRU cache."""
+        return self._cached_verdict(command.strip())  # type: ignore[attr-defined, no-any-return]
+
+    def cache_info(self) -> dict[str, int]:
+        """Return hit/miss counters and occupancy of this policy's verdict cache."""
+        info = self._cached_verdict.cache_info()  # type: ignore[attr-defined]
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize or 0,
+        }
+
+    def with_commands(self, *commands: str) -> SecurityPolicy:
+        """Return a copy of this policy that also allows the given commands."""
+        return replace(self, allowed_commands=self.allowed_commands | set(commands))
+
+    def without_commands(self, *commands: str) -> SecurityPolicy:
+        """Return a copy of this policy that no longer allows the given commands."""
+        return replace(self, allowed_commands=self.allowed_commands - set(commands))
+
+    def with_validator(self, command: str, validator: CommandValidator) -> SecurityPolicy:
+        """Return a copy of this policy that allows and validates a command."""
+        return replace(
+            self,
+            allowed_commands=self.allowed_commands | {command},
+            validators={**self.validators, command: validator},
+        )
+
+
+def default_policy() -> SecurityPolicy:
+    """Return a SecurityPolicy snapshot of ALLOWED_COMMANDS and COMMAND_VALIDATORS."""
+    global _default_policy
+    policy = _default_policy
+    if policy is None:
+        policy = SecurityPolicy(frozenset(ALLOWED_COMMANDS), dict(COMMAND_VALIDATORS))
+        _default_policy = policy
+    return policy
+
+
+def check_command(command: str) -> tuple[bool, str]:
+    """
+    Evaluate a command string, answering repeated commands from an LRU cache.
+
+    Uses the default policy, which add_allowed_command()/remove_allowed_command()
+    rebuild. If you mutate ALLOWED_COMMANDS directly, call clear_verdict_cache()
+    afterwards.
+
+    Args:
+        command: The full command string to evaluate
+
+    Returns:
+        (allowed, reason) where reason explains a denial
+    """
+    return default_policy().check(command)
+
+
+def verdict_cache_info() -> dict[str, int]:
+    """Return hit/miss counters and occupancy of the default policy's verdict cache."""
+    return default_policy().cache_info()
+
+
+def clear_verdict_cache() -> None:
+    """Drop all cached verdicts (needed after mutating ALLOWED_COMMANDS in place)."""
+    _invalidate_default_policy()
+
+
+def deny_result(reason: str) -> HookJSONOutput:
+    """Create a PreToolUse deny response in the format the SDK expects."""
     return {
         "hookSpecificOutput": {
             "hookEventName": "PreToolUse",
@@ -254,6 +499,40 @@ def _deny(reason: str) -> HookJSONOutput:
     }
 
 
+def _bash_hook_result(
+    input_data: HookInput,
+    check: Callable[[str], tuple[bool, str]],
+    tool_use_id: str | None = None,
+    audit: AuditLog | None = None,
+) -> HookJSONOutput:
+    """Shared body of the Bash hooks: allow non-Bash/empty input, else check."""
+    if input_data.get("tool_name") != "Bash":
+        return {}
+
+    command = input_data.get("tool_input", {}).get("command", "")
+    if not command:
+        return {}
+
+    if audit is None:
+        allowed, reason = check(command)
+    else:
+        start = time.perf_counter_ns()
+        allowed, reason = check(command)
+        audit.record(
+            input_data.get("session_id"),
+            tool_use_id,
+            command,
+            allowed,
+            reason,
+            time.perf_counter_ns() - start,
+        )
+
+    if not allowed:
+        return deny_result(reason)
+
+    return {}
+
+
 async def bash_security_hook(
     input_data: HookInput,
     tool_use_id: str | None,
@@ -272,40 +551,33 @@ async def bash_security_hook(
     Returns:
         Empty dict to allow, or hookSpecificOutput with permissionDecision="deny" to block
     """
-    if input_data.get("tool_name") != "Bash":
-        return {}
+    return _bash_hook_result(input_data, check_command)
 
-    command = input_data.get("tool_input", {}).get("command", "")
-    if not command:
-        return {}
 
-    commands = extract_commands(command)
+def make_bash_security_hook(
+    policy: SecurityPolicy | None = None,
+    audit: AuditLog | None = None,
+) -> HookCallback:
+    """
+    Create a Bash PreToolUse hook bound to a specific policy.
 
-    if not commands:
-        return _deny(f"Could not parse command: {command}")
+    Args:
+        policy: Policy to enforce (default: the module-level policy)
+        audit: Optional audit log that receives every allow/deny decision
 
-    segments = split_command_segments(command)
+    Returns:
+        Async hook function suitable for HookMatcher(matcher="Bash")
+    """
+    if policy is None and audit is None:
+        return bash_security_hook
 
-    for cmd in commands:
-        if cmd not in ALLOWED_COMMANDS:
-            return _deny(f"Command '{cmd}' is not in the allowed list")
-
-        if cmd in COMMANDS_NEEDING_EXTRA_VALIDATION:
-            cmd_segment = get_command_for_validation(cmd, segments)
-            if not cmd_segment:
-                cmd_segment = command
-
-            if cmd == "pkill":
-                allowed, reason = validate_pkill_command(cmd_segment)
-                if not allowed:
-                    return _deny(reason)
-            elif cmd == "chmod":
-                allowed, reason = validate_chmod_command(cmd_segment)
-                if not allowed:
-                    return _deny(reason)
-            elif cmd == "init.sh":
-                allowed, reason = validate_init_script(cmd_segment)
-                if not allowed:
-                    return _deny(reason)
+    check = policy.check if policy is not None else check_command
 
-    return {}
+    async def policy_security_hook(
+        input_data: HookInput,
+        tool_use_id: str | None,
+        context: HookContext,
+    ) -> HookJSONOutput:
+        return _bash_hook_result(input_data, check, tool_use_id, audit)
+
+    return policy_security_hook
@@ -0,0 +1,194 @@
+"""
+Run State
+=========
+
+Single JSON file holding everything needed to resume a run: the history of
+session ids, the iteration counter, the last progress snapshot, budget
+usage and timestamps.
+
+Updates are applied in memory and written by flush(), so several changes
+made at the end of a session cost one durable write. Each write goes to a
+temporary file that is fsynced and then renamed over the state file, so a
+crash leaves either the previous state or the new one, never a torn file.
+
+A legacy claude_session.json is migrated on first load.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any
+
+
+RUN_STATE_FILE = "run_state.json"
+LEGACY_SESSION_FILE = "claude_session.json"
+
+# Oldest session ids are dropped beyond this many, to keep resume reads cheap
+MAX_SESSION_HISTORY = 1000
+
+# Usage older than this is dropped from the rate-limit window
+USAGE_WINDOW_SECONDS = 3600.0
+
+STATE_VERSION = 1
+
+
+@dataclass
+class RunState:
+    """Persisted state of an autonomous run."""
+
+    session_ids: list[str] = field(default_factory=list)
+    iteration: int = 0  # Sessions run so far, across restarts
+    passing: int = 0
+    total: int = 0
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = 0.0
+
+    # Usage counted against the run's budget; kept by --resume, reset otherwise
+    spent_cost_usd: float = 0.0
+    spent_tokens: int = 0
+    spent_sessions: int = 0
+    # [timestamp, cost_usd, tokens] per session of the last USAGE_WINDOW_SECONDS
+    usage_window: list[list[float]] = field(default_factory=list)
+
+    @property
+    def last_session_id(self) -> str | None:
+        return self.session_ids[-1] if self.session_ids else None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> RunState:
+        """Build a RunState from decoded JSON, ignoring unknown keys."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+
+class RunStateStore:
+    """Loads, updates and atomically persists a project's RunState."""
+
+    def __init__(self, project_dir: Path) -> None:
+        self.project_dir = project_dir
+        self.path = project_dir / RUN_STATE_FILE
+        self._state: RunState | None = None
+        self._dirty = False
+
+    @property
+    def state(self) -> RunState:
+        """The current state, read from disk on first access."""
+        if self._state is None:
+            self._state = self._load()
+        return self._state
+
+    def _load(self) -> RunState:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return RunState.from_dict(data)
+        except FileNotFoundError:
+            return self._migrate_legacy()
+        except (json.JSONDecodeError, OSError, TypeError) as e:
+            print(f"Warning: Could not read {RUN_STATE_FILE}: {e}")
+        return RunState()
+
+    def _migrate_legacy(self) -> RunState:
+        """Import the session id from claude_session.json, if present."""
+        state = RunState()
+        try:
+            with open(self.project_dir / LEGACY_SESSION_FILE) as f:
+                session_id = json.load(f).get("session_id")
+        except (json.JSONDecodeError, OSError, AttributeError):
+            return state
+        if isinstance(session_id, str) and session_id:
+            state.session_ids.append(session_id)
+            self._dirty = True
+        return state
+
+    def record_session(self, session_id: str) -> None:
+        """Append a session id to the history (in memory until flush)."""
+        ids = self.state.session_ids
+        if ids and ids[-1] == session_id:
+            return
+        ids.append(session_id)
+        del ids[:-MAX_SESSION_HISTORY]
+        self._dirty = True
+
+    def record_iteration(self) -> int:
+        """Advance the iteration counter and return its new value."""
+        self.state.iteration += 1
+        self._dirty = True
+        return self.state.iteration
+
+    def record_progress(self, passing: int, total: int) -> None:
+        """Store the latest progress snapshot."""
+        state = self.state
+        if (state.passing, state.total) != (passing, total):
+            state.passing, state.total = passing, total
+            self._dirty = True
+
+    def record_usage(self, cost_usd: float, tokens: int, now: float | None = None) -> None:
+        """Add a finished session's usage to the budget totals and the rate window."""
+        now = time.time() if now is None else now
+        state = self.state
+        state.spent_cost_usd += cost_usd
+        state.spent_tokens += tokens
+        state.spent_sessions += 1
+        state.usage_window = [
+            entry for entry in state.usage_window if entry[0] > now - USAGE_WINDOW_SECONDS
+        ]
+        state.usage_window.append([round(now, 3), cost_usd, tokens])
+        self._dirty = True
+
+    def reset_budget(self) -> None:
+        """Start a new budget; the rate window is kept, as it tracks the account."""
+        state = self.state
+        if state.spent_sessions or state.spent_cost_usd or state.spent_tokens:
+            state.spent_cost_usd = 0.0
+            state.spent_tokens = 0
+            state.spent_sessions = 0
+            self._dirty = True
+
+    def flush(self) -> None:
+        """Durably write pending changes, if any, with one fsync."""
+        if not self._dirty:
+            return
+        state = self.state
+        state.updated_at = time.time()
+        data = json.dumps({"version": STATE_VERSION, **asdict(state)}, indent=2)
+
+        try:
+            atomic_write(self.path, data)
+        except OSError as e:
+            print(f"Warning: Could not save run state: {e}")
+            return
+        self._dirty = False
+
+
+def atomic_write(path: Path, data: str) -> None:
+    """Replace path with data via an fsynced temporary file and rename."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    # Persist the rename itself
+    try:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return  # Directories cannot be opened on some platforms
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
@@ -0,0 +1,106 @@
+"""
+Loop Termination
+================
+
+Decides when the autonomous loop should stop on its own.
+
+- Completion: every feature in feature_list.json passes.
+- Stall: neither the passing count nor git HEAD has changed for K
+  consecutive coding sessions. What happens then is set by a stall policy:
+
+  - "stop": end the run
+  - "switch_prompt": add a recovery section to the coding prompt until
+    progress resumes; stop if it stalls again
+  - "escalate": like switch_prompt, and also switch to the escalation
+    model; stop if it stalls again
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+
+STALL_POLICIES = ("stop", "switch_prompt", "escalate")
+DEFAULT_STALL_ITERATIONS = 5
+DEFAULT_STALL_POLICY = "switch_prompt"
+
+
+async def git_head(project_dir: Path) -> str | None:
+    """Return the commit hash of HEAD, or None outside a repository or before the first commit."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "git", "rev-parse", "--verify", "--quiet", "HEAD",
+            cwd=project_dir,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError:  # git not installed
+        return None
+    stdout, _ = await process.communicate()
+    if process.returncode != 0:
+        return None
+    return stdout.decode().strip() or None
+
+
+class StallDetector:
+    """Counts consecutive sessions without progress and applies the stall policy."""
+
+    def __init__(
+        self,
+        iterations: int = DEFAULT_STALL_ITERATIONS,
+        policy: str = DEFAULT_STALL_POLICY,
+        escalation_model: str | None = None,
+    ) -> None:
+        """
+        Args:
+            iterations: Sessions without progress that count as a stall (0 disables)
+            policy: One of STALL_POLICIES
+            escalation_model: Model to switch to under the "escalate" policy
+        """
+        if policy not in STALL_POLICIES:
+            raise ValueError(f"Unknown stall policy {policy!r}, expected one of {STALL_POLICIES}")
+        if iterations < 0:
+            raise ValueError("iterations must not be negative")
+        self.iterations = iterations
+        self.policy = policy
+        self.escalation_model = escalation_model
+
+        self.recovering = False  # A stall was handled and progress has not resumed since
+        self._signature: tuple[int, str | None] | None = None
+        self._unchanged = 0
+
+    @property
+    def unchanged(self) -> int:
+        """Consecutive sessions after which passing count and HEAD were unchanged."""
+        return self._unchanged
+
+    def observe(self, passing: int, head: str | None) -> str | None:
+        """
+        Record the state after a coding session.
+
+        Args:
+            passing: Passing features after the session
+            head: git HEAD after the session
+
+        Returns:
+            None to carry on, "stop" to end the run, or "recover" when the
+            next sessions should use the recovery prompt (and escalation model)
+        """
+        signature = (passing, head)
+        if signature != self._signature:
+            if self._signature is not None:
+                self.recovering = False  # Progress
+            self._signature = signature
+            self._unchanged = 0
+            return None
+
+        self._unchanged += 1
+        if self.iterations == 0 or self._unchanged < self.iterations:
+            return None
+
+        self._unchanged = 0
+        if self.policy == "stop" or self.recovering:
+            return "stop"
+        self.recovering = True
+        return "recover"
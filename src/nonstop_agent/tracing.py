@@ -0,0 +1,217 @@
+"""
+Tool Call Tracing
+=================
+
+Times every tool call of a session by matching each ToolUseEvent to the
+ToolResultEvent with the same tool_use_id.
+
+Spans are appended to tool_trace.json in the Chrome trace event format,
+which chrome://tracing and https://ui.perfetto.dev load directly. The file
+uses the JSON array form without the closing bracket, which both viewers
+accept, so each span is a single append and the file stays loadable even
+after a crash. Each session is a span on lane 0; tool calls go on lanes
+1 and up, and concurrent calls get separate lanes. Gaps between tool spans
+are time spent waiting on the model.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .events import BlockedEvent, EventBus, ToolResultEvent, ToolUseEvent
+
+
+TOOL_TRACE_FILE = "tool_trace.json"
+SLOWEST_TOOLS_IN_SUMMARY = 5
+
+# Characters of tool input kept in a span as a readable hint
+_SUMMARY_CHARS = 80
+
+
+@dataclass(frozen=True)
+class ToolSpan:
+    """One finished (or abandoned) tool call."""
+
+    tool_use_id: str
+    tool: str
+    input_digest: str
+    summary: str
+    start: float  # Unix time
+    duration: float  # Seconds
+    status: str  # "ok", "error", "blocked" or "unfinished"
+
+
+def input_digest(tool_input: Any) -> str:
+    """Short stable digest of a tool input, for grouping identical calls."""
+    text = json.dumps(tool_input, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()[:12]
+
+
+def _input_summary(tool_input: Any) -> str:
+    if isinstance(tool_input, dict):
+        # The most telling field of the built-in tools
+        for key in ("command", "file_path", "pattern", "url", "path"):
+            if isinstance(tool_input.get(key), str):
+                return tool_input[key][:_SUMMARY_CHARS]
+    return str(tool_input)[:_SUMMARY_CHARS]
+
+
+class TraceWriter:
+    """Appends spans to a Chrome trace file; shared by every session of a run."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.pid = os.getpid()
+        self._busy_lanes: set[int] = set()
+        try:
+            new = not path.exists() or path.stat().st_size == 0
+            self._file = open(path, "a", encoding="utf-8")
+            if new:
+                self._file.write("[\n")
+        except OSError as e:
+            print(f"Warning: Could not open tool trace {path}: {e}")
+            self._file = None
+
+    def acquire_lane(self) -> int:
+        """Return the lowest tool lane no running call is using."""
+        lane = 1
+        while lane in self._busy_lanes:
+            lane += 1
+        self._busy_lanes.add(lane)
+        return lane
+
+    def release_lane(self, lane: int) -> None:
+        self._busy_lanes.discard(lane)
+
+    def write(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        duration: float,
+        lane: int,
+        args: dict[str, Any],
+    ) -> None:
+        """Append one complete ("X") event."""
+        if self._file is None:
+            return
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round(start * 1e6),
+            "dur": round(duration * 1e6),
+            "pid": self.pid,
+            "tid": lane,
+            "args": args,
+        }
+        try:
+            self._file.write(json.dumps(event) + ",\n")
+            self._file.flush()
+        except OSError as e:
+            print(f"Warning: Could not write tool trace: {e}")
+            self._file = None
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ToolTracer:
+    """Times the tool calls of one session."""
+
+    def __init__(
+        self,
+        writer: TraceWriter | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            writer: Trace file to append spans to (None to only collect them)
+            clock: Monotonic clock used for durations
+            wall_clock: Clock used for span start times in the trace
+        """
+        self.writer = writer
+        self._clock = clock
+        self._wall_offset = wall_clock() - clock()
+        self.started = clock()
+        self.spans: list[ToolSpan] = []
+        self._pending: dict[str, tuple[float, str, Any, int]] = {}  # id -> start, tool, input, lane
+
+    def attach(self, bus: EventBus) -> None:
+        """Trace the tool calls emitted on bus."""
+        bus.subscribe(ToolUseEvent, self._on_tool_use)
+        bus.subscribe(ToolResultEvent, self._on_tool_result)
+
+    def _on_tool_use(self, event: ToolUseEvent) -> None:
+        lane = self.writer.acquire_lane() if self.writer is not None else 0
+        self._pending[event.tool_use_id] = (self._clock(), event.name, event.input, lane)
+
+    def _on_tool_result(self, event: ToolResultEvent) -> None:
+        if event.tool_use_id not in self._pending:
+            return
+        if isinstance(event, BlockedEvent):
+            status = "blocked"
+        else:
+            status = "error" if event.is_error else "ok"
+        self._close_span(event.tool_use_id, status)
+
+    def _close_span(self, tool_use_id: str, status: str) -> None:
+        start, tool, tool_input, lane = self._pending.pop(tool_use_id)
+        span = ToolSpan(
+            tool_use_id=tool_use_id,
+            tool=tool,
+            input_digest=input_digest(tool_input),
+            summary=_input_summary(tool_input),
+            start=start + self._wall_offset,
+            duration=self._clock() - start,
+            status=status,
+        )
+        self.spans.append(span)
+        if self.writer is not None:
+            self.writer.release_lane(lane)
+            self.writer.write(span.tool, "tool", span.start, span.duration, lane, {
+                "tool_use_id": span.tool_use_id,
+                "input_digest": span.input_digest,
+                "input": span.summary,
+                "status": span.status,
+            })
+
+    def finish(self, label: str = "session") -> list[ToolSpan]:
+        """
+        End the session: close calls that never got a result and write the session span.
+
+        Returns:
+            All spans of the session, in completion order
+        """
+        for tool_use_id in list(self._pending):
+            self._close_span(tool_use_id, "unfinished")
+        if self.writer is not None:
+            tool_seconds = sum(span.duration for span in self.spans)
+            start = self.started + self._wall_offset
+            duration = self._clock() - self.started
+            self.writer.write(label, "session", start, duration, 0, {
+                "tool_calls": len(self.spans),
+                "tool_seconds": round(tool_seconds, 3),
+            })
+        return self.spans
+
+
+def print_slowest_tools(spans: list[ToolSpan], limit: int = SLOWEST_TOOLS_IN_SUMMARY) -> None:
+    """Print the slowest tool calls of a session and the total time spent in tools."""
+    if not spans:
+        return
+    total = sum(span.duration for span in spans)
+    print(f"\nTool time: {total:.1f}s over {len(spans)} calls. Slowest:")
+    for span in sorted(spans, key=lambda s: s.duration, reverse=True)[:limit]:
+        status = "" if span.status == "ok" else f"  [{span.status}]"
+        print(f"  {span.duration:>8.2f}s  {span.tool:<10} {span.summary}{status}")
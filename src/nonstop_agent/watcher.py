@@ -0,0 +1,218 @@
+"""
+Live Progress Watcher
+=====================
+
+Reports progress while a session is running, as soon as the agent writes
+feature_list.json, instead of only between sessions.
+
+On Linux the project directory is watched with inotify (through ctypes)
+and the descriptor is registered with the asyncio event loop, so no thread
+or timer runs while nothing changes. Elsewhere, or if inotify is
+unavailable, the file's stat signature is polled instead. Bursts of writes
+are debounced into one refresh, and the refresh reads the file through the
+cached incremental parser in a worker thread so a large list never stalls
+the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+from .features import FEATURE_LIST_FILE
+from .progress import count_passing_tests
+
+
+DEBOUNCE_SECONDS = 0.5
+POLL_INTERVAL_SECONDS = 2.0
+
+# inotify constants from <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_Q_OVERFLOW = 0x00004000
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def _open_inotify(directory: Path) -> int | None:
+    """Return a non-blocking inotify fd watching directory, or None if unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+
+    # Watching the directory also catches editors and tools that replace the
+    # file by renaming a temporary file over it.
+    if libc.inotify_add_watch(fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _read_event_names(fd: int) -> set[bytes] | None:
+    """Drain pending inotify events; returns file names, or None on queue overflow."""
+    names: set[bytes] = set()
+    while True:
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return names
+        if not data:
+            return names
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            if mask & _IN_Q_OVERFLOW:
+                return None
+            names.add(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+
+class ProgressWatcher:
+    """Watches feature_list.json and reports passing/total when it changes."""
+
+    def __init__(
+        self,
+        project_dir: Path,
+        on_change: ProgressCallback | None = None,
+        debounce: float = DEBOUNCE_SECONDS,
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+        use_inotify: bool = True,
+    ) -> None:
+        """
+        Args:
+            project_dir: Directory containing feature_list.json
+            on_change: Called with (passing, total) after each change
+            debounce: Seconds to wait for writes to settle before refreshing
+            poll_interval: Seconds between stat() checks when polling
+            use_inotify: Set False to force the polling fallback
+        """
+        self.project_dir = project_dir
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+
+        self.last_counts: tuple[int, int] | None = None
+        self._fd: int | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: asyncio.TimerHandle | None = None
+        self._poll_task: asyncio.Task[None] | None = None
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._dirty = False
+
+    @property
+    def mode(self) -> str:
+        """"inotify", "polling" or "stopped"."""
+        if self._fd is not None:
+            return "inotify"
+        return "polling" if self._poll_task is not None else "stopped"
+
+    def start(self) -> None:
+        """Start watching; must be called from a running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self.last_counts = count_passing_tests(self.project_dir)
+
+        fd = _open_inotify(self.project_dir) if self.use_inotify else None
+        if fd is not None:
+            try:
+                self._loop.add_reader(fd, self._on_readable)
+                self._fd = fd
+                return
+            except NotImplementedError:  # e.g. loops without add_reader support
+                os.close(fd)
+
+        self._poll_task = self._loop.create_task(self._poll())
+
+    async def stop(self) -> None:
+        """Stop watching and wait for an in-flight refresh."""
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        if self._fd is not None:
+            assert self._loop is not None
+            self._loop.remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        for task in (self._poll_task, self._refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._poll_task = self._refresh_task = None
+
+    async def __aenter__(self) -> ProgressWatcher:
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    def _on_readable(self) -> None:
+        assert self._fd is not None
+        names = _read_event_names(self._fd)
+        if names is None or FEATURE_LIST_FILE.encode() in names:
+            self._schedule()
+
+    async def _poll(self) -> None:
+        path = self.project_dir / FEATURE_LIST_FILE
+        signature = None
+        while True:
+            try:
+                st = os.stat(path)
+                current = (st.st_ino, st.st_mtime_ns, st.st_size)
+            except OSError:
+                current = None
+            if current != signature:
+                signature = current
+                self._schedule()
+            await asyncio.sleep(self.poll_interval)
+
+    def _schedule(self) -> None:
+        """Debounce: refresh once no change has been seen for `debounce` seconds."""
+        assert self._loop is not None
+        if self._pending is not None:
+            self._pending.cancel()
+        self._pending = self._loop.call_later(self.debounce, self._start_refresh)
+
+    def _start_refresh(self) -> None:
+        self._pending = None
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._dirty = True  # Refresh again when the current one finishes
+            return
+        assert self._loop is not None
+        self._refresh_task = self._loop.create_task(self._refresh())
+
+    async def _refresh(self) -> None:
+        while True:
+            self._dirty = False
+            counts = await asyncio.to_thread(count_passing_tests, self.project_dir)
+            if counts != self.last_counts:
+                self.last_counts = counts
+                self._report(*counts)
+            if not self._dirty:
+                return
+
+    def _report(self, passing: int, total: int) -> None:
+        if total > 0:
+            print(
+                f"\n[Progress] {passing}/{total} tests passing ({passing / total * 100:.1f}%)",
+                flush=True,
+            )
+        if self.on_change is not None:
+            self.on_change(passing, total)
@@ -19,7 +19,7 @@ import sys
 import tempfile
 from pathlib import Path
 from typing import AsyncIterator, Iterator
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -65,8 +65,20 @@ def mock_claude_sdk():
     mock_sdk.ToolResultBlock = type("ToolResultBlock", (), {})
     mock_sdk.ResultMessage = type("ResultMessage", (), {})
 
-    with patch.dict(sys.modules, {"claude_agent_sdk": mock_sdk}):
+    # Only the SDK entry is patched, so stdlib modules imported lazily during a
+    # test (e.g. concurrent.futures.process) stay loaded. Our own modules are
+    # dropped afterwards so the next test imports them against its own mock.
+    original_sdk = sys.modules.get("claude_agent_sdk")
+    sys.modules["claude_agent_sdk"] = mock_sdk
+    try:
         yield mock_sdk
+    finally:
+        for name in [n for n in sys.modules if n.split(".")[0] == "nonstop_agent"]:
+            del sys.modules[name]
+        if original_sdk is None:
+            sys.modules.pop("claude_agent_sdk", None)
+        else:
+            sys.modules["claude_agent_sdk"] = original_sdk
 
 
 # =============================================================================
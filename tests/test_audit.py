@@ -0,0 +1,96 @@
+"""
+Security Audit Log Tests
+========================
+
+Tests for buffered, rotating audit logging of Bash decisions.
+"""
+
+import json
+
+
+def _read_records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestAuditLog:
+    """Test queuing, flushing and rotation."""
+
+    async def test_hook_decisions_are_recorded(self, temp_project_dir, bash_hook_input):
+        from nonstop_agent.audit import AuditLog
+        from nonstop_agent.security import make_bash_security_hook
+
+        audit = AuditLog(temp_project_dir / "audit.jsonl")
+        hook = make_bash_security_hook(audit=audit)
+
+        await hook({**bash_hook_input("git status"), "session_id": "s1"}, "tool_1", None)
+        await hook(bash_hook_input("rm -rf /"), "tool_2", None)
+        assert not audit.path.exists()  # Nothing written on the hook path
+
+        await audit.aclose()
+        records = _read_records(audit.path)
+
+        assert [r["verdict"] for r in records] == ["allow", "deny"]
+        assert records[0]["session_id"] == "s1"
+        assert records[1]["tool_use_id"] == "tool_2"
+        assert "rm" in records[1]["reason"]
+        assert records[0]["eval_us"] >= 0
+
+    async def test_background_flush_on_batch_size(self, temp_project_dir):
+        import asyncio
+
+        from nonstop_agent.audit import AuditLog
+
+        audit = AuditLog(temp_project_dir / "audit.jsonl", flush_interval=60, batch_size=3)
+        for i in range(3):
+            audit.record(None, f"t{i}", "ls", True, "", 1000)
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if audit.path.exists():
+                break
+
+        assert len(_read_records(audit.path)) == 3
+        await audit.aclose()
+
+    async def test_rotation_bounds_file_size(self, temp_project_dir):
+        from nonstop_agent.audit import AuditLog
+
+        audit = AuditLog(temp_project_dir / "audit.jsonl", max_bytes=500, backup_count=2)
+        for batch in range(6):
+            for i in range(3):
+                audit.record(None, f"t{batch}-{i}", "git status", True, "", 1000)
+            await audit.flush()
+        await audit.aclose()
+
+        assert audit.path.stat().st_size <= 500
+        assert (temp_project_dir / "audit.jsonl.1").exists()
+        assert (temp_project_dir / "audit.jsonl.2").exists()
+        assert not (temp_project_dir / "audit.jsonl.3").exists()
+
+    async def test_aclose_waits_for_running_flush(self, temp_project_dir, monkeypatch):
+        import asyncio
+        import threading
+
+        from nonstop_agent.audit import AuditLog
+
+        audit = AuditLog(temp_project_dir / "audit.jsonl", flush_interval=60, batch_size=2)
+        started, release = threading.Event(), threading.Event()
+        write = audit._write
+
+        def slow_write(records):
+            started.set()
+            release.wait(5)
+            write(records)
+
+        monkeypatch.setattr(audit, "_write", slow_write)
+        audit.record(None, "t0", "ls", True, "", 1000)
+        audit.record(None, "t1", "ls", True, "", 1000)
+        await asyncio.to_thread(started.wait, 5)  # Background flush is mid-write
+
+        audit.record(None, "t2", "ls", True, "", 1000)
+        closing = asyncio.create_task(audit.aclose())
+        await asyncio.sleep(0.05)
+        assert not closing.done()  # Waits for the write rather than cancelling it
+        release.set()
+        await closing
+
+        assert [r["tool_use_id"] for r in _read_records(audit.path)] == ["t0", "t1", "t2"]
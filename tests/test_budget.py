@@ -0,0 +1,162 @@
+"""
+Budget Governor Tests
+=====================
+
+Tests for run budgets, hourly limits and their persistence in run state.
+"""
+
+
+def _state(cost=0.0, tokens=0, sessions=0, window=()):
+    from nonstop_agent.state import RunState
+
+    return RunState(
+        spent_cost_usd=cost, spent_tokens=tokens, spent_sessions=sessions,
+        usage_window=[list(entry) for entry in window],
+    )
+
+
+class TestRunBudget:
+    """Test stopping and downgrading before a session."""
+
+    def test_runs_within_budget(self):
+        from nonstop_agent.budget import BudgetGovernor
+
+        budget = BudgetGovernor(max_cost_usd=10.0)
+        assert budget.check("opus", _state()).action == "run"
+        assert budget.check("opus", _state(cost=6.0, sessions=3)).action == "run"
+
+    def test_stops_before_next_session_would_exceed(self):
+        from nonstop_agent.budget import BudgetGovernor
+
+        budget = BudgetGovernor(max_cost_usd=10.0)
+        decision = budget.check("opus", _state(cost=8.0, sessions=2))  # ~$4 per session
+
+        assert decision.action == "stop"
+        assert "cost budget" in decision.reason
+
+    def test_token_budget(self):
+        from nonstop_agent.budget import BudgetGovernor
+
+        budget = BudgetGovernor(max_tokens=1000)
+        assert budget.check("opus", _state(tokens=1000, sessions=1)).action == "stop"
+
+    def test_downgrades_to_fallback_model(self, capsys):
+        from nonstop_agent.budget import BudgetGovernor
+
+        budget = BudgetGovernor(max_cost_usd=10.0, fallback_model="haiku")
+        budget.observe("opus", 4.0, 0)
+        budget.observe("opus", 4.0, 0)
+
+        decision = budget.check("opus", _state(cost=8.0, sessions=2))
+        assert (decision.action, decision.model) == ("run", "haiku")
+        assert "switching to fallback model haiku" in capsys.readouterr().out
+
+        budget.observe("haiku", 0.5, 0)
+        assert budget.check("opus", _state(cost=8.5, sessions=3)).model == "haiku"
+        assert budget.check("opus", _state(cost=9.6, sessions=4)).action == "stop"
+
+    def test_running_sessions_are_reserved(self):
+        from nonstop_agent.budget import BudgetGovernor
+
+        budget = BudgetGovernor(max_cost_usd=10.0)
+        state = _state(cost=4.0, sessions=2)  # ~$2 per session
+
+        assert budget.check("opus", state, pending=2).action == "run"  # $4 + 3 x $2
+        assert budget.check("opus", state, pending=3).action == "stop"
+
+    def test_exhausted_budget_stops_even_with_fallback(self):
+        from nonstop_agent.budget import BudgetGovernor
+
+        budget = BudgetGovernor(max_cost_usd=10.0, fallback_model="haiku")
+        assert budget.check("opus", _state(cost=10.0, sessions=2)).action == "stop"
+
+
+class TestHourlyLimit:
+    """Test waiting on the rolling one-hour window."""
+
+    def test_waits_for_oldest_usage_to_age_out(self):
+        from nonstop_agent.budget import BudgetGovernor
+
+        now = 10_000.0
+        budget = BudgetGovernor(max_cost_per_hour=5.0, clock=lambda: now)
+        state = _state(cost=6.0, sessions=3, window=[
+            (now - 4000, 2.0, 0),  # Already outside the window
+            (now - 3000, 2.0, 0),
+            (now - 1000, 2.0, 0),
+        ])
+
+        decision = budget.check("opus", state)  # $4 in the window + ~$2 > $5
+
+        assert decision.action == "wait"
+        assert decision.wait_seconds == 600.0
+
+    def test_session_larger_than_limit_runs_once_window_is_empty(self):
+        from nonstop_agent.budget import BudgetGovernor
+
+        now = 10_000.0
+        budget = BudgetGovernor(max_tokens_per_hour=100, clock=lambda: now)
+        state = _state(tokens=500, sessions=1, window=[(now - 100, 0.0, 500)])
+
+        assert budget.check("opus", state).wait_seconds == 3500.0
+        state.usage_window.clear()
+        assert budget.check("opus", state).action == "run"
+
+
+class TestUsagePersistence:
+    """Test usage tracking in run state."""
+
+    def test_usage_survives_reload_and_reset_keeps_window(self, temp_project_dir):
+        from nonstop_agent.state import RunStateStore
+
+        store = RunStateStore(temp_project_dir)
+        store.record_usage(1.5, 1000, now=1000.0)
+        store.record_usage(0.5, 200, now=5000.0)  # First entry leaves the window
+        store.flush()
+
+        state = RunStateStore(temp_project_dir).state
+        assert (state.spent_cost_usd, state.spent_tokens, state.spent_sessions) == (2.0, 1200, 2)
+        assert state.usage_window == [[5000.0, 0.5, 200]]
+
+        store = RunStateStore(temp_project_dir)
+        store.reset_budget()
+        store.flush()
+        state = RunStateStore(temp_project_dir).state
+        assert (state.spent_cost_usd, state.spent_tokens, state.spent_sessions) == (0.0, 0, 0)
+        assert state.usage_window == [[5000.0, 0.5, 200]]
+
+
+class TestAgentLoopBudget:
+    """Test that the loop honours the budget across restarts."""
+
+    async def test_budget_stops_and_survives_resume(self, temp_project_with_features, monkeypatch):
+        from nonstop_agent import agent
+        from nonstop_agent.budget import BudgetGovernor
+        from nonstop_agent.termination import StallDetector
+
+        calls = []
+
+        async def fake_session(**kwargs):
+            calls.append(kwargs["model"])
+            kwargs["stats"].cost_usd = 1.0
+            return "continue", "", None
+
+        async def no_sleep(seconds):
+            pass
+
+        monkeypatch.setattr(agent, "run_agent_session", fake_session)
+        monkeypatch.setattr(agent.asyncio, "sleep", no_sleep)
+
+        async def run(resume):
+            await agent.run_autonomous_agent(
+                temp_project_with_features, "opus", max_iterations=10, resume=resume,
+                stall_detector=StallDetector(0), budget=BudgetGovernor(max_cost_usd=3.0),
+            )
+
+        await run(resume=False)
+        assert len(calls) == 3
+
+        await run(resume=True)  # Budget already spent
+        assert len(calls) == 3
+
+        await run(resume=False)  # Fresh budget
+        assert len(calls) == 6
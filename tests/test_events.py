@@ -0,0 +1,128 @@
+"""
+Session Event Tests
+===================
+
+Tests for typed session events, the observer bus and message translation.
+"""
+
+
+class TestEventBus:
+    """Test type-based dispatch."""
+
+    def test_subclass_dispatch_base_first(self):
+        from nonstop_agent.events import (
+            BlockedEvent, EventBus, SessionEvent, TextEvent, ToolResultEvent,
+        )
+
+        bus = EventBus()
+        seen = []
+        bus.subscribe(BlockedEvent, lambda e: seen.append("blocked"))
+        bus.subscribe(ToolResultEvent, lambda e: seen.append("result"))
+        bus.subscribe(SessionEvent, lambda e: seen.append("any"))
+
+        bus.emit(BlockedEvent("t1", "no"))
+        bus.emit(ToolResultEvent("t2", "ok"))
+        bus.emit(TextEvent("hi"))
+
+        assert seen == ["any", "result", "blocked", "any", "result", "any"]
+
+    def test_subscribe_after_emit_invalidates_cache(self):
+        from nonstop_agent.events import EventBus, TextEvent
+
+        bus = EventBus()
+        seen = []
+        bus.emit(TextEvent("a"))
+        handler = seen.append
+        bus.subscribe(TextEvent, handler)
+        bus.emit(TextEvent("b"))
+        bus.unsubscribe(TextEvent, handler)
+        bus.emit(TextEvent("c"))
+
+        assert seen == [TextEvent("b")]
+
+    def test_failing_observer_is_isolated(self, capsys):
+        from nonstop_agent.events import EventBus, TextEvent
+
+        bus = EventBus()
+        seen = []
+
+        def broken(event):
+            raise RuntimeError("boom")
+
+        bus.subscribe(TextEvent, broken)
+        bus.subscribe(TextEvent, seen.append)
+        bus.emit(TextEvent("x"))
+
+        assert seen == [TextEvent("x")]
+        assert "boom" in capsys.readouterr().err
+
+    def test_parent_receives_events(self):
+        from nonstop_agent.events import EventBus, TextEvent
+
+        parent = EventBus()
+        seen = []
+        parent.subscribe(TextEvent, lambda e: seen.append(("parent", e.text)))
+        child = EventBus(parent=parent)
+        child.subscribe(TextEvent, lambda e: seen.append(("child", e.text)))
+
+        child.emit(TextEvent("x"))
+
+        assert seen == [("child", "x"), ("parent", "x")]
+
+
+class TestRunAgentSessionEvents:
+    """Test that run_agent_session emits events to a caller's bus."""
+
+    async def test_events_and_stats(self, temp_project_dir, monkeypatch):
+        from nonstop_agent import agent
+        from nonstop_agent.events import (
+            BlockedEvent, EventBus, ResultEvent, SessionEvent, TextEvent, ToolUseEvent,
+        )
+        from nonstop_agent.metrics import SessionStats
+        from nonstop_agent.output import NullSink
+
+        def make(cls, **attrs):
+            obj = cls()
+            obj.__dict__.update(attrs)
+            return obj
+
+        class UserMessage:
+            def __init__(self, content):
+                self.content = content
+
+        messages = [
+            make(agent.AssistantMessage, content=[
+                make(agent.TextBlock, text="Hello"),
+                make(agent.ToolUseBlock, id="t1", name="Bash", input={"command": "rm -rf /"}),
+            ]),
+            UserMessage([make(agent.ToolResultBlock, tool_use_id="t1", content="Command blocked")]),
+            make(agent.ResultMessage, session_id="s-1", total_cost_usd=0.25, num_turns=3, duration_ms=900),
+        ]
+
+        async def fake_query(prompt, options):
+            for msg in messages:
+                yield msg
+
+        monkeypatch.setattr(agent, "query", fake_query)
+        monkeypatch.setattr(agent, "create_options", lambda **kwargs: None)
+
+        bus = EventBus()
+        seen = []
+        bus.subscribe(SessionEvent, seen.append)
+        stats = SessionStats()
+
+        status, text, session_id = await agent.run_agent_session(
+            "prompt", temp_project_dir, "test-model",
+            stats=stats, sink=NullSink(), events=bus,
+        )
+
+        assert status == "continue"
+        assert text == "Hello"
+        assert session_id == "s-1"
+        assert seen == [
+            TextEvent("Hello"),
+            ToolUseEvent("t1", "Bash", {"command": "rm -rf /"}),
+            BlockedEvent("t1", "Command blocked"),
+            ResultEvent("s-1", 0.25, 3, 900, None),
+        ]
+        assert (stats.cost_usd, stats.num_turns, stats.duration_ms) == (0.25, 3, 900)
@@ -0,0 +1,107 @@
+"""
+Feature Index Tests
+===================
+
+Tests for the SQLite mirror of feature_list.json.
+"""
+
+import json
+import os
+
+
+def _write(path, features):
+    path.write_text(json.dumps(features, indent=2))
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+class TestFeatureDB:
+    """Test syncing and queries."""
+
+    def test_sync_and_queries(self, temp_project_with_features):
+        from nonstop_agent.feature_db import FeatureDB
+
+        with FeatureDB(temp_project_with_features) as db:
+            assert db.sync()
+            assert db.counts() == (2, 4)
+            assert db.count_by_category() == {
+                "functional": (1, 2),
+                "style": (1, 1),
+                "bugfix": (0, 1),
+            }
+
+            rows = db.next_failing(limit=5)
+            assert [r.index for r in rows] == [1, 3]
+            assert rows[0].description == "Test 2"
+            assert rows[0].feature()["steps"] == ["Step 1"]
+            assert [r.index for r in db.next_failing(category="bugfix")] == [3]
+
+    def test_incremental_sync_tags_changed_rows(self, temp_project_with_features):
+        from nonstop_agent.feature_db import FeatureDB
+
+        path = temp_project_with_features / "feature_list.json"
+        with FeatureDB(temp_project_with_features) as db:
+            db.sync()
+            assert db.start_session() == 1
+
+            features = json.loads(path.read_text())
+            features[1]["passes"] = True
+            features.append({"category": "style", "description": "New", "steps": [], "passes": False})
+            _write(path, features)
+            db.sync()
+
+            assert db.counts() == (3, 5)
+            assert [r.index for r in db.touched_in_last(1)] == [1, 4]
+            assert db.count_touched_in_last(1) == 2
+
+            db.start_session()
+            assert db.touched_in_last(1) == []
+            assert db.count_touched_in_last(2) == 2
+
+    def test_shrinking_and_invalid_files(self, temp_project_with_features):
+        from nonstop_agent.feature_db import FeatureDB
+
+        path = temp_project_with_features / "feature_list.json"
+        with FeatureDB(temp_project_with_features) as db:
+            db.sync()
+            _write(path, json.loads(path.read_text())[:2])
+            assert db.sync()
+            assert db.counts() == (1, 2)
+
+            path.write_text('[{"passes": true},')
+            assert not db.sync()
+            assert db.counts() == (1, 2)
+
+    def test_index_persists_across_connections(self, temp_project_with_features):
+        from nonstop_agent.feature_db import FeatureDB
+
+        with FeatureDB(temp_project_with_features) as db:
+            db.sync()
+            db.start_session()
+
+        with FeatureDB(temp_project_with_features) as db:
+            assert db.session == 1
+            assert db.counts() == (2, 4)
+
+
+class TestProgressWithIndex:
+    """Test that progress helpers use the index when given one."""
+
+    def test_count_passing_tests(self, temp_project_with_features):
+        from nonstop_agent.feature_db import FeatureDB
+        from nonstop_agent.progress import count_passing_tests
+
+        with FeatureDB(temp_project_with_features) as db:
+            assert count_passing_tests(temp_project_with_features, db) == (2, 4)
+
+    def test_format_next_features(self, temp_project_with_features):
+        from nonstop_agent.feature_db import FeatureDB
+        from nonstop_agent.prompts import format_next_features
+
+        with FeatureDB(temp_project_with_features) as db:
+            db.sync()
+            section = format_next_features(db.next_failing(limit=2))
+
+        assert "#1 [functional] Test 2" in section
+        assert "#3 [bugfix] Test 4" in section
+        assert format_next_features([]) == ""
@@ -0,0 +1,152 @@
+"""
+Feature List Index Tests
+========================
+
+Tests for streaming, cached and incremental parsing of feature_list.json.
+"""
+
+import json
+import os
+
+import pytest
+
+
+def _write_features(path, passes):
+    features = [
+        {"category": "functional", "description": f"Feature {i}", "steps": ["Step 1"], "passes": p}
+        for i, p in enumerate(passes)
+    ]
+    path.write_text(json.dumps(features, indent=2))
+
+
+class TestFeatureIndex:
+    """Test parsing and the index API."""
+
+    def test_count_passing_tests(self, temp_project_with_features):
+        from nonstop_agent.progress import count_passing_tests
+
+        assert count_passing_tests(temp_project_with_features) == (2, 4)
+
+    def test_index_queries(self, temp_project_with_features):
+        from nonstop_agent.features import load_feature_index
+
+        index = load_feature_index(temp_project_with_features)
+
+        assert [r.index for r in index.failing()] == [1, 3]
+        assert index.by_category() == {"functional": (1, 2), "style": (1, 1), "bugfix": (0, 1)}
+
+    def test_missing_and_invalid_files(self, temp_project_dir):
+        from nonstop_agent.progress import count_passing_tests
+
+        assert count_passing_tests(temp_project_dir) == (0, 0)
+        (temp_project_dir / "feature_list.json").write_text('[{"passes": true},')
+        assert count_passing_tests(temp_project_dir) == (0, 0)
+        (temp_project_dir / "feature_list.json").write_text('{"passes": true}')
+        assert count_passing_tests(temp_project_dir) == (0, 0)
+
+
+class TestFeatureListCache:
+    """Test change detection and incremental re-parsing."""
+
+    def test_unchanged_file_is_not_reread(self, temp_project_dir, monkeypatch):
+        from nonstop_agent import features
+
+        path = temp_project_dir / "feature_list.json"
+        _write_features(path, [True, False])
+        cache = features.FeatureListCache(path)
+        first = cache.load()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("file should not be parsed again")
+
+        monkeypatch.setattr(features, "iter_elements", fail)
+        assert cache.load() is first
+
+    def test_appended_file_reuses_prefix(self, temp_project_dir, monkeypatch):
+        from nonstop_agent import features
+
+        path = temp_project_dir / "feature_list.json"
+        _write_features(path, [True, False, True])
+        cache = features.FeatureListCache(path)
+        cache.load()
+
+        parsed = []
+        original = features.feature_fields
+        monkeypatch.setattr(
+            features, "feature_fields", lambda f: parsed.append(f["description"]) or original(f)
+        )
+        _write_features(path, [True, False, True, False, True])
+        index = cache.load()
+
+        assert parsed == ["Feature 3", "Feature 4"]
+        assert (index.passing, index.total) == (3, 5)
+
+    def test_modified_prefix_triggers_full_parse(self, temp_project_dir):
+        from nonstop_agent.features import FeatureListCache
+
+        path = temp_project_dir / "feature_list.json"
+        _write_features(path, [False, False])
+        cache = FeatureListCache(path)
+        assert cache.load().passing == 0
+
+        _write_features(path, [True, False, False])
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        index = cache.load()
+
+        assert (index.passing, index.total) == (1, 3)
+
+
+class TestStreamingReader:
+    """Test chunked streaming of the feature array."""
+
+    def test_records_match_json_load(self, temp_project_dir):
+        from nonstop_agent.features import iter_feature_records
+
+        path = temp_project_dir / "feature_list.json"
+        features = [
+            {"category": f"cat-{i % 3}", "description": "é" * i, "steps": ["s"] * i, "passes": i % 2 == 0}
+            for i in range(50)
+        ]
+        path.write_text(json.dumps(features, ensure_ascii=False))
+
+        records = list(iter_feature_records(path, chunk_size=7))
+
+        assert [(r.index, r.category, r.passes) for r in records] == [
+            (i, f["category"], f["passes"]) for i, f in enumerate(features)
+        ]
+
+    def test_numbers_split_across_chunks(self, temp_project_dir):
+        from nonstop_agent.features import iter_elements
+
+        path = temp_project_dir / "feature_list.json"
+        path.write_text("[12345, 678 ]  ")
+
+        with open(path, "rb") as f:
+            assert [e for e, _ in iter_elements(f, chunk_size=3)] == [12345, 678]
+
+    def test_malformed_arrays_raise(self, temp_project_dir):
+        from nonstop_agent.features import iter_feature_records
+
+        path = temp_project_dir / "feature_list.json"
+        for text in ['[{"passes": true},', '[{"passes": true},]', "[1 2]", "[1] x", "{}"]:
+            path.write_text(text)
+            with pytest.raises(ValueError):
+                list(iter_feature_records(path, chunk_size=2))
+
+    def test_small_chunks_reuse_non_ascii_prefix(self, temp_project_dir):
+        from nonstop_agent.features import FeatureListCache
+
+        path = temp_project_dir / "feature_list.json"
+        entries = [{"category": "ü" * (i + 1), "passes": True} for i in range(3)]
+        path.write_text(json.dumps(entries, ensure_ascii=False))
+        cache = FeatureListCache(path, chunk_size=5)
+        cache.load()
+
+        entries.append({"category": "ß", "passes": False})
+        path.write_text(json.dumps(entries, ensure_ascii=False))
+        index = cache.load()
+
+        assert (index.passing, index.total) == (3, 4)
+        assert index.by_category()["ß"] == (0, 1)
+        assert cache._prefix_len == len(json.dumps(entries, ensure_ascii=False)[:-1].encode())
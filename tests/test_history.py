@@ -0,0 +1,84 @@
+"""
+Progress History Tests
+======================
+
+Tests for the progress time series and throughput/ETA reporting.
+"""
+
+
+class TestProgressHistory:
+    """Test appending, reloading and rate computation."""
+
+    def test_rate_from_first_and_last_samples(self, temp_project_dir):
+        from nonstop_agent.history import ProgressHistory
+
+        history = ProgressHistory(temp_project_dir)
+        assert history.rate() is None
+
+        history.append(0, 2, 20)
+        history.append(1, 5, 20, cost_usd=1.5, wall_seconds=1800)
+        history.append(2, 8, 20, cost_usd=1.5, wall_seconds=1800)
+
+        rate = history.rate()
+        assert rate.features_per_hour == 6.0
+        assert rate.cost_per_feature == 0.5
+        assert rate.eta_hours == 2.0
+        assert rate.remaining == 12
+
+    def test_reload_reads_only_the_ends(self, temp_project_dir):
+        from nonstop_agent.history import ProgressHistory
+
+        history = ProgressHistory(temp_project_dir)
+        for i in range(200):
+            history.append(i, i, 500, cost_usd=0.25, wall_seconds=60)
+
+        reloaded = ProgressHistory(temp_project_dir)
+
+        assert reloaded.first == history.first
+        assert reloaded.last == history.last
+        assert reloaded.last.total_cost_usd == 50.0
+        assert len(list(reloaded)) == 200
+
+    def test_torn_last_row_is_skipped(self, temp_project_dir):
+        from nonstop_agent.history import ProgressHistory
+
+        history = ProgressHistory(temp_project_dir)
+        history.append(0, 0, 10)
+        history.append(1, 4, 10, cost_usd=2.0, wall_seconds=3600)
+        with open(history.path, "a") as f:
+            f.write("1712345678.0,2,")
+
+        reloaded = ProgressHistory(temp_project_dir)
+        assert reloaded.last.passing == 4
+
+        reloaded.append(2, 6, 10, cost_usd=1.0, wall_seconds=3600)
+        assert [s.passing for s in ProgressHistory(temp_project_dir)] == [0, 4, 6]
+
+    def test_no_progress_has_no_eta(self, temp_project_dir):
+        from nonstop_agent.history import ProgressHistory, format_rate
+
+        history = ProgressHistory(temp_project_dir)
+        history.append(0, 3, 10)
+        history.append(1, 3, 10, cost_usd=1.0, wall_seconds=600)
+
+        rate = history.rate()
+        assert (rate.features_per_hour, rate.cost_per_feature, rate.eta_hours) == (None, None, None)
+        assert format_rate(rate) == ""
+
+
+class TestProgressSummary:
+    """Test throughput output in print_progress_summary."""
+
+    def test_summary_includes_throughput(self, temp_project_with_features, capsys):
+        from nonstop_agent.history import ProgressHistory
+        from nonstop_agent.progress import print_progress_summary
+
+        history = ProgressHistory(temp_project_with_features)
+        history.append(0, 0, 4)
+        history.append(1, 2, 4, cost_usd=3.0, wall_seconds=3600)
+
+        print_progress_summary(temp_project_with_features, history=history)
+
+        output = capsys.readouterr().out
+        assert "2/4 tests passing" in output
+        assert "2.0 features/hour | $1.50/feature | ETA 1.0h (2 remaining)" in output
@@ -0,0 +1,107 @@
+"""
+Session Metrics Tests
+=====================
+
+Tests for collecting per-session figures and exporting them.
+"""
+
+import json
+
+
+def _stats(**figures):
+    from nonstop_agent.metrics import SessionStats
+
+    return SessionStats(**figures)
+
+
+class TestSessionStats:
+    """Test collection from session events."""
+
+    def test_collects_from_events(self):
+        from nonstop_agent.events import BlockedEvent, EventBus, ResultEvent, ToolResultEvent, ToolUseEvent
+        from nonstop_agent.metrics import SessionStats
+
+        bus = EventBus()
+        stats = SessionStats()
+        stats.attach(bus)
+
+        bus.emit(ToolUseEvent("t1", "Bash", {}))
+        bus.emit(ToolUseEvent("t2", "Bash", {}))
+        bus.emit(ToolUseEvent("t3", "Read", {}))
+        bus.emit(BlockedEvent("t1", "blocked"))
+        bus.emit(ToolResultEvent("t2", "ok"))
+        bus.emit(ResultEvent(
+            "s", cost_usd=0.5, num_turns=7, duration_ms=1200,
+            usage={"input_tokens": 100, "output_tokens": 40, "cache_read_input_tokens": 900},
+        ))
+
+        assert stats.tool_calls == {"Bash": 2, "Read": 1}
+        assert stats.blocked == 1
+        assert (stats.cost_usd, stats.num_turns, stats.duration_ms) == (0.5, 7, 1200)
+        assert (stats.input_tokens, stats.output_tokens) == (100, 40)
+        assert stats.cache_read_input_tokens == 900
+        assert stats.cache_creation_input_tokens == 0
+
+
+class TestMetricsExporter:
+    """Test JSONL and Prometheus textfile output."""
+
+    def test_writes_jsonl_and_prometheus(self, temp_project_dir):
+        from nonstop_agent.metrics import METRICS_JSONL_FILE, METRICS_PROM_FILE, MetricsExporter
+
+        exporter = MetricsExporter(temp_project_dir)
+        exporter.record(1, "continue", _stats(
+            cost_usd=0.25, num_turns=3, wall_seconds=10.0, input_tokens=100,
+            tool_calls={"Bash": 2}, blocked=1,
+        ), 2, 10)
+        exporter.record(2, "error", _stats(cost_usd=0.75, tool_calls={"Bash": 1, "Edit": 1}), 3, 10)
+
+        records = [json.loads(line) for line in (temp_project_dir / METRICS_JSONL_FILE).read_text().splitlines()]
+        assert [r["iteration"] for r in records] == [1, 2]
+        assert records[0]["tool_calls"] == {"Bash": 2}
+        assert records[1]["status"] == "error"
+
+        prom = (temp_project_dir / METRICS_PROM_FILE).read_text()
+        project = temp_project_dir.resolve().name
+        assert f'nonstop_agent_sessions_total{{project="{project}"}} 2' in prom
+        assert f'nonstop_agent_session_errors_total{{project="{project}"}} 1' in prom
+        assert f'nonstop_agent_cost_usd_total{{project="{project}"}} 1\n' in prom
+        assert f'nonstop_agent_tool_calls_total{{project="{project}",tool="Bash"}} 3' in prom
+        assert f'nonstop_agent_tokens_total{{project="{project}",type="input"}} 100' in prom
+        assert f'nonstop_agent_blocked_commands_total{{project="{project}"}} 1' in prom
+        assert f'nonstop_agent_features_passing{{project="{project}"}} 3' in prom
+        assert "# TYPE nonstop_agent_tool_calls_total counter" in prom
+
+    def test_totals_survive_restart(self, temp_project_dir):
+        from nonstop_agent.metrics import METRICS_JSONL_FILE, MetricsExporter
+
+        MetricsExporter(temp_project_dir).record(1, "continue", _stats(cost_usd=1.0), 1, 2)
+        with open(temp_project_dir / METRICS_JSONL_FILE, "a") as f:
+            f.write('{"torn": ')  # Crash mid-append
+
+        exporter = MetricsExporter(temp_project_dir)
+        assert exporter.totals.sessions == 1
+        assert exporter.totals.cost_usd == 1.0
+
+    def test_label_values_are_escaped(self, temp_project_dir):
+        from nonstop_agent.metrics import MetricsExporter
+
+        exporter = MetricsExporter(temp_project_dir)
+        record = exporter.record(1, "continue", _stats(tool_calls={'mcp"x\\y': 1}), 0, 0)
+
+        assert 'tool="mcp\\"x\\\\y"' in exporter.render(record)
+
+    def test_samples_keep_full_precision(self, temp_project_dir, monkeypatch):
+        from nonstop_agent import metrics
+
+        monkeypatch.setattr(metrics.time, "time", lambda: 1792341234.567)
+        exporter = metrics.MetricsExporter(temp_project_dir)
+        record = exporter.record(1, "continue", _stats(
+            cost_usd=12.3456789, input_tokens=12_345_678,
+        ), 0, 0)
+        prom = exporter.render(record)
+
+        project = temp_project_dir.resolve().name
+        assert f'last_session_timestamp_seconds{{project="{project}"}} 1792341234.567\n' in prom
+        assert f'tokens_total{{project="{project}",type="input"}} 12345678\n' in prom
+        assert f'cost_usd_total{{project="{project}"}} 12.3456789\n' in prom
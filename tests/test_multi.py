@@ -0,0 +1,166 @@
+"""
+Multi-Project Runner Tests
+==========================
+
+Tests for run_many: config loading, bounded concurrency and output routing.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+
+RUN_CONFIG_TOML = """
+max_concurrency = 2
+
+[defaults]
+max_iterations = 3
+model = "test-model"
+max_cost_per_hour = 2.5
+
+[[projects]]
+project_dir = "alpha"
+
+[[projects]]
+project_dir = "beta"
+name = "b"
+log_file = "logs/beta.log"
+max_cost_usd = 5.0
+"""
+
+
+def _fake_agent(active, peak, fail=()):
+    """Stand-in for run_autonomous_agent that runs sessions through session_slots."""
+
+    async def run(project_dir, max_iterations, session_slots, **kwargs):
+        if project_dir.name in fail:
+            raise RuntimeError("boom")
+        project_dir.mkdir(parents=True, exist_ok=True)
+        for i in range(max_iterations):
+            async with session_slots:
+                active.append(project_dir.name)
+                peak[0] = max(peak[0], len(active))
+                print(f"session {i} of {project_dir.name}")
+                await asyncio.sleep(0.01)
+                active.remove(project_dir.name)
+        features = [{"passes": True}, {"passes": False}]
+        (project_dir / "feature_list.json").write_text(json.dumps(features))
+
+    return run
+
+
+class TestRunConfig:
+    """Test loading multi-project configs."""
+
+    def test_load_toml_config(self, temp_project_dir):
+        from nonstop_agent.multi import load_run_config
+
+        path = temp_project_dir / "projects.toml"
+        path.write_text(RUN_CONFIG_TOML)
+
+        configs, max_concurrency = load_run_config(path)
+
+        assert max_concurrency == 2
+        assert [c.name for c in configs] == ["alpha", "b"]
+        assert configs[0].project_dir == temp_project_dir / "alpha"
+        assert configs[1].log_file == temp_project_dir / "logs" / "beta.log"
+        assert all(c.max_iterations == 3 and c.model == "test-model" for c in configs)
+        assert [(c.max_cost_usd, c.max_cost_per_hour) for c in configs] == [
+            (None, 2.5), (5.0, 2.5),
+        ]
+
+    @pytest.mark.parametrize("data", [
+        {"projects": []},
+        {"projects": [{"name": "x"}]},
+        {"projects": [{"project_dir": "a", "colour": "red"}]},
+        {"projects": [{"project_dir": "a"}, {"project_dir": "other/a"}]},
+    ])
+    def test_invalid_configs(self, temp_project_dir, data):
+        from nonstop_agent.multi import load_run_config
+
+        path = temp_project_dir / "projects.json"
+        path.write_text(json.dumps(data))
+
+        with pytest.raises(ValueError):
+            load_run_config(path)
+
+
+class TestRunMany:
+    """Test concurrent execution and per-project output."""
+
+    async def test_concurrency_is_bounded(self, temp_project_dir, monkeypatch, capsys):
+        from nonstop_agent import multi
+        from nonstop_agent.multi import ProjectConfig, run_many
+        from nonstop_agent.routing import RoutedStdout
+
+        active, peak = [], [0]
+        monkeypatch.setattr(multi, "run_autonomous_agent", _fake_agent(active, peak))
+        configs = [
+            ProjectConfig(temp_project_dir / name, max_iterations=2) for name in "abcde"
+        ]
+
+        results = await run_many(configs, max_concurrency=2)
+
+        assert peak[0] == 2
+        assert [(r.name, r.passing, r.total, r.error) for r in results] == [
+            (name, 1, 2, "") for name in "abcde"
+        ]
+        output = capsys.readouterr().out
+        assert "[c] session 1 of c\n" in output
+        assert sys.stdout is not None and not isinstance(sys.stdout, RoutedStdout)
+
+    async def test_log_files_and_errors(self, temp_project_dir, monkeypatch, capsys):
+        from nonstop_agent import multi
+        from nonstop_agent.multi import ProjectConfig, run_many
+
+        monkeypatch.setattr(multi, "run_autonomous_agent", _fake_agent([], [0], fail={"bad"}))
+        log_file = temp_project_dir / "logs" / "good.log"
+        configs = [
+            ProjectConfig(temp_project_dir / "good", max_iterations=1, log_file=log_file),
+            ProjectConfig(temp_project_dir / "bad", max_iterations=1),
+        ]
+
+        results = await run_many(configs)
+
+        assert log_file.read_text() == "session 0 of good\n"
+        assert results[1].error == "boom"
+        output = capsys.readouterr().out
+        assert "good" not in output
+        assert "[bad] Fatal error: boom" in output
+
+    async def test_budget_per_project(self, temp_project_dir, monkeypatch):
+        from nonstop_agent import multi
+        from nonstop_agent.multi import ProjectConfig, run_many
+
+        budgets = {}
+
+        async def fake_agent(project_dir, budget, **kwargs):
+            budgets[project_dir.name] = budget
+
+        monkeypatch.setattr(multi, "run_autonomous_agent", fake_agent)
+        configs = [
+            ProjectConfig(temp_project_dir / "a", max_cost_usd=5.0, fallback_model="small"),
+            ProjectConfig(temp_project_dir / "b", max_tokens_per_hour=1000),
+        ]
+
+        await run_many(configs)
+
+        assert (budgets["a"].max_cost_usd, budgets["a"].fallback_model) == (5.0, "small")
+        assert budgets["b"].max_tokens_per_hour == 1000
+        assert budgets["a"] is not budgets["b"]
+
+    def test_combined_summary(self, capsys):
+        from nonstop_agent.multi import ProjectResult, print_combined_summary
+
+        print_combined_summary([
+            ProjectResult("alpha", 3, 4, 2),
+            ProjectResult("beta", 0, 0, 1, error="boom"),
+        ])
+
+        output = capsys.readouterr().out
+        assert "alpha" in output and "75.0" in output
+        assert "error: boom" in output
+        assert "3/4" in output.splitlines()[-1]
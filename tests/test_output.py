@@ -0,0 +1,144 @@
+"""
+Session Output Tests
+====================
+
+Tests for output sinks and batched, queued rendering.
+"""
+
+import asyncio
+import json
+import threading
+
+
+class RecordingSink:
+    """Sink that remembers each batch and the thread it was written from."""
+
+    def __init__(self):
+        self.batches = []
+        self.threads = set()
+
+    def write_batch(self, records):
+        self.batches.append(list(records))
+        self.threads.add(threading.get_ident())
+
+    def close(self):
+        pass
+
+
+class TestSinks:
+    """Test rendering by each sink."""
+
+    def test_console_rendering(self, capsys):
+        from nonstop_agent.output import ConsoleSink, OutputRecord
+
+        ConsoleSink().write_batch([
+            OutputRecord("text", "Hello"),
+            OutputRecord("tool_use", "Bash", "x" * 300),
+            OutputRecord("blocked", "rm blocked"),
+            OutputRecord("error", "oops"),
+            OutputRecord("done"),
+            OutputRecord("info", "Session cost: $0.1000"),
+        ])
+
+        out = capsys.readouterr().out
+        assert out.startswith("Hello\n[Tool: Bash]\n   Input: " + "x" * 200 + "...\n")
+        assert "   [BLOCKED] rm blocked\n   [Error] oops\n   [Done]\n" in out
+        assert out.endswith("Session cost: $0.1000\n")
+
+    def test_jsonl_sink(self, temp_project_dir):
+        from nonstop_agent.output import JsonlSink, OutputRecord
+
+        path = temp_project_dir / "out" / "session.jsonl"
+        sink = JsonlSink(path)
+        sink.write_batch([OutputRecord("text", "hi"), OutputRecord("tool_use", "Read", "{}")])
+        sink.close()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [(r["kind"], r["text"], r["detail"]) for r in lines] == [
+            ("text", "hi", ""), ("tool_use", "Read", "{}"),
+        ]
+
+    def test_tee_sink(self):
+        from nonstop_agent.output import OutputRecord, TeeSink
+
+        a, b = RecordingSink(), RecordingSink()
+        TeeSink(a, b).write_batch([OutputRecord("done")])
+
+        assert a.batches == b.batches == [[OutputRecord("done")]]
+
+
+class TestSessionOutput:
+    """Test queueing and batched flushing."""
+
+    async def test_records_are_batched_off_the_loop_thread(self):
+        from nonstop_agent.output import SessionOutput
+
+        sink = RecordingSink()
+        output = SessionOutput(sink)
+        output.start()
+        for i in range(100):
+            output.emit("text", str(i))
+        await output.aclose()
+
+        records = [r.text for batch in sink.batches for r in batch]
+        assert records == [str(i) for i in range(100)]
+        assert len(sink.batches) < 100
+        assert threading.get_ident() not in sink.threads
+
+    async def test_batch_size_is_bounded(self, monkeypatch):
+        from nonstop_agent import output as output_module
+
+        monkeypatch.setattr(output_module, "MAX_BATCH_SIZE", 10)
+        sink = RecordingSink()
+        output = output_module.SessionOutput(sink)
+        output.start()
+        for i in range(25):
+            output.emit("text", str(i))
+        await output.aclose()
+
+        assert [len(batch) for batch in sink.batches] == [10, 10, 5]
+
+    async def test_null_sink_queues_nothing(self):
+        from nonstop_agent.output import NullSink, SessionOutput
+
+        output = SessionOutput(NullSink())
+        output.start()
+        output.emit("text", "ignored")
+
+        assert output._queue.empty()
+        await output.aclose()
+
+    async def test_emit_does_not_wait_for_slow_sink(self):
+        from nonstop_agent.output import SessionOutput
+
+        release = threading.Event()
+
+        class SlowSink(RecordingSink):
+            def write_batch(self, records):
+                release.wait(5)
+                super().write_batch(records)
+
+        sink = SlowSink()
+        output = SessionOutput(sink)
+        output.start()
+        output.emit("text", "first")
+        await asyncio.sleep(0.01)  # The drain task is now stuck in the sink
+        output.emit("text", "second")  # Returns immediately
+        release.set()
+        await output.aclose()
+
+        assert [r.text for batch in sink.batches for r in batch] == ["first", "second"]
+
+    async def test_sink_errors_disable_output(self, capsys):
+        from nonstop_agent.output import SessionOutput
+
+        class BrokenSink(RecordingSink):
+            def write_batch(self, records):
+                raise OSError("broken pipe")
+
+        output = SessionOutput(BrokenSink())
+        output.start()
+        output.emit("text", "lost")
+        await output.aclose()
+
+        assert "Session output disabled" in capsys.readouterr().err
@@ -0,0 +1,278 @@
+"""
+Parallel Worker Tests
+=====================
+
+Tests for feature claims, merge reconciliation and git worktree workers.
+"""
+
+import asyncio
+import json
+import re
+import shutil
+import subprocess
+
+import pytest
+
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _features(passes):
+    return [
+        {"category": "functional", "description": f"Feature {i}", "steps": [], "passes": p}
+        for i, p in enumerate(passes)
+    ]
+
+
+@pytest.fixture
+def git_project(temp_project_dir, monkeypatch):
+    """A git repository with a feature list and progress notes on branch main."""
+    for key, value in {
+        "GIT_AUTHOR_NAME": "test", "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "test", "GIT_COMMITTER_EMAIL": "test@example.com",
+    }.items():
+        monkeypatch.setenv(key, value)
+
+    project = temp_project_dir / "app"
+    project.mkdir()
+    (project / "feature_list.json").write_text(json.dumps(_features([False] * 4), indent=2) + "\n")
+    (project / "claude-progress.txt").write_text("Session notes\n")
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=project, check=True)
+    subprocess.run(["git", "add", "-A"], cwd=project, check=True)
+    subprocess.run(["git", "commit", "-qm", "init"], cwd=project, check=True)
+    return project
+
+
+class TestFeatureClaims:
+    """Test exclusive claims."""
+
+    def test_claims_are_exclusive_and_bounded(self):
+        from nonstop_agent.parallel import MAX_ATTEMPTS_PER_FEATURE, FeatureClaims
+
+        claims = FeatureClaims()
+        assert claims.claim("w1", [0, 1, 2]) == 0
+        assert claims.claim("w2", [0, 1, 2]) == 1
+        claims.release(0)
+        assert claims.claim("w2", [0, 1, 2]) == 0
+
+        for _ in range(MAX_ATTEMPTS_PER_FEATURE):
+            claims.release(0)
+            claims.claim("w1", [0])
+        claims.release(0)
+        assert claims.claim("w1", [0]) is None
+
+
+class TestReconciliation:
+    """Test three-way merging of bookkeeping files."""
+
+    def test_feature_lists_keep_both_sides(self):
+        from nonstop_agent.parallel import reconcile_feature_lists
+
+        base = _features([False, False, False])
+        ours = _features([True, False, False])
+        theirs = _features([False, False, True])
+
+        merged = reconcile_feature_lists(ours, base, theirs)
+
+        assert [f["passes"] for f in merged] == [True, False, True]
+        assert [f["passes"] for f in ours] == [True, False, False]
+
+    def test_changed_descriptions_are_not_applied(self):
+        from nonstop_agent.parallel import reconcile_feature_lists
+
+        base = _features([False])
+        theirs = [{**base[0], "description": "Rewritten", "passes": True}]
+
+        assert reconcile_feature_lists(base, base, theirs)[0]["passes"] is False
+
+    def test_notes_are_appended(self):
+        from nonstop_agent.parallel import reconcile_notes
+
+        base = "a\n"
+        assert reconcile_notes("a\nours\n", base, "a\ntheirs\n") == "a\nours\ntheirs\n"
+        assert reconcile_notes("a\nsame\n", base, "a\nsame\n") == "a\nsame\n"
+
+
+@requires_git
+class TestRunParallel:
+    """Test workers end to end with a scripted agent session."""
+
+    async def test_workers_implement_all_features(self, git_project, monkeypatch):
+        from nonstop_agent import parallel
+
+        active, peak, seen = set(), [0], []
+
+        async def fake_session(prompt, project_dir, **kwargs):
+            index = int(re.search(r"feature #(\d+)", prompt).group(1))
+            seen.append(index)
+            active.add(index)
+            peak[0] = max(peak[0], len(active))
+            await asyncio.sleep(0.05)
+
+            path = project_dir / "feature_list.json"
+            features = json.loads(path.read_text())
+            features[index]["passes"] = True
+            path.write_text(json.dumps(features, indent=2) + "\n")
+            with open(project_dir / "claude-progress.txt", "a") as f:
+                f.write(f"Implemented feature {index}\n")
+            (project_dir / f"feature_{index}.txt").write_text("done\n")
+            active.discard(index)
+            return "continue", "", None
+
+        monkeypatch.setattr(parallel, "run_agent_session", fake_session)
+
+        await parallel.run_parallel(git_project, "test-model", workers=2)
+
+        features = json.loads((git_project / "feature_list.json").read_text())
+        notes = (git_project / "claude-progress.txt").read_text()
+        assert all(f["passes"] for f in features)
+        assert sorted(seen) == [0, 1, 2, 3]
+        assert peak[0] == 2
+        assert all(f"Implemented feature {i}\n" in notes for i in range(4))
+        assert all((git_project / f"feature_{i}.txt").exists() for i in range(4))
+        assert not parallel._worktree_root(git_project).exists()
+        branches = subprocess.run(
+            ["git", "branch"], cwd=git_project, capture_output=True, text=True
+        ).stdout
+        assert "worker" not in branches
+
+    async def test_git_errors_do_not_end_the_worker(self, git_project, monkeypatch):
+        from nonstop_agent import parallel
+        from nonstop_agent.scheduling import BackoffPolicy
+
+        git, failures, seen = parallel._git, [], []
+
+        async def flaky_git(cwd, *args, check=True):
+            if args == ("clean", "-fd") and not failures:
+                failures.append(cwd)
+                raise parallel.GitError("git clean -fd failed: index.lock exists")
+            return await git(cwd, *args, check=check)
+
+        async def fake_session(prompt, project_dir, **kwargs):
+            index = int(re.search(r"feature #(\d+)", prompt).group(1))
+            seen.append(index)
+            path = project_dir / "feature_list.json"
+            features = json.loads(path.read_text())
+            features[index]["passes"] = True
+            path.write_text(json.dumps(features, indent=2) + "\n")
+            return "continue", "", None
+
+        monkeypatch.setattr(parallel, "_git", flaky_git)
+        monkeypatch.setattr(parallel, "BackoffPolicy", lambda: BackoffPolicy(base_delay=0))
+        monkeypatch.setattr(parallel, "run_agent_session", fake_session)
+
+        await parallel.run_parallel(git_project, "test-model", workers=1)
+
+        features = json.loads((git_project / "feature_list.json").read_text())
+        assert len(failures) == 1
+        assert sorted(seen) == [0, 1, 2, 3]
+        assert all(f["passes"] for f in features)
+
+    async def test_code_conflicts_abort_the_merge(self, git_project, monkeypatch):
+        from nonstop_agent import parallel
+
+        async def fake_session(prompt, project_dir, **kwargs):
+            index = int(re.search(r"feature #(\d+)", prompt).group(1))
+            (project_dir / "shared.txt").write_text(f"version {index}\n")
+            await asyncio.sleep(0.05)
+            return "continue", "", None
+
+        monkeypatch.setattr(parallel, "run_agent_session", fake_session)
+
+        await parallel.run_parallel(git_project, "test-model", workers=2, max_iterations=2)
+
+        status = subprocess.run(
+            ["git", "status", "--porcelain"], cwd=git_project, capture_output=True, text=True
+        ).stdout
+        assert (git_project / "shared.txt").exists()
+        assert "UU" not in status
+
+    async def test_run_options_reach_worker_sessions(
+        self, git_project, temp_project_dir, monkeypatch
+    ):
+        from nonstop_agent import parallel
+
+        sessions = []
+
+        async def fake_session(prompt, project_dir, **kwargs):
+            sessions.append((project_dir, kwargs))
+            return "continue", "", None
+
+        monkeypatch.setattr(parallel, "run_agent_session", fake_session)
+        shared = temp_project_dir / "shared"
+
+        await parallel.run_parallel(
+            git_project, "test-model", workers=2, max_iterations=2,
+            audit_log=True, allowed_paths=[shared], trace_tools=True, record_transcript=True,
+        )
+
+        assert len(sessions) == 2
+        for worktree, kwargs in sessions:
+            assert kwargs["audit_log"] is not None
+            assert kwargs["recorder"] is not None
+            assert kwargs["path_scope"].roots == [str(worktree.resolve()), str(shared.resolve())]
+        assert (git_project / "tool_trace.json").exists()
+        assert (git_project / "session_transcript.jsonl").exists()
+
+    async def test_budget_stops_workers(self, git_project, monkeypatch):
+        from nonstop_agent import parallel
+        from nonstop_agent.budget import BudgetGovernor
+        from nonstop_agent.state import RunStateStore
+
+        store = RunStateStore(git_project)
+        store.record_usage(100.0, 0)  # Spent by an earlier run
+        store.flush()
+        calls = []
+
+        async def fake_session(prompt, project_dir, **kwargs):
+            calls.append(kwargs["model"])
+            await asyncio.sleep(0.01)
+            kwargs["stats"].cost_usd = 2.0
+            return "continue", "", None
+
+        monkeypatch.setattr(parallel, "run_agent_session", fake_session)
+
+        await parallel.run_parallel(
+            git_project, "test-model", workers=2, budget=BudgetGovernor(max_cost_usd=3.0)
+        )
+
+        assert calls == ["test-model", "test-model"]
+        assert RunStateStore(git_project).state.spent_cost_usd == 4.0
+
+    async def test_budget_refusal_keeps_claims_and_sessions(self, git_project):
+        from nonstop_agent import parallel
+        from nonstop_agent.budget import BudgetGovernor
+        from nonstop_agent.metrics import MetricsExporter
+        from nonstop_agent.state import RunStateStore
+
+        store = RunStateStore(git_project)
+        store.record_usage(100.0, 0)
+        run = parallel.ParallelRun(
+            project_dir=git_project, main_branch="main", model="test-model",
+            system_prompt=None, security_policy=None, run_state=store,
+            metrics=MetricsExporter(git_project), sessions_left=3,
+            budget=BudgetGovernor(max_cost_usd=3.0),
+        )
+
+        await parallel._run_worker(run, "worker-1", git_project, "main")
+
+        assert run.claims.attempts == {}
+        assert run.sessions_left == 3
+
+
+class TestParallelFlags:
+    """Test that the CLI rejects flags parallel mode cannot honour."""
+
+    def test_unsupported_flags_are_reported(self, monkeypatch):
+        from nonstop_agent import main
+
+        monkeypatch.setattr("sys.argv", ["nonstop-agent", "--parallel", "2", "--audit-log"])
+        assert main.parallel_unsupported(main.parse_args()) == []
+
+        monkeypatch.setattr("sys.argv", [
+            "nonstop-agent", "--parallel", "2", "--resume", "--feature-index",
+            "--stall-policy", "stop",
+        ])
+        assert main.parallel_unsupported(main.parse_args()) == [
+            "--resume", "--feature-index", "--stall-policy",
+        ]
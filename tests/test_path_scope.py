@@ -0,0 +1,94 @@
+"""
+Filesystem Scope Tests
+======================
+
+Tests for the file tool path-scope hook.
+"""
+
+import os
+
+
+def _file_input(tool_name: str, **tool_input) -> dict:
+    return {"tool_name": tool_name, "tool_input": tool_input}
+
+
+def _is_denied(result: dict) -> bool:
+    return result.get("hookSpecificOutput", {}).get("permissionDecision") == "deny"
+
+
+class TestPathScope:
+    """Test path resolution against allowed roots."""
+
+    def test_relative_and_absolute_paths(self, temp_project_dir):
+        from nonstop_agent.path_scope import PathScope
+
+        scope = PathScope(temp_project_dir)
+
+        assert scope.is_allowed("src/app.py")
+        assert scope.is_allowed(str(temp_project_dir / "feature_list.json"))
+        assert not scope.is_allowed("../outside.txt")
+        assert not scope.is_allowed("/etc/passwd")
+
+    def test_sibling_with_common_prefix_is_outside(self, temp_project_dir):
+        from nonstop_agent.path_scope import PathScope
+
+        scope = PathScope(temp_project_dir / "app")
+        assert not scope.is_allowed(str(temp_project_dir / "app-secrets" / "key"))
+
+    def test_symlink_escape_is_denied(self, temp_project_dir):
+        from nonstop_agent.path_scope import PathScope
+
+        project = temp_project_dir / "project"
+        outside = temp_project_dir / "outside"
+        project.mkdir()
+        outside.mkdir()
+        os.symlink(outside, project / "link")
+
+        assert not PathScope(project).is_allowed("link/secret.txt")
+        assert PathScope(project, [outside]).is_allowed("link/secret.txt")
+
+    def test_relative_patterns_cannot_escape(self, temp_project_dir):
+        from nonstop_agent.path_scope import PathScope
+
+        scope = PathScope(temp_project_dir)
+
+        assert not scope.check("Glob", {"pattern": "../etc/*"})[0]
+        assert not scope.check("Glob", {"pattern": "*.py", "path": "../.."})[0]
+        assert not scope.check("Glob", {"pattern": "src/*/../../../x"})[0]
+        assert not scope.check("Glob", {"pattern": "{..,src}/*.py"})[0]
+        assert not scope.check("Grep", {"pattern": "x", "glob": "../../etc/*"})[0]
+        assert not scope.check("Grep", {"pattern": "x", "path": "src", "glob": "../../*"})[0]
+        assert scope.check("Glob", {"pattern": "src/../tests/*.py"}) == (True, "")
+        assert scope.check("Grep", {"pattern": "x", "path": "src", "glob": "*.py"}) == (True, "")
+
+    def test_realpath_is_cached(self, temp_project_dir):
+        from nonstop_agent.path_scope import PathScope
+
+        scope = PathScope(temp_project_dir)
+        for _ in range(3):
+            scope.is_allowed("src/app.py")
+
+        assert scope.cache_info()["misses"] == 1
+        assert scope.cache_info()["hits"] == 2
+
+
+class TestPathScopeHook:
+    """Test allow/deny decisions of the file tool hook."""
+
+    async def test_file_tools(self, temp_project_dir):
+        from nonstop_agent.path_scope import PathScope, make_path_scope_hook
+
+        hook = make_path_scope_hook(PathScope(temp_project_dir))
+
+        assert await hook(_file_input("Read", file_path="README.md"), None, None) == {}
+        assert await hook(_file_input("Grep", pattern="TODO"), None, None) == {}
+        assert _is_denied(await hook(_file_input("Write", file_path="/tmp/x/y"), None, None))
+        assert _is_denied(await hook(_file_input("Edit", file_path="../../x"), None, None))
+        assert _is_denied(await hook(_file_input("Glob", pattern="/etc/**/*.conf"), None, None))
+        assert await hook(_file_input("Glob", pattern="src/**/*.py"), None, None) == {}
+
+    async def test_other_tools_ignored(self, temp_project_dir, bash_hook_input):
+        from nonstop_agent.path_scope import PathScope, make_path_scope_hook
+
+        hook = make_path_scope_hook(PathScope(temp_project_dir))
+        assert await hook(bash_hook_input("cat /etc/passwd"), None, None) == {}
@@ -0,0 +1,127 @@
+"""
+Policy File Tests
+=================
+
+Tests for loading and compiling TOML/JSON command rules.
+"""
+
+import json
+
+import pytest
+
+
+POLICY_TOML = """
+allowed_commands = ["make"]
+
+[commands.docker]
+subcommands = ["build", "ps"]
+denied_args = ["--privileged"]
+denied_patterns = ['-v\\s*/:']
+"""
+
+
+class TestParsePolicy:
+    """Test compiling policy mappings into rules."""
+
+    def test_commands_tables_are_allowed(self):
+        from nonstop_agent.policy import parse_policy
+
+        rules = parse_policy({"allowed_commands": ["make"], "commands": {"cargo": {}}})
+        assert rules.allowed_commands == {"make", "cargo"}
+        assert "cargo" not in rules.validators
+
+    def test_argument_constraints(self):
+        from nonstop_agent.policy import parse_policy
+        from nonstop_agent.security import parse_command
+
+        rules = parse_policy({"commands": {"docker": {
+            "subcommands": ["build", "run"],
+            "denied_args": ["--privileged"],
+            "denied_patterns": [r"-v\s*/:"],
+        }}})
+        validate = rules.validators["docker"]
+
+        def check(command: str) -> bool:
+            return validate(parse_command(command)[0])[0]
+
+        assert check("docker build -t app .")
+        assert not check("docker exec -it app sh")
+        assert not check("docker run --privileged=true app")
+        assert not check("docker run -v /:/host app")
+
+    def test_unknown_keys_rejected(self):
+        from nonstop_agent.policy import parse_policy
+
+        with pytest.raises(ValueError):
+            parse_policy({"commands": {"docker": {"subcomands": ["ps"]}}})
+        with pytest.raises(ValueError):
+            parse_policy({"allow": ["make"]})
+
+    def test_validator_reference(self):
+        from nonstop_agent.policy import parse_policy
+        from nonstop_agent.security import validate_chmod_command
+
+        rules = parse_policy({"commands": {"chmod": {
+            "validator": "nonstop_agent.security:validate_chmod_command",
+        }}})
+        assert rules.validators["chmod"] is validate_chmod_command
+
+    def test_non_string_validator_rejected(self):
+        from nonstop_agent.policy import parse_policy
+
+        with pytest.raises(ValueError, match="validator must be a string"):
+            parse_policy({"commands": {"chmod": {"validator": 5}}})
+
+
+class TestPolicyFiles:
+    """Test loading policy files and applying them to the hook."""
+
+    def test_toml_and_json_load_identically(self, temp_project_dir):
+        from nonstop_agent.policy import load_policy_file
+
+        toml_path = temp_project_dir / "policy.toml"
+        toml_path.write_text(POLICY_TOML)
+        json_path = temp_project_dir / "policy.json"
+        json_path.write_text(json.dumps({
+            "allowed_commands": ["make"],
+            "commands": {"docker": {
+                "subcommands": ["build", "ps"],
+                "denied_args": ["--privileged"],
+                "denied_patterns": [r"-v\s*/:"],
+            }},
+        }))
+
+        assert load_policy_file(toml_path) == load_policy_file(json_path)
+
+    def test_apply_policy_file(self, temp_project_dir):
+        from nonstop_agent.policy import apply_policy_file
+        from nonstop_agent.security import (
+            check_command,
+            remove_allowed_command,
+            unregister_command_validator,
+        )
+
+        path = temp_project_dir / "policy.toml"
+        path.write_text(POLICY_TOML)
+        apply_policy_file(path)
+        try:
+            assert check_command("make test") == (True, "")
+            assert check_command("docker ps -a") == (True, "")
+            assert check_command("docker run app")[0] is False
+        finally:
+            unregister_command_validator("docker")
+            remove_allowed_command("docker")
+            remove_allowed_command("make")
+        assert check_command("docker ps -a")[0] is False
+
+    def test_load_security_policy_leaves_globals(self, temp_project_dir):
+        from nonstop_agent.policy import load_security_policy
+        from nonstop_agent.security import check_command
+
+        path = temp_project_dir / "policy.toml"
+        path.write_text(POLICY_TOML)
+        policy = load_security_policy(path)
+
+        assert policy.check("docker ps") == (True, "")
+        assert policy.check("docker run app")[0] is False
+        assert check_command("docker ps")[0] is False
@@ -0,0 +1,92 @@
+"""
+Policy Check Tests
+==================
+
+Tests for offline re-validation of recorded Bash commands.
+"""
+
+import json
+
+
+def _write_transcript(path, commands):
+    with open(path, "w") as f:
+        for i, command in enumerate(commands):
+            f.write(json.dumps({
+                "type": "assistant",
+                "message": {"content": [
+                    {"type": "text", "text": "Running a command"},
+                    {"type": "tool_use", "id": f"tool_{i}", "name": "Bash",
+                     "input": {"command": command}},
+                ]},
+            }) + "\n")
+        f.write("not json\n")
+        f.write(json.dumps({"command": "pkill node"}) + "\n")
+
+
+class TestPolicyCheck:
+    """Test transcript parsing and policy comparison."""
+
+    def test_iter_transcript_commands(self, temp_project_dir):
+        from nonstop_agent.policy_check import iter_transcript_commands
+
+        path = temp_project_dir / "session.jsonl"
+        _write_transcript(path, ["git status", "docker ps"])
+
+        assert list(iter_transcript_commands([path])) == ["git status", "docker ps", "pkill node"]
+
+    def test_recorded_session_transcript(self, temp_project_dir):
+        from nonstop_agent import agent
+        from nonstop_agent.policy_check import iter_transcript_commands
+        from nonstop_agent.replay import TRANSCRIPT_FILE, TranscriptRecorder
+
+        def make(cls, **attrs):
+            obj = cls()
+            obj.__dict__.update(attrs)
+            return obj
+
+        path = temp_project_dir / TRANSCRIPT_FILE
+        recorder = TranscriptRecorder(path)
+        recorder.start_session("prompt", "test-model")
+        recorder.record(make(agent.AssistantMessage, content=[
+            make(agent.TextBlock, text="Checking"),
+            make(agent.ToolUseBlock, id="t1", name="Bash", input={"command": "git status"}),
+            make(agent.ToolUseBlock, id="t2", name="Read", input={"file_path": "a.py"}),
+        ]))
+        recorder.record(make(agent.AssistantMessage, content=[
+            make(agent.ToolUseBlock, id="t3", name="Bash", input={"command": "rm -rf build"}),
+        ]))
+        recorder.close()
+
+        assert list(iter_transcript_commands([path])) == ["git status", "rm -rf build"]
+
+    def test_reports_newly_denied_and_allowed(self, temp_project_dir):
+        from nonstop_agent.policy_check import check_commands
+
+        policy = temp_project_dir / "policy.toml"
+        policy.write_text('removed_commands = ["pkill"]\n[commands.docker]\n')
+
+        report = check_commands(
+            ["git status", "docker ps", "pkill node", "pkill node", "rm -rf /"],
+            policy_file=policy,
+            workers=1,
+        )
+
+        assert report.total_commands == 5
+        assert report.unique_commands == 4
+        assert [(c, n) for c, _, n in report.newly_denied] == [("pkill node", 2)]
+        assert report.newly_allowed == [("docker ps", 1)]
+        assert report.denied_commands == 2
+
+    def test_process_pool_matches_in_process(self, temp_project_dir, monkeypatch):
+        from nonstop_agent import policy_check
+
+        policy = temp_project_dir / "policy.json"
+        policy.write_text(json.dumps({"removed_commands": ["git"]}))
+        commands = [f"git log -n {i}" for i in range(50)] + ["ls -la"] * 3
+
+        expected = policy_check.check_commands(commands, policy_file=policy, workers=1)
+        monkeypatch.setattr(policy_check, "MIN_COMMANDS_FOR_POOL", 0)
+        pooled = policy_check.check_commands(commands, policy_file=policy, workers=2, chunk_size=7)
+
+        assert pooled == expected
+        assert len(pooled.newly_denied) == 50
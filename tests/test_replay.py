@@ -0,0 +1,149 @@
+"""
+Session Replay Tests
+====================
+
+Tests for recording SDK message streams and replaying them into sessions.
+"""
+
+import json
+
+
+def _make(cls, **attrs):
+    obj = cls()
+    obj.__dict__.update(attrs)
+    return obj
+
+
+def _messages(agent, text="Hello", session_id="s-1"):
+    class UserMessage:
+        def __init__(self, content):
+            self.content = content
+
+    return [
+        _make(agent.AssistantMessage, content=[
+            _make(agent.TextBlock, text=text),
+            _make(agent.ToolUseBlock, id="t1", name="Bash", input={"command": "ls", "type": "x"}),
+        ]),
+        UserMessage([_make(agent.ToolResultBlock, tool_use_id="t1", content="a.py")]),
+        _make(agent.ResultMessage, session_id=session_id, total_cost_usd=0.5, num_turns=2,
+              duration_ms=700),
+    ]
+
+
+class TestEncoding:
+    """Test message (de)serialization."""
+
+    def test_round_trip_keeps_sdk_types(self):
+        from nonstop_agent import agent
+        from nonstop_agent.replay import decode_message, encode_message
+
+        original = _messages(agent)
+        decoded = [decode_message(json.loads(json.dumps(encode_message(m)))) for m in original]
+
+        assistant, user, result = decoded
+        assert isinstance(assistant, agent.AssistantMessage)
+        assert isinstance(assistant.content[1], agent.ToolUseBlock)
+        assert assistant.content[1].input == {"command": "ls", "type": "x"}
+        # The mock SDK has no UserMessage, so it comes back as a namespace
+        assert isinstance(user.content[0], agent.ToolResultBlock)
+        assert user.content[0].content == "a.py"
+        assert (result.session_id, result.total_cost_usd) == ("s-1", 0.5)
+
+
+class TestRecorder:
+    """Test the transcript file."""
+
+    def test_sessions_and_offsets(self, temp_project_dir):
+        from nonstop_agent.replay import TranscriptRecorder, load_transcript
+
+        now = [100.0]
+        path = temp_project_dir / "t.jsonl"
+        recorder = TranscriptRecorder(path, clock=lambda: now[0])
+        recorder.start_session("first", "model-a")
+        now[0] += 1.5
+        recorder.record({"n": 1})
+        recorder.start_session("second", "model-b")
+        now[0] += 0.25
+        recorder.record({"n": 2})
+        recorder.record({"n": 3})
+        recorder.close()
+        with open(path, "a") as f:
+            f.write('{"t": 1.0, "m": ')  # Torn last line
+
+        sessions = load_transcript(path)
+
+        assert [(s.prompt, s.model) for s in sessions] == [
+            ("first", "model-a"), ("second", "model-b"),
+        ]
+        assert sessions[0].messages == [(1.5, {"n": 1})]
+        assert sessions[1].messages == [(0.25, {"n": 2}), (0.25, {"n": 3})]
+
+
+class TestReplay:
+    """Test replaying recorded sessions through run_agent_session."""
+
+    async def test_replay_reproduces_session_events(self, temp_project_dir, monkeypatch):
+        from nonstop_agent import agent
+        from nonstop_agent.events import EventBus, SessionEvent
+        from nonstop_agent.output import NullSink
+        from nonstop_agent.replay import TranscriptRecorder, TranscriptReplay
+
+        monkeypatch.setattr(agent, "create_options", lambda **kwargs: None)
+        recorded = [_messages(agent, "one", "s-1"), _messages(agent, "two", "s-2")]
+
+        async def fake_query(prompt, options):
+            for msg in recorded.pop(0):
+                yield msg
+
+        monkeypatch.setattr(agent, "query", fake_query)
+
+        async def run_sessions(**kwargs):
+            bus = EventBus()
+            seen = []
+            bus.subscribe(SessionEvent, seen.append)
+            results = [
+                await agent.run_agent_session(
+                    "prompt", temp_project_dir, "test-model", sink=NullSink(), events=bus, **kwargs
+                )
+                for _ in range(2)
+            ]
+            return results, seen
+
+        path = temp_project_dir / "transcript.jsonl"
+        recorder = TranscriptRecorder(path)
+        live_results, live_events = await run_sessions(recorder=recorder)
+        recorder.close()
+
+        replay = TranscriptReplay.from_file(path)
+        replay_results, replay_events = await run_sessions(message_source=replay)
+
+        assert live_results == [("continue", "one", "s-1"), ("continue", "two", "s-2")]
+        assert replay_results == live_results
+        assert replay_events == live_events
+
+        status, text, _ = await agent.run_agent_session(
+            "prompt", temp_project_dir, "test-model", sink=NullSink(), message_source=replay
+        )
+        assert status == "error"
+        assert "Only 2 sessions were recorded" in text
+
+    async def test_original_timing_scaled_by_speed(self, monkeypatch):
+        from nonstop_agent import replay as replay_module
+        from nonstop_agent.replay import RecordedSession, TranscriptReplay
+
+        delays = []
+
+        async def fake_sleep(seconds):
+            delays.append(seconds)
+
+        monkeypatch.setattr(replay_module.asyncio, "sleep", fake_sleep)
+        session = RecordedSession(messages=[(0.0, "a"), (1.0, "b"), (3.0, "c")])
+
+        fast = [msg async for msg in TranscriptReplay([session])()]
+        assert fast == ["a", "b", "c"]
+        assert delays == []
+
+        replay = TranscriptReplay([session], speed=2.0, clock=lambda: 0.0)
+        paced = [msg async for msg in replay()]
+        assert paced == ["a", "b", "c"]
+        assert delays == [0.5, 1.5]
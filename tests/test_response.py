@@ -0,0 +1,105 @@
+"""
+Response Buffer Tests
+=====================
+
+Tests for bounded response accumulation and spilling to disk.
+"""
+
+import pytest
+
+
+class TestResponseBuffer:
+    """Test retention limits and spilling."""
+
+    def test_unlimited_keeps_everything(self):
+        from nonstop_agent.response import ResponseBuffer
+
+        buffer = ResponseBuffer(max_chars=None)
+        for chunk in ["a", "bc", "def"]:
+            buffer.append(chunk)
+
+        assert buffer.text() == "abcdef"
+        assert buffer.total_chars == 6
+        assert not buffer.truncated
+
+    def test_keeps_only_the_tail(self):
+        from nonstop_agent.response import ResponseBuffer
+
+        buffer = ResponseBuffer(max_chars=5)
+        for chunk in ["hello ", "big ", "world"]:
+            buffer.append(chunk)
+
+        assert buffer.text() == "world"
+        assert len(buffer) == 5
+        assert buffer.total_chars == 15
+        assert buffer.truncated
+
+    def test_trims_inside_a_chunk(self):
+        from nonstop_agent.response import ResponseBuffer
+
+        buffer = ResponseBuffer(max_chars=4)
+        buffer.append("ab")
+        buffer.append("cdef")
+        buffer.append("g")
+
+        assert buffer.text() == "defg"
+        buffer.append("hi")
+        assert buffer.text() == "fghi"
+
+    def test_zero_retains_nothing(self):
+        from nonstop_agent.response import ResponseBuffer
+
+        buffer = ResponseBuffer(max_chars=0)
+        buffer.append("text")
+
+        assert buffer.text() == ""
+        assert buffer.total_chars == 4
+
+    def test_spill_keeps_full_output(self, temp_project_dir):
+        from nonstop_agent.response import ResponseBuffer
+
+        path = temp_project_dir / "logs" / "session.txt"
+        with ResponseBuffer(max_chars=3, spill_path=path) as buffer:
+            for chunk in ["one ", "two ", "three"]:
+                buffer.append(chunk)
+
+        assert path.read_text() == "one two three"
+        assert buffer.text() == "ree"
+
+    def test_negative_limit_rejected(self):
+        from nonstop_agent.response import ResponseBuffer
+
+        with pytest.raises(ValueError):
+            ResponseBuffer(max_chars=-1)
+
+
+class TestRunAgentSession:
+    """Test that run_agent_session fills the buffer from text blocks."""
+
+    async def test_response_is_buffered_and_spilled(self, temp_project_dir, monkeypatch):
+        from nonstop_agent import agent
+        from nonstop_agent.response import ResponseBuffer
+
+        def text_message(text):
+            block = agent.TextBlock()
+            block.text = text
+            msg = agent.AssistantMessage()
+            msg.content = [block]
+            return msg
+
+        async def fake_query(prompt, options):
+            for text in ["first ", "second ", "third"]:
+                yield text_message(text)
+
+        monkeypatch.setattr(agent, "query", fake_query)
+        monkeypatch.setattr(agent, "create_options", lambda **kwargs: None)
+
+        path = temp_project_dir / "response.txt"
+        status, text, _ = await agent.run_agent_session(
+            "prompt", temp_project_dir, "test-model",
+            response=ResponseBuffer(max_chars=5, spill_path=path),
+        )
+
+        assert status == "continue"
+        assert text == "third"
+        assert path.read_text() == "first second third"
@@ -0,0 +1,83 @@
+"""
+Session Scheduling Tests
+========================
+
+Tests for delay policies and the pause between sessions of the agent loop.
+"""
+
+import pytest
+
+
+class TestBackoffPolicy:
+    """Test backoff, jitter and the circuit breaker."""
+
+    def test_success_has_no_delay(self):
+        from nonstop_agent.scheduling import BackoffPolicy
+
+        policy = BackoffPolicy()
+        assert policy.next_delay("continue") == 0.0
+        assert policy.consecutive_errors == 0
+
+    def test_errors_back_off_exponentially_up_to_cap(self):
+        from nonstop_agent.scheduling import BackoffPolicy
+
+        policy = BackoffPolicy(base_delay=1.0, max_delay=5.0, breaker_threshold=10, rand=lambda: 0.999)
+        delays = [policy.next_delay("error") for _ in range(5)]
+
+        assert delays == pytest.approx([0.999, 1.998, 3.996, 4.995, 4.995])
+
+    def test_jitter_scales_within_ceiling(self):
+        from nonstop_agent.scheduling import BackoffPolicy
+
+        policy = BackoffPolicy(base_delay=4.0, rand=lambda: 0.25)
+        assert policy.next_delay("error") == pytest.approx(1.0)
+
+    def test_circuit_breaker_opens_and_success_closes_it(self, capsys):
+        from nonstop_agent.scheduling import BackoffPolicy
+
+        policy = BackoffPolicy(breaker_threshold=3, breaker_pause=60.0, rand=lambda: 0.0)
+        assert [policy.next_delay("error") for _ in range(2)] == [0.0, 0.0]
+        assert not policy.circuit_open
+
+        assert policy.next_delay("error") == 60.0
+        assert policy.circuit_open
+        assert policy.next_delay("error") == 60.0  # Failed probe
+        assert "Circuit breaker open" in capsys.readouterr().out
+
+        assert policy.next_delay("continue") == 0.0
+        assert not policy.circuit_open
+        assert policy.next_delay("error") == 0.0
+
+    def test_fixed_delay(self):
+        from nonstop_agent.scheduling import FixedDelay
+
+        assert FixedDelay(3).next_delay("continue") == 3
+        assert FixedDelay(3).next_delay("error") == 3
+
+
+class TestAgentLoopDelays:
+    """Test that the agent loop sleeps only as the policy says."""
+
+    async def test_healthy_sessions_do_not_sleep(self, temp_project_with_features, monkeypatch):
+        from nonstop_agent import agent
+        from nonstop_agent.scheduling import BackoffPolicy
+
+        statuses = iter(["continue", "error", "error", "continue"])
+        sleeps = []
+
+        async def fake_session(**kwargs):
+            return next(statuses), "", None
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        monkeypatch.setattr(agent, "run_agent_session", fake_session)
+        monkeypatch.setattr(agent.asyncio, "sleep", fake_sleep)
+
+        await agent.run_autonomous_agent(
+            temp_project_with_features, "test-model", max_iterations=4,
+            delay_policy=BackoffPolicy(base_delay=2.0, rand=lambda: 0.5),
+        )
+
+        # No pause after the first success or after the last session
+        assert sleeps == [1.0, 2.0]
@@ -0,0 +1,184 @@
+"""
+Security Hook Tests
+===================
+
+Tests for the Bash allowlist hook and its supporting validators.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from conftest import ALLOWED_COMMANDS, BLOCKED_COMMANDS, COMPOUND_COMMANDS
+
+
+def _is_denied(result: dict) -> bool:
+    return result.get("hookSpecificOutput", {}).get("permissionDecision") == "deny"
+
+
+class TestBashSecurityHook:
+    """Test allow/deny decisions of bash_security_hook."""
+
+    @pytest.mark.parametrize("command", ALLOWED_COMMANDS)
+    async def test_allowed_commands(self, bash_hook_input, command):
+        from nonstop_agent.security import bash_security_hook
+
+        result = await bash_security_hook(bash_hook_input(command), None, None)
+        assert result == {}, f"Command should be allowed: {command}"
+
+    @pytest.mark.parametrize("command", BLOCKED_COMMANDS)
+    async def test_blocked_commands(self, bash_hook_input, command):
+        from nonstop_agent.security import bash_security_hook
+
+        result = await bash_security_hook(bash_hook_input(command), None, None)
+        assert _is_denied(result), f"Command should be blocked: {command}"
+
+    @pytest.mark.parametrize("command,expected", COMPOUND_COMMANDS)
+    async def test_compound_commands(self, bash_hook_input, command, expected):
+        from nonstop_agent.security import bash_security_hook
+
+        result = await bash_security_hook(bash_hook_input(command), None, None)
+        assert (result == {}) is expected
+
+    async def test_non_bash_tool_ignored(self, non_bash_hook_input):
+        from nonstop_agent.security import bash_security_hook
+
+        assert await bash_security_hook(non_bash_hook_input, None, None) == {}
+
+
+class TestVerdictCache:
+    """Test memoization of command verdicts."""
+
+    def test_repeat_commands_hit_cache(self):
+        from nonstop_agent.security import (
+            check_command,
+            clear_verdict_cache,
+            verdict_cache_info,
+        )
+
+        clear_verdict_cache()
+        before = verdict_cache_info()
+        for _ in range(5):
+            assert check_command("git status") == (True, "")
+        after = verdict_cache_info()
+
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 4
+
+    def test_policy_change_invalidates_cache(self):
+        from nonstop_agent.security import (
+            add_allowed_command,
+            check_command,
+            remove_allowed_command,
+        )
+
+        assert check_command("docker ps")[0] is False
+        add_allowed_command("docker")
+        try:
+            assert check_command("docker ps") == (True, "")
+        finally:
+            remove_allowed_command("docker")
+        assert check_command("docker ps")[0] is False
+
+
+class TestParseCommand:
+    """Test the single-pass shell tokenizer."""
+
+    def test_segments_carry_name_argv_and_operator(self):
+        from nonstop_agent.security import CommandSegment, parse_command
+
+        assert parse_command("./init.sh --fast && ls -la | grep x; pwd") == [
+            CommandSegment("init.sh", ("./init.sh", "--fast"), "&&"),
+            CommandSegment("ls", ("ls", "-la"), "|"),
+            CommandSegment("grep", ("grep", "x"), ";"),
+            CommandSegment("pwd", ("pwd",), ""),
+        ]
+
+    def test_malformed_quoting_returns_none(self):
+        from nonstop_agent.security import extract_commands, parse_command
+
+        assert parse_command("echo 'unterminated") is None
+        assert extract_commands("echo 'unterminated") == []
+
+    def test_every_segment_is_validated(self):
+        from nonstop_agent.security import evaluate_command
+
+        allowed, reason = evaluate_command("chmod +x a.sh && chmod 777 b.sh")
+        assert not allowed
+        assert "777" in reason
+
+    def test_validators_accept_segments(self):
+        from nonstop_agent.security import parse_command, validate_pkill_command
+
+        segment = parse_command("ps aux | pkill -f node")[1]
+        assert validate_pkill_command(segment) == (True, "")
+
+
+class TestBenchmarkCorpus:
+    """Keep the benchmark corpus verdicts in step with the policy."""
+
+    def test_corpus_expectations(self):
+        from nonstop_agent.security import evaluate_command
+
+        corpus = Path(__file__).parent.parent / "benchmarks" / "data" / "bash_commands.jsonl"
+        for line in corpus.read_text().splitlines():
+            entry = json.loads(line)
+            allowed, reason = evaluate_command(entry["command"])
+            assert ("allow" if allowed else "deny") == entry["expect"], (entry, reason)
+
+
+class TestSecurityPolicy:
+    """Test immutable per-session policies."""
+
+    async def test_policies_are_isolated(self, bash_hook_input):
+        from nonstop_agent.security import (
+            check_command,
+            default_policy,
+            make_bash_security_hook,
+        )
+
+        docker_policy = default_policy().with_commands("docker")
+        strict_policy = default_policy().without_commands("git")
+        docker_hook = make_bash_security_hook(docker_policy)
+        strict_hook = make_bash_security_hook(strict_policy)
+
+        assert await docker_hook(bash_hook_input("docker ps"), None, None) == {}
+        assert _is_denied(await strict_hook(bash_hook_input("git status"), None, None))
+        assert await docker_hook(bash_hook_input("git status"), None, None) == {}
+        assert check_command("docker ps")[0] is False
+
+    def test_policy_is_frozen(self):
+        from dataclasses import FrozenInstanceError
+
+        from nonstop_agent.security import default_policy
+
+        policy = default_policy()
+        with pytest.raises(FrozenInstanceError):
+            policy.allowed_commands = frozenset()
+        with pytest.raises(TypeError):
+            policy.validators["rm"] = lambda segment: (True, "")
+
+    def test_policy_has_own_cache(self):
+        from nonstop_agent.security import SecurityPolicy
+
+        policy = SecurityPolicy(frozenset({"ls"}))
+        policy.check("ls -la")
+        policy.check("ls -la")
+        assert policy.cache_info()["hits"] == 1
+        assert policy.cache_info()["misses"] == 1
+
+    def test_default_policy_tracks_registry(self):
+        from nonstop_agent.security import (
+            add_allowed_command,
+            default_policy,
+            remove_allowed_command,
+        )
+
+        before = default_policy()
+        add_allowed_command("cargo")
+        try:
+            assert "cargo" in default_policy().allowed_commands
+            assert "cargo" not in before.allowed_commands
+        finally:
+            remove_allowed_command("cargo")
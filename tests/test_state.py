@@ -0,0 +1,108 @@
+"""
+Run State Tests
+===============
+
+Tests for the atomic run-state store and legacy session file migration.
+"""
+
+import json
+import os
+
+
+class TestRunStateStore:
+    """Test loading, batching and atomic writes."""
+
+    def test_empty_project_has_default_state(self, temp_project_dir):
+        from nonstop_agent.state import RUN_STATE_FILE, RunStateStore
+
+        store = RunStateStore(temp_project_dir)
+
+        assert store.state.last_session_id is None
+        assert store.state.iteration == 0
+        store.flush()
+        assert not (temp_project_dir / RUN_STATE_FILE).exists()
+
+    def test_updates_are_batched_until_flush(self, temp_project_dir, monkeypatch):
+        from nonstop_agent import state as state_module
+        from nonstop_agent.state import RunStateStore
+
+        fsyncs = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(state_module.os, "fsync", lambda fd: fsyncs.append(fd) or real_fsync(fd))
+
+        store = RunStateStore(temp_project_dir)
+        store.record_session("session-1")
+        store.record_iteration()
+        store.record_progress(3, 10)
+        assert not store.path.exists()
+
+        store.flush()
+        store.flush()  # Nothing pending
+
+        assert len(fsyncs) == 2  # Temp file and directory, once
+        data = json.loads(store.path.read_text())
+        assert data["session_ids"] == ["session-1"]
+        assert (data["iteration"], data["passing"], data["total"]) == (1, 3, 10)
+
+    def test_state_round_trips(self, temp_project_dir):
+        from nonstop_agent.state import RunStateStore
+
+        store = RunStateStore(temp_project_dir)
+        store.record_session("a")
+        store.record_session("b")
+        store.record_session("b")
+        store.flush()
+
+        reloaded = RunStateStore(temp_project_dir).state
+        assert reloaded.session_ids == ["a", "b"]
+        assert reloaded.last_session_id == "b"
+        assert reloaded.updated_at >= reloaded.created_at
+
+    def test_failed_write_keeps_previous_file(self, temp_project_dir, monkeypatch):
+        from nonstop_agent import state as state_module
+        from nonstop_agent.state import RunStateStore
+
+        store = RunStateStore(temp_project_dir)
+        store.record_session("good")
+        store.flush()
+
+        def fail(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(state_module.os, "replace", fail)
+        store.record_session("lost")
+        store.flush()
+
+        assert json.loads(store.path.read_text())["session_ids"] == ["good"]
+        assert [p.name for p in temp_project_dir.iterdir()] == [store.path.name]
+
+    def test_history_is_bounded(self, temp_project_dir, monkeypatch):
+        from nonstop_agent import state as state_module
+        from nonstop_agent.state import RunStateStore
+
+        monkeypatch.setattr(state_module, "MAX_SESSION_HISTORY", 3)
+        store = RunStateStore(temp_project_dir)
+        for i in range(5):
+            store.record_session(f"s{i}")
+
+        assert store.state.session_ids == ["s2", "s3", "s4"]
+
+
+class TestLegacyMigration:
+    """Test reading claude_session.json from older runs."""
+
+    def test_legacy_session_is_migrated(self, temp_project_with_session):
+        from nonstop_agent.state import RunStateStore
+
+        store = RunStateStore(temp_project_with_session)
+        assert store.state.last_session_id == "test-session-123"
+
+        store.flush()
+        assert json.loads(store.path.read_text())["session_ids"] == ["test-session-123"]
+
+    def test_progress_helpers_use_store(self, temp_project_with_session):
+        from nonstop_agent.progress import load_session_id, save_session_id
+
+        assert load_session_id(temp_project_with_session) == "test-session-123"
+        save_session_id(temp_project_with_session, "new-session")
+        assert load_session_id(temp_project_with_session) == "new-session"
@@ -0,0 +1,171 @@
+"""
+Loop Termination Tests
+======================
+
+Tests for completion-aware stopping and stall detection.
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+
+class TestStallDetector:
+    """Test stall counting and policies."""
+
+    def test_progress_resets_the_count(self):
+        from nonstop_agent.termination import StallDetector
+
+        detector = StallDetector(iterations=2, policy="stop")
+        assert detector.observe(1, "a") is None
+        assert detector.observe(1, "a") is None
+        assert detector.observe(1, "b") is None  # New commit counts as progress
+        assert detector.observe(1, "b") is None
+        assert detector.observe(2, "b") is None
+        assert detector.unchanged == 0
+
+    def test_stop_policy(self):
+        from nonstop_agent.termination import StallDetector
+
+        detector = StallDetector(iterations=2, policy="stop")
+        actions = [detector.observe(1, "a") for _ in range(3)]
+        assert actions == [None, None, "stop"]
+
+    @pytest.mark.parametrize("policy", ["switch_prompt", "escalate"])
+    def test_recover_then_stop(self, policy):
+        from nonstop_agent.termination import StallDetector
+
+        detector = StallDetector(iterations=1, policy=policy)
+        assert detector.observe(0, None) is None
+        assert detector.observe(0, None) == "recover"
+        assert detector.recovering
+        assert detector.observe(0, None) == "stop"
+
+    def test_progress_ends_recovery(self):
+        from nonstop_agent.termination import StallDetector
+
+        detector = StallDetector(iterations=1)
+        detector.observe(0, "a")
+        assert detector.observe(0, "a") == "recover"
+        detector.observe(1, "a")
+        assert not detector.recovering
+        assert detector.observe(1, "a") == "recover"
+
+    def test_zero_disables(self):
+        from nonstop_agent.termination import StallDetector
+
+        detector = StallDetector(iterations=0)
+        assert all(detector.observe(0, None) is None for _ in range(10))
+
+    def test_invalid_policy(self):
+        from nonstop_agent.termination import StallDetector
+
+        with pytest.raises(ValueError):
+            StallDetector(policy="panic")
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+class TestGitHead:
+    """Test reading HEAD."""
+
+    async def test_head_of_repository(self, temp_project_dir, monkeypatch):
+        from nonstop_agent.termination import git_head
+
+        assert await git_head(temp_project_dir) is None
+
+        for key in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+            monkeypatch.setenv(key, "test")
+        for key in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+            monkeypatch.setenv(key, "test@example.com")
+        subprocess.run(["git", "init", "-q"], cwd=temp_project_dir, check=True)
+        assert await git_head(temp_project_dir) is None  # No commits yet
+
+        subprocess.run(["git", "commit", "-q", "--allow-empty", "-m", "x"], cwd=temp_project_dir, check=True)
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=temp_project_dir, capture_output=True, text=True
+        ).stdout.strip()
+        assert await git_head(temp_project_dir) == head
+
+
+class TestAgentLoopTermination:
+    """Test that the loop stops by itself."""
+
+    def _patch(self, monkeypatch, agent, on_session, status="continue"):
+        calls = []
+
+        async def fake_session(**kwargs):
+            calls.append(kwargs)
+            on_session(kwargs["project_dir"], len(calls))
+            return status, "", None
+
+        async def no_sleep(seconds):
+            pass
+
+        monkeypatch.setattr(agent, "run_agent_session", fake_session)
+        monkeypatch.setattr(agent.asyncio, "sleep", no_sleep)
+        return calls
+
+    async def test_stops_when_all_features_pass(self, temp_project_with_features, monkeypatch):
+        from nonstop_agent import agent
+
+        def pass_everything(project_dir, n):
+            path = project_dir / "feature_list.json"
+            features = json.loads(path.read_text())
+            for feature in features:
+                feature["passes"] = True
+            path.write_text(json.dumps(features))
+
+        calls = self._patch(monkeypatch, agent, pass_everything)
+        await agent.run_autonomous_agent(temp_project_with_features, "test-model")
+
+        assert len(calls) == 1
+
+    async def test_stall_recovers_then_stops(self, temp_project_with_features, monkeypatch):
+        from nonstop_agent import agent
+        from nonstop_agent.termination import StallDetector
+
+        calls = self._patch(monkeypatch, agent, lambda project_dir, n: None)
+        await agent.run_autonomous_agent(
+            temp_project_with_features, "test-model",
+            stall_detector=StallDetector(2, "escalate", "big-model"),
+        )
+
+        assert len(calls) == 4
+        assert [c["model"] for c in calls] == ["test-model", "test-model", "big-model", "big-model"]
+        assert "PROGRESS HAS STALLED" not in calls[1]["prompt"]
+        assert "PROGRESS HAS STALLED" in calls[2]["prompt"]
+
+    async def test_keep_running_ignores_completion(self, temp_project_with_features, monkeypatch):
+        from nonstop_agent import agent
+        from nonstop_agent.termination import StallDetector
+
+        path = temp_project_with_features / "feature_list.json"
+        features = json.loads(path.read_text())
+        for feature in features:
+            feature["passes"] = True
+        path.write_text(json.dumps(features))
+
+        calls = self._patch(monkeypatch, agent, lambda project_dir, n: None)
+        await agent.run_autonomous_agent(
+            temp_project_with_features, "test-model", max_iterations=3,
+            stop_when_complete=False, stall_detector=StallDetector(0),
+        )
+
+        assert len(calls) == 3
+
+    async def test_failed_sessions_do_not_count_as_stall(
+        self, temp_project_with_features, monkeypatch
+    ):
+        from nonstop_agent import agent
+        from nonstop_agent.termination import StallDetector
+
+        calls = self._patch(monkeypatch, agent, lambda project_dir, n: None, status="error")
+        await agent.run_autonomous_agent(
+            temp_project_with_features, "test-model", max_iterations=6,
+            stall_detector=StallDetector(2, "stop"),
+        )
+
+        assert len(calls) == 6
+        assert not any("PROGRESS HAS STALLED" in c["prompt"] for c in calls)
@@ -0,0 +1,99 @@
+"""
+Tool Tracing Tests
+==================
+
+Tests for tool call spans, the Chrome trace file and the slowest-tools summary.
+"""
+
+import json
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _load_trace(path):
+    """Load a trace file the way viewers do, tolerating the open array."""
+    return json.loads(path.read_text().rstrip().rstrip(",") + "]")
+
+
+class TestToolTracer:
+    """Test span matching and timing."""
+
+    def test_spans_match_results_by_id(self, temp_project_dir):
+        from nonstop_agent.events import BlockedEvent, EventBus, ToolResultEvent, ToolUseEvent
+        from nonstop_agent.tracing import ToolTracer, TraceWriter, input_digest
+
+        clock = FakeClock()
+        writer = TraceWriter(temp_project_dir / "trace.json")
+        tracer = ToolTracer(writer, clock=clock, wall_clock=lambda: 1000.0)
+        bus = EventBus()
+        tracer.attach(bus)
+
+        bus.emit(ToolUseEvent("a", "Bash", {"command": "npm install"}))
+        clock.now += 1.0
+        bus.emit(ToolUseEvent("b", "Read", {"file_path": "app.py"}))
+        clock.now += 0.5
+        bus.emit(ToolResultEvent("b", "contents"))
+        clock.now += 10.0
+        bus.emit(ToolResultEvent("a", "failed", is_error=True))
+        bus.emit(ToolUseEvent("c", "Bash", {"command": "rm -rf /"}))
+        bus.emit(BlockedEvent("c", "blocked"))
+        bus.emit(ToolResultEvent("unknown", "ignored"))
+        bus.emit(ToolUseEvent("d", "Bash", {"command": "sleep 100"}))
+        clock.now += 2.0
+        spans = tracer.finish("session 1")
+        writer.close()
+
+        by_id = {span.tool_use_id: span for span in spans}
+        assert by_id["a"].duration == 11.5
+        assert by_id["a"].status == "error"
+        assert by_id["a"].summary == "npm install"
+        assert by_id["a"].input_digest == input_digest({"command": "npm install"})
+        assert by_id["b"].duration == 0.5
+        assert by_id["c"].status == "blocked"
+        assert by_id["d"].status == "unfinished"
+        assert by_id["d"].duration == 2.0
+
+        events = _load_trace(temp_project_dir / "trace.json")
+        tools = {e["args"]["tool_use_id"]: e for e in events if e["cat"] == "tool"}
+        assert all(e["ph"] == "X" for e in events)
+        assert tools["a"]["dur"] == 11_500_000
+        assert tools["a"]["ts"] == 1000_000_000
+        assert tools["a"]["tid"] != tools["b"]["tid"]  # Overlapping calls get separate lanes
+        session = [e for e in events if e["cat"] == "session"]
+        assert session[0]["name"] == "session 1"
+        assert session[0]["tid"] == 0
+        assert session[0]["dur"] == 13_500_000
+
+    def test_trace_file_appends_across_runs(self, temp_project_dir):
+        from nonstop_agent.tracing import ToolTracer, TraceWriter
+
+        path = temp_project_dir / "trace.json"
+        for _ in range(2):
+            writer = TraceWriter(path)
+            ToolTracer(writer).finish()
+            writer.close()
+
+        assert path.read_text().count("[") == 1
+        assert len(_load_trace(path)) == 2
+
+    def test_slowest_tools_summary(self, capsys):
+        from nonstop_agent.tracing import ToolSpan, print_slowest_tools
+
+        spans = [
+            ToolSpan(str(i), "Bash", "", f"cmd {i}", 0.0, float(i), "ok") for i in range(8)
+        ]
+        print_slowest_tools(spans, limit=3)
+
+        out = capsys.readouterr().out
+        assert "Tool time: 28.0s over 8 calls" in out
+        assert out.index("cmd 7") < out.index("cmd 6") < out.index("cmd 5")
+        assert "cmd 4" not in out
+
+        print_slowest_tools([])
+        assert capsys.readouterr().out == ""
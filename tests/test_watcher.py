@@ -0,0 +1,87 @@
+"""
+Progress Watcher Tests
+======================
+
+Tests for live feature_list.json watching (inotify and polling).
+"""
+
+import asyncio
+import json
+import sys
+
+import pytest
+
+
+def _write(project_dir, passes):
+    features = [{"category": "functional", "passes": p} for p in passes]
+    (project_dir / "feature_list.json").write_text(json.dumps(features))
+
+
+async def _wait_for(predicate, timeout=3.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("timed out waiting for watcher")
+        await asyncio.sleep(0.01)
+
+
+class TestProgressWatcher:
+    """Test change detection, debouncing and the polling fallback."""
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+    async def test_inotify_reports_changes(self, temp_project_dir):
+        from nonstop_agent.watcher import ProgressWatcher
+
+        _write(temp_project_dir, [False, False])
+        updates = []
+        async with ProgressWatcher(
+            temp_project_dir, lambda p, t: updates.append((p, t)), debounce=0.02
+        ) as watcher:
+            assert watcher.mode == "inotify"
+            _write(temp_project_dir, [True, False])
+            await _wait_for(lambda: updates)
+
+        assert updates == [(1, 2)]
+        assert watcher.mode == "stopped"
+
+    async def test_polling_fallback(self, temp_project_dir):
+        from nonstop_agent.watcher import ProgressWatcher
+
+        updates = []
+        watcher = ProgressWatcher(
+            temp_project_dir,
+            lambda p, t: updates.append((p, t)),
+            debounce=0.01,
+            poll_interval=0.01,
+            use_inotify=False,
+        )
+        async with watcher:
+            assert watcher.mode == "polling"
+            _write(temp_project_dir, [True, True, False])
+            await _wait_for(lambda: updates)
+
+        assert updates == [(2, 3)]
+
+    async def test_burst_of_writes_is_debounced(self, temp_project_dir, monkeypatch):
+        from nonstop_agent import watcher as watcher_module
+        from nonstop_agent.watcher import ProgressWatcher
+
+        reads = []
+        original = watcher_module.count_passing_tests
+        monkeypatch.setattr(
+            watcher_module, "count_passing_tests", lambda d: reads.append(d) or original(d)
+        )
+
+        updates = []
+        async with ProgressWatcher(
+            temp_project_dir, lambda p, t: updates.append((p, t)), debounce=0.1, poll_interval=0.01
+        ) as watcher:
+            for i in range(5):
+                _write(temp_project_dir, [True] * i + [False])
+                watcher._schedule()
+                await asyncio.sleep(0.01)
+            await _wait_for(lambda: updates)
+            await asyncio.sleep(0.15)
+
+        assert updates == [(4, 5)]
+        assert len(reads) <= 3  # Initial read plus at most a trailing refresh